@@ -0,0 +1,31 @@
+# Em benchmarks/__init__.py
+"""
+Micro-benchmarks do projeto. Cada módulo pode ser executado diretamente,
+por exemplo: python -m benchmarks.secoes
+"""
+
+import os
+import time
+
+
+def configurar_django():
+    """
+    Inicializa o Django para que os módulos dos apps possam ser importados
+    fora do manage.py.
+    """
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
+
+def cronometrar(funcao, *args, repeticoes=5, **kwargs):
+    """
+    Executa a função `repeticoes` vezes e retorna o menor tempo em segundos.
+    """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
@@ -0,0 +1,86 @@
+# Em benchmarks/ann.py
+"""
+Revocação e latência da busca aproximada (profession_detector.indices.IndiceIVF)
+contra a busca exata da lista curta semântica, num catálogo sintético de
+ocupações agrupadas em famílias (como um catálogo nacional de ocupações).
+
+Uso: python -m benchmarks.ann [--profissoes 5000] [--dimensao 300] [--limite 100]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+def gerar_catalogo(profissoes, dimensao, familias=None, semente=0):
+    """
+    Centroides normalizados de `profissoes` ocupações, espalhadas em torno de
+    algumas famílias, e consultas parecidas com ocupações do catálogo.
+    """
+    gerador = np.random.default_rng(semente)
+    familias = familias or max(1, profissoes // 50)
+    centros = gerador.normal(size=(familias, dimensao))
+    vetores = centros[gerador.integers(familias, size=profissoes)] + gerador.normal(size=(profissoes, dimensao))
+    vetores /= np.linalg.norm(vetores, axis=1, keepdims=True)
+    return vetores.astype('float32')
+
+
+def gerar_consultas(vetores, quantidade, semente=1):
+    gerador = np.random.default_rng(semente)
+    consultas = vetores[gerador.integers(len(vetores), size=quantidade)]
+    consultas = consultas + 0.5 * gerador.normal(size=consultas.shape) / np.sqrt(vetores.shape[1])
+    return (consultas / np.linalg.norm(consultas, axis=1, keepdims=True)).astype('float32')
+
+
+def busca_exata(vetores, consulta, limite):
+    return np.argpartition(-(vetores @ consulta), limite - 1)[:limite]
+
+
+def revocacao(indice, vetores, consultas, limite, sondas):
+    """
+    Fração média dos `limite` vizinhos exatos que a busca aproximada encontra.
+    """
+    acertos = 0
+    for consulta in consultas:
+        exatos = set(busca_exata(vetores, consulta, limite).tolist())
+        acertos += len(exatos.intersection(indice.buscar(consulta, limite, sondas).tolist()))
+    return acertos / (limite * len(consultas))
+
+
+def tempo_por_consulta(funcao, consultas):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        funcao(consulta)
+    return (time.perf_counter() - inicio) / len(consultas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profissoes', type=int, default=5000)
+    parser.add_argument('--dimensao', type=int, default=300)
+    parser.add_argument('--limite', type=int, default=100)
+    parser.add_argument('--consultas', type=int, default=200)
+    parser.add_argument('--sondas', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    from profession_detector.indices import IndiceIVF
+
+    vetores = gerar_catalogo(args.profissoes, args.dimensao)
+    consultas = gerar_consultas(vetores, args.consultas)
+
+    inicio = time.perf_counter()
+    indice = IndiceIVF.construir(vetores)
+    print(f"{len(indice.grupos)} grupos construídos em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    exata = tempo_por_consulta(lambda consulta: busca_exata(vetores, consulta, args.limite), consultas)
+    print(f"{'sondas':>7} {'revocação':>10} {'ms/consulta':>12} {'ganho':>7}")
+    print(f"{'exata':>7} {1.0:>10.3f} {exata * 1000:>12.3f} {1.0:>6.1f}x")
+    for sondas in args.sondas:
+        tempo = tempo_por_consulta(lambda consulta: indice.buscar(consulta, args.limite, sondas), consultas)
+        taxa = revocacao(indice, vetores, consultas, args.limite, sondas)
+        print(f"{sondas:>7} {taxa:>10.3f} {tempo * 1000:>12.3f} {exata / tempo:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+# Em benchmarks/contratos.py
+"""
+Compara a extração de entidades de contratos (extractor.views.processar_documento_com_spacy),
+que consulta os trechos ocupados por busca binária, com a implementação
+antiga, que percorria a lista inteira de trechos a cada entidade candidata.
+
+Usa um contrato sintético (padrão: 200 páginas) e um pipeline em branco com
+um entity_ruler no lugar do NER, para rodar sem o pt_core_news_sm.
+
+Com --memoria, mede o pico de memória (RSS) de um processo novo para cada
+tamanho, com o NER no texto inteiro e em trechos (EXTRACAO_NER_TAMANHO_TRECHO).
+
+Uso: python -m benchmarks.contratos [--paginas 20 50 200] [--repeticoes 1] [--memoria]
+"""
+
+import argparse
+import random
+import re
+import resource
+import subprocess
+import sys
+
+import spacy
+
+from . import configurar_django, cronometrar
+
+NOMES = ["Maria Souza", "João Pereira", "Ana Lima", "Carlos Alves", "Fernanda Costa", "Paulo Ribeiro"]
+EMPRESAS = ["Acme Ltda", "Construtora Horizonte", "Banco Central do Sul", "Tech Brasil"]
+CIDADES = ["São Paulo", "Belo Horizonte", "Curitiba", "Recife", "Porto Alegre"]
+MESES = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
+         "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+
+CARACTERES_POR_PAGINA = 3000
+
+
+def montar_pipeline():
+    """
+    Pipeline em branco com um entity_ruler chamado "ner" reconhecendo os
+    nomes, empresas, cidades e datas usados no contrato sintético.
+    """
+    nlp = spacy.blank("pt")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns(
+        [{"label": "PER", "pattern": nome} for nome in NOMES]
+        + [{"label": "ORG", "pattern": empresa} for empresa in EMPRESAS]
+        + [{"label": "LOC", "pattern": cidade} for cidade in CIDADES]
+        + [{"label": "DATE", "pattern": [
+            {"IS_DIGIT": True}, {"LOWER": "de"}, {"LOWER": {"IN": MESES}}, {"LOWER": "de"}, {"IS_DIGIT": True},
+        ]}]
+    )
+    return nlp
+
+
+def gerar_contrato(paginas=200, semente=0):
+    """
+    Contrato com cabeçalho (partes e objeto) e cláusulas cheias de CPFs,
+    CNPJs, valores, nomes, cidades e datas até ocupar `paginas` páginas.
+    """
+    aleatorio = random.Random(semente)
+    linhas = [
+        "CONTRATO DE PRESTAÇÃO DE SERVIÇOS",
+        f"CONTRATANTE: {EMPRESAS[0]}",
+        f"CONTRATADA: {NOMES[0]}",
+        "OBJETO: Desenvolvimento de sistema web",
+    ]
+    tamanho = sum(len(linha) + 1 for linha in linhas)
+    clausula = 1
+    while tamanho < paginas * CARACTERES_POR_PAGINA:
+        cpf = "{:03d}.{:03d}.{:03d}-{:02d}".format(*(aleatorio.randrange(1000) for _ in range(3)), aleatorio.randrange(100))
+        cnpj = "{:02d}.{:03d}.{:03d}/{:04d}-{:02d}".format(
+            aleatorio.randrange(100), aleatorio.randrange(1000), aleatorio.randrange(1000),
+            aleatorio.randrange(10000), aleatorio.randrange(100))
+        linha = (
+            f"CLÁUSULA {clausula}. {aleatorio.choice(NOMES)}, CPF {cpf}, representando "
+            f"{aleatorio.choice(EMPRESAS)}, CNPJ {cnpj}, com sede em {aleatorio.choice(CIDADES)}, "
+            f"pagará R$ {aleatorio.randrange(100, 99999)},00 até {aleatorio.randrange(1, 29)} de "
+            f"{aleatorio.choice(MESES)} de {aleatorio.randrange(2020, 2031)}."
+        )
+        linhas.append(linha)
+        tamanho += len(linha) + 1
+        clausula += 1
+    return "\n".join(linhas)
+
+
+def processar_documento_legado(texto, nlp):
+    """
+    Implementação anterior de processar_documento_com_spacy (lista de trechos
+    percorrida a cada candidata), com o modelo recebido por parâmetro.
+    """
+    doc = nlp(texto)
+    entidades = []
+    spans_ocupados = []
+
+    stop_list = {
+        "contratante", "contratada", "cláusula", "cláusulas", "cláusula primeira",
+        "objeto", "valor", "preço", "prazo", "serviços", "desenvolvimento", "sr", "sra",
+        "sr(a", "testemunhas", "contrato de prestação de serviços", "pelo presente instrumento",
+        "partes", "instrumento", "presente", "brasileiro", "brasileira", "brasileiro(a)"
+    }
+
+    def adicionar_entidade(span, tipo, is_ner=False):
+        for inicio, fim in spans_ocupados:
+            if span.start_char >= inicio and span.end_char <= fim: return
+            if span.start_char < fim and span.end_char > inicio: return
+        texto_limpo = span.text.strip(" .,:;-")
+        if is_ner and texto_limpo.lower() in stop_list: return
+        if len(texto_limpo) < 2 or texto_limpo in ".,:;": return
+        entidades.append({'texto': texto_limpo, 'tipo': tipo})
+        spans_ocupados.append((span.start_char, span.end_char))
+
+    for match in re.finditer(r"\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}", doc.text):
+        span = doc.char_span(match.start(), match.end())
+        if span: adicionar_entidade(span, "Documento (CNPJ)")
+    for match in re.finditer(r"\d{3}\.\d{3}\.\d{3}-\d{2}", doc.text):
+        span = doc.char_span(match.start(), match.end())
+        if span: adicionar_entidade(span, "Documento (CPF)")
+    for match in re.finditer(r"R\$\s?[\d\.,]+", doc.text):
+        span = doc.char_span(match.start(), match.end())
+        if span: adicionar_entidade(span, "Valor Monetário")
+
+    match_objeto = re.search(r'^\s*objeto.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
+    if match_objeto:
+        texto_objeto = match_objeto.group(1).strip()
+        char_start = texto.find(texto_objeto)
+        if char_start != -1:
+            span = doc.char_span(char_start, char_start + len(texto_objeto))
+            if span: adicionar_entidade(span, "Objeto do Contrato")
+
+    for parte_keyword in ['contratante', 'contratada']:
+        match_parte = re.search(rf'^\s*{parte_keyword}.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
+        if match_parte:
+            texto_parte = match_parte.group(1).strip()
+            if not texto_parte: continue
+            char_start = texto.find(texto_parte)
+            if char_start == -1: continue
+            span_parte = doc.char_span(char_start, char_start + len(texto_parte))
+            if span_parte:
+                doc_snippet = nlp(texto_parte)
+                tipo_final = None
+                if doc_snippet.ents:
+                    entidade_principal = doc_snippet.ents[0]
+                    if entidade_principal.label_ == 'ORG':
+                        tipo_final = "Parte (Organização)"
+                    elif entidade_principal.label_ == 'PER':
+                        tipo_final = "Parte (Pessoa)"
+                if tipo_final is None:
+                    tipo_final = "Parte (Indefinido)"
+                adicionar_entidade(span_parte, tipo_final)
+
+    labels_map = {"PER": "Pessoa", "LOC": "Local", "ORG": "Organização", "DATE": "Data"}
+    for entidade in doc.ents:
+        label = labels_map.get(entidade.label_)
+        if label:
+            adicionar_entidade(entidade, label, is_ner=True)
+
+    return entidades
+
+
+def pico_memoria(paginas, tamanho_trecho):
+    """
+    Pico de RSS (MB) de um processo novo que extrai as entidades do contrato
+    de `paginas` páginas com o NER em trechos de `tamanho_trecho` (0: inteiro).
+    """
+    saida = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.contratos', '--medir-pico', str(paginas), str(tamanho_trecho)],
+        capture_output=True, text=True, check=True,
+    )
+    return float(saida.stdout.split()[-1])
+
+
+def _medir_pico(paginas, tamanho_trecho):
+    configurar_django()
+    from django.conf import settings
+    from config import nlp as gerenciador_nlp
+    from extractor.views import processar_documento_com_spacy
+
+    nlp = montar_pipeline()
+    nlp.max_length = max(nlp.max_length, paginas * CARACTERES_POR_PAGINA * 2)
+    gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, nlp)
+    settings.EXTRACAO_NER_TAMANHO_TRECHO = tamanho_trecho
+
+    texto = gerar_contrato(paginas)
+    antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    processar_documento_com_spacy(texto)
+    # ru_maxrss vem em KB no Linux; o aumento durante a extração é o que interessa
+    print((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - antes) / 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paginas', type=int, nargs='+', default=[20, 50, 200])
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--memoria', action='store_true')
+    parser.add_argument('--medir-pico', type=int, nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir_pico:
+        _medir_pico(*args.medir_pico)
+        return
+
+    if args.memoria:
+        configurar_django()
+        from django.conf import settings
+        tamanho = settings.EXTRACAO_NER_TAMANHO_TRECHO or 100000
+        print(f"{'páginas':>8} {'inteiro (MB)':>13} {'trechos (MB)':>13}")
+        for paginas in args.paginas:
+            print(f"{paginas:>8} {pico_memoria(paginas, 0):>13.1f} {pico_memoria(paginas, tamanho):>13.1f}")
+        return
+
+    configurar_django()
+    from config import nlp as gerenciador_nlp
+    from extractor.views import processar_documento_com_spacy
+
+    nlp = montar_pipeline()
+    gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, nlp)
+    nlp.max_length = max(nlp.max_length, max(args.paginas) * CARACTERES_POR_PAGINA * 2)
+
+    print(f"{'páginas':>8} {'entidades':>10} {'legado (s)':>11} {'atual (s)':>10} {'ganho':>7}")
+    for paginas in args.paginas:
+        texto = gerar_contrato(paginas)
+        entidades = processar_documento_com_spacy(texto)
+        # A implementação antiga não guardava as posições
+        sem_posicoes = [{'texto': e['texto'], 'tipo': e['tipo']} for e in entidades]
+        if sem_posicoes != processar_documento_legado(texto, nlp):
+            raise SystemExit(f"Entidades divergentes para {paginas} páginas")
+
+        legado = cronometrar(processar_documento_legado, texto, nlp, repeticoes=args.repeticoes)
+        atual = cronometrar(processar_documento_com_spacy, texto, repeticoes=args.repeticoes)
+        print(f"{paginas:>8} {len(entidades):>10} {legado:>11.2f} {atual:>10.2f} {legado / atual:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
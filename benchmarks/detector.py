@@ -0,0 +1,161 @@
+# Em benchmarks/detector.py
+"""
+Compara o detector de profissões (profession_detector.services.suggest_professions)
+com a implementação antiga, que rodava o modelo para cada palavra-chave e
+descrição e pontuava todas as profissões em toda requisição.
+
+Uso: python -m benchmarks.detector [--sintetico] [--repeticoes 5]
+
+Sem o pt_core_news_md/sm instalado, use --sintetico: um pipeline em branco
+com vetores aleatórios e um analisador simples no lugar do parser.
+"""
+
+import argparse
+
+import numpy as np
+import spacy
+from spacy.language import Language
+
+from . import configurar_django, cronometrar
+
+TEXTOS_EXEMPLO = [
+    "Adoro cozinhar receitas novas para a família e testar sabores diferentes",
+    "Gosto de programação, jogos e resolver problemas de lógica no computador",
+    "Passo horas desenhando, pintando e criando ilustrações digitais",
+    "Pratico esportes todos os dias e adoro ajudar pessoas a treinar",
+    "Cuido de animais de estimação e gosto de natureza e plantas",
+    "Toco violão, canto e componho música com meus amigos",
+    "Leio livros sobre história, política e economia",
+    "Gosto de organizar eventos, planilhas e controlar finanças",
+]
+
+
+@Language.component("analisador_sintetico")
+def analisador_sintetico(doc):
+    """
+    Substituto determinístico do parser para testes e benchmarks: palavras
+    viram substantivos com o próprio texto como lema, e cada par de palavras
+    vizinhas forma um chunk nominal.
+    """
+    for token in doc:
+        token.pos_ = "NOUN" if token.is_alpha else "PUNCT"
+        token.lemma_ = token.lower_
+        token.dep_ = "ROOT"
+    for i in range(0, len(doc) - 1, 2):
+        if doc[i].is_alpha and doc[i + 1].is_alpha:
+            doc[i].head = doc[i + 1]
+            doc[i].dep_ = "amod"
+    return doc
+
+
+def montar_pipeline_sintetico(dimensao=8, semente=0):
+    """
+    Pipeline em branco com vetores aleatórios para todas as palavras da
+    taxonomia e dos textos de exemplo. O componente se chama "parser" para
+    fazer parte da visão do detector em config.nlp.
+    """
+    from profession_detector.professions import PROFESSION_DESCRIPTIONS, PROFESSION_KEYWORDS
+
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("analisador_sintetico", name="parser")
+
+    textos = list(TEXTOS_EXEMPLO) + list(PROFESSION_DESCRIPTIONS.values())
+    textos += [palavra for chaves in PROFESSION_KEYWORDS.values() for palavra in chaves]
+    palavras = sorted({token.lower_ for doc in nlp.tokenizer.pipe(textos) for token in doc if token.is_alpha})
+
+    gerador = np.random.default_rng(semente)
+    for palavra in palavras:
+        nlp.vocab.set_vector(palavra, gerador.normal(size=dimensao).astype("float32"))
+    return nlp
+
+
+def suggest_professions_legado(text, nlp):
+    """
+    Implementação anterior de suggest_professions, com o modelo recebido por
+    parâmetro. Mantida como referência de saída e de tempo.
+    """
+    from profession_detector.professions import PROFESSION_DESCRIPTIONS, PROFESSION_KEYWORDS
+    from profession_detector.services import analisar_toxicidade, extrair_conceitos_principais
+
+    deteccao = analisar_toxicidade(text)
+    if deteccao:
+        return ([], deteccao)
+
+    doc_usuario = nlp(text.lower())
+    tokens_importantes, chunks = extrair_conceitos_principais(doc_usuario)
+    if len(tokens_importantes) == 0 and len(chunks) == 0:
+        return ([], None)
+
+    scores = {}
+    for profession, keywords in PROFESSION_KEYWORDS.items():
+        score = 0
+
+        user_lemmas = {token.lemma_ for token in tokens_importantes}
+        direct_matches = len(user_lemmas.intersection(keywords))
+        score += direct_matches * 3.0
+
+        for chunk in chunks:
+            if chunk in keywords or any(keyword in chunk for keyword in keywords):
+                score += 2.5
+
+        if profession in PROFESSION_DESCRIPTIONS and doc_usuario.has_vector:
+            doc_profissao = nlp(PROFESSION_DESCRIPTIONS[profession])
+            if doc_profissao.has_vector:
+                similaridade_doc = doc_usuario.similarity(doc_profissao)
+                if similaridade_doc > 0.3:
+                    score += similaridade_doc * 15
+
+        for token_usuario in tokens_importantes:
+            if token_usuario.has_vector:
+                max_sim_token = 0
+                for keyword in keywords:
+                    keyword_doc = nlp(keyword)
+                    if keyword_doc.has_vector:
+                        sim = token_usuario.similarity(keyword_doc)
+                        if sim > max_sim_token:
+                            max_sim_token = sim
+                if max_sim_token > 0.65:
+                    score += max_sim_token * 2.5
+
+        if score > 0 and score < 5 and len(text.split()) < 5:
+            score *= 0.5
+
+        if score > 0:
+            scores[profession] = round(score, 2)
+
+    sorted_professions = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
+    sorted_professions = [(prof, score) for prof, score in sorted_professions if score >= 3.0]
+    return (sorted_professions, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sintetico', action='store_true',
+                        help="Usa um pipeline sintético em vez do modelo instalado.")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.conf import settings
+    from config import nlp as gerenciador_nlp
+    from profession_detector.services import suggest_professions
+
+    # Mede o cálculo, não o cache de resultados
+    settings.DETECTOR_CACHE_SUGESTOES = 0
+    if args.sintetico:
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_VETORES, montar_pipeline_sintetico())
+    nlp = gerenciador_nlp.obter_nlp('detector')
+    suggest_professions(TEXTOS_EXEMPLO[0])  # monta o índice fora da medição
+
+    print(f"{'texto':>6} {'legado (ms)':>12} {'atual (ms)':>11} {'ganho':>7}")
+    for i, texto in enumerate(TEXTOS_EXEMPLO):
+        if [p for p, _ in suggest_professions(texto)[0]] != [p for p, _ in suggest_professions_legado(texto, nlp)[0]]:
+            raise SystemExit(f"Ranking divergente para o texto {i}: {texto!r}")
+
+        legado = cronometrar(suggest_professions_legado, texto, nlp, repeticoes=args.repeticoes)
+        atual = cronometrar(suggest_professions, texto, repeticoes=args.repeticoes)
+        print(f"{i:>6} {legado * 1000:>12.2f} {atual * 1000:>11.2f} {legado / atual:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+# Em benchmarks/latencia_detector.py
+"""
+Latência do detector de profissões (suggest_professions) num corpus sintético
+de textos sobre hobbies: curtos, médios, longos e uma mistura com textos
+ofensivos. Com o modelo frio, mede a primeira chamada depois de cada uma de
+--recargas recargas do modelo e do índice (só ela é fria); com o modelo
+quente (depois de uma passada de aquecimento), mede p50/p95/p99 e vazão.
+O cache de resultados fica sempre desligado.
+
+Uso:
+    python -m benchmarks.latencia_detector                     # compara com a linha de base
+    python -m benchmarks.latencia_detector --salvar-baseline   # grava a linha de base
+    python -m benchmarks.latencia_detector --limite 0.2 --sintetico
+
+Roda offline com o pt_core_news_md (ou _sm) instalado. A linha de base
+(benchmarks/baselines/detector.json) vale para a máquina e o modelo em que
+foi gravada; com outro modelo a comparação é pulada. O comando termina com
+código 1 se a primeira chamada fria (mediana das recargas) ou o p50/p95
+quente de algum cenário passar da linha de base em mais que --limite (fração).
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from . import configurar_django
+
+BASELINE_PADRAO = Path(__file__).resolve().parent / 'baselines' / 'detector.json'
+
+FRASES_HOBBIES = [
+    "adoro cozinhar receitas novas", "gosto de programação e jogos", "passo horas desenhando",
+    "pratico esportes todos os dias", "cuido de animais de estimação", "toco violão com amigos",
+    "leio livros sobre história", "organizo eventos e planilhas", "gosto de resolver problemas de lógica",
+    "faço trilhas na natureza", "fotografo paisagens e pessoas", "escrevo contos e poesias",
+    "monto computadores e mexo com eletrônica", "ajudo pessoas a treinar", "cultivo plantas e hortas",
+    "edito vídeos para a internet", "estudo idiomas e culturas", "conserto bicicletas e motos",
+]
+
+OFENSAS = ["que merda", "vai se foder", "filho da puta", "porra nenhuma"]
+
+# Cenário: (mínimo e máximo de frases por texto, fração de textos ofensivos)
+CENARIOS = {
+    'curto': ((1, 1), 0.0),
+    'medio': ((5, 8), 0.0),
+    'longo': ((40, 60), 0.0),
+    'misto_toxico': ((1, 8), 0.3),
+}
+
+# Com o modelo frio só a primeira chamada é medida; p50/p95 só fazem sentido quente
+METRICAS_COMPARADAS = {
+    'frio': ('primeira_chamada_ms',),
+    'quente': ('p50_ms', 'p95_ms'),
+}
+
+
+def gerar_corpus(cenario, quantidade, semente=0):
+    """
+    Textos determinísticos para o cenário, cada um juntando frases de hobbies
+    (e, numa fração deles, uma ofensa).
+    """
+    (minimo, maximo), fracao_toxica = CENARIOS[cenario]
+    aleatorio = random.Random(f"{cenario}-{semente}")
+    textos = []
+    for _ in range(quantidade):
+        frases = [aleatorio.choice(FRASES_HOBBIES) for _ in range(aleatorio.randint(minimo, maximo))]
+        if aleatorio.random() < fracao_toxica:
+            frases.insert(aleatorio.randrange(len(frases) + 1), aleatorio.choice(OFENSAS))
+        textos.append(", ".join(frases))
+    return textos
+
+
+def medir(funcao, textos):
+    """
+    Latência de cada chamada (s) e vazão (textos/s) de uma passada pelo corpus.
+    """
+    latencias = []
+    inicio = time.perf_counter()
+    for texto in textos:
+        comeco = time.perf_counter()
+        funcao(texto)
+        latencias.append(time.perf_counter() - comeco)
+    total = time.perf_counter() - inicio
+    return latencias, len(textos) / total
+
+
+def medir_frio(carregar, funcao, textos, recargas):
+    """
+    Recarrega o modelo `recargas` vezes e mede só a primeira chamada depois
+    de cada recarga (a única realmente fria), com um texto diferente a cada vez.
+    """
+    primeiras, cargas = [], []
+    for indice in range(recargas):
+        cargas.append(carregar()[1])
+        comeco = time.perf_counter()
+        funcao(textos[indice % len(textos)])
+        primeiras.append(time.perf_counter() - comeco)
+    primeiras_ms = np.array(primeiras) * 1000
+    return {
+        'primeira_chamada_ms': round(float(np.median(primeiras_ms)), 3),
+        'primeira_chamada_max_ms': round(float(primeiras_ms.max()), 3),
+        'carga_s': round(float(np.median(cargas)), 3),
+    }
+
+
+def resumir(latencias, vazao):
+    p50, p95, p99 = np.percentile(np.array(latencias) * 1000, [50, 95, 99])
+    return {
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'textos_por_s': round(vazao, 1),
+    }
+
+
+def comparar(resultado, baseline, limite):
+    """
+    Lista de regressões (mensagens) em relação à linha de base.
+    """
+    regressoes = []
+    for nome, metricas in resultado['cenarios'].items():
+        referencia = baseline.get('cenarios', {}).get(nome)
+        if not referencia:
+            continue
+        for metrica in METRICAS_COMPARADAS[nome.split('/')[0]]:
+            atual, anterior = metricas[metrica], referencia.get(metrica)
+            if anterior and atual > anterior * (1 + limite):
+                regressoes.append(
+                    f"{nome} {metrica}: {atual:.2f} ms (linha de base {anterior:.2f} ms, "
+                    f"+{(atual / anterior - 1) * 100:.0f}%)"
+                )
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--textos', type=int, default=50, help="Textos por cenário.")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Passadas com o modelo quente.")
+    parser.add_argument('--recargas', type=int, default=5,
+                        help="Recargas do modelo por cenário para medir a primeira chamada fria.")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PADRAO)
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--limite', type=float, default=0.25,
+                        help="Piora tolerada em relação à linha de base (0.25 = 25%%).")
+    parser.add_argument('--sintetico', action='store_true',
+                        help="Usa o pipeline sintético de benchmarks.detector em vez do modelo instalado.")
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.conf import settings
+    from config import nlp as gerenciador_nlp
+    from profession_detector import indices
+    from profession_detector.cache import redefinir_cache_sugestoes
+    from profession_detector.services import suggest_professions
+
+    # Mede o cálculo, não o cache de resultados
+    settings.DETECTOR_CACHE_SUGESTOES = 0
+    redefinir_cache_sugestoes()
+
+    def carregar():
+        gerenciador_nlp.descarregar_modelos()
+        indices._indices.clear()
+        inicio = time.perf_counter()
+        if args.sintetico:
+            from .detector import montar_pipeline_sintetico
+            gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_VETORES, montar_pipeline_sintetico())
+        nlp = gerenciador_nlp.obter_nlp('detector')
+        return nlp, time.perf_counter() - inicio
+
+    nlp, carga = carregar()
+    resultado = {
+        'modelo': f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}",
+        'carga_modelo_s': round(carga, 3),
+        'cenarios': {},
+    }
+
+    print(f"Modelo {resultado['modelo']} carregado em {carga:.2f} s")
+    print(f"{'cenário':<20} {'1ª chamada (ms)':>15} {'máx (ms)':>9} {'carga (s)':>9}")
+    quentes = {}
+    for cenario in CENARIOS:
+        textos = gerar_corpus(cenario, args.textos)
+
+        # Frio: primeira chamada depois de cada recarga do modelo e do índice
+        nome = f"frio/{cenario}"
+        frio = resultado['cenarios'][nome] = medir_frio(carregar, suggest_professions, textos, args.recargas)
+        print(f"{nome:<20} {frio['primeira_chamada_ms']:>15.2f} {frio['primeira_chamada_max_ms']:>9.2f} "
+              f"{frio['carga_s']:>9.3f}")
+
+        # Quente: todas as passadas depois de uma de aquecimento
+        medir(suggest_professions, textos)
+        latencias, vazoes = [], []
+        for _ in range(args.repeticoes):
+            parcial, vazao = medir(suggest_professions, textos)
+            latencias += parcial
+            vazoes.append(vazao)
+        quentes[f"quente/{cenario}"] = resumir(latencias, float(np.median(vazoes)))
+
+    print(f"{'cenário':<20} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'textos/s':>9}")
+    for nome, metricas in quentes.items():
+        resultado['cenarios'][nome] = metricas
+        print(f"{nome:<20} {metricas['p50_ms']:>9.2f} {metricas['p95_ms']:>9.2f} "
+              f"{metricas['p99_ms']:>9.2f} {metricas['textos_por_s']:>9.1f}")
+
+    if args.salvar_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(resultado, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+        print(f"Linha de base gravada em {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"Sem linha de base em {args.baseline}; use --salvar-baseline para criá-la.")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if baseline.get('modelo') != resultado['modelo']:
+        print(f"Linha de base gravada com {baseline.get('modelo')}; comparação pulada.")
+        return
+
+    regressoes = comparar(resultado, baseline, args.limite)
+    if regressoes:
+        print(f"Regressões acima de {args.limite:.0%}:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        sys.exit(1)
+    print(f"Sem regressões acima de {args.limite:.0%} em relação à linha de base.")
+
+
+if __name__ == '__main__':
+    main()
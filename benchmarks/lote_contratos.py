@@ -0,0 +1,68 @@
+# Em benchmarks/lote_contratos.py
+"""
+Tempo total da extração em lote de contratos (extractor.lote) conforme o
+número de processos do pool: cada processo extrai o texto de um .docx e as
+entidades com o seu modelo. Mede só a parte paralela (sem gravar no banco),
+com contratos sintéticos e o pipeline de benchmarks.contratos.
+
+Uso: python -m benchmarks.lote_contratos [--arquivos 32] [--paginas 20] [--processos 1 2 4]
+"""
+
+import argparse
+import io
+import os
+import time
+
+import docx
+
+from . import configurar_django
+from .contratos import gerar_contrato, montar_pipeline
+
+
+def gerar_docx(texto):
+    documento = docx.Document()
+    for linha in texto.split("\n"):
+        documento.add_paragraph(linha)
+    conteudo = io.BytesIO()
+    documento.save(conteudo)
+    return conteudo.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--arquivos', type=int, default=32)
+    parser.add_argument('--paginas', type=int, default=20)
+    parser.add_argument('--processos', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    configurar_django()
+    from config import nlp as gerenciador_nlp
+    from extractor.lote import obter_pool, processar_arquivo, redefinir_pool
+
+    # Carregado antes do fork: os workers herdam o modelo
+    gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+    itens = [(f"{i}.docx", gerar_docx(gerar_contrato(args.paginas, semente=i))) for i in range(args.arquivos)]
+
+    print(f"{args.arquivos} contratos de {args.paginas} páginas")
+    print(f"{'processos':>9} {'total (s)':>10} {'arquivos/s':>11} {'ganho':>7}")
+    base = None
+    for processos in args.processos:
+        pool = obter_pool(processos)
+        if pool:
+            pool.map(int, range(processos))  # Workers já iniciados
+        mapear = pool.imap if pool else map
+
+        inicio = time.perf_counter()
+        resultados = list(mapear(processar_arquivo, itens))
+        total = time.perf_counter() - inicio
+        if any(resultado['erro'] for resultado in resultados):
+            raise SystemExit(f"Erro ao processar o lote com {processos} processo(s)")
+
+        base = base or total
+        print(f"{processos:>9} {total:>10.2f} {args.arquivos / total:>11.1f} {base / total:>6.1f}x")
+        redefinir_pool()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# Em benchmarks/secoes.py
+"""
+Compara a detecção de seções em uma passada (core.views.localizar_secoes)
+com a implementação antiga, que fazia uma varredura por padrão.
+
+Uso: python -m benchmarks.secoes [--blocos 50 200 1000]
+"""
+
+import argparse
+import random
+import re
+
+from . import configurar_django, cronometrar
+
+TITULOS_EXEMPLO = [
+    'Objetivo', 'Resumo Profissional', 'Experiência Profissional', 'Experiências',
+    'Histórico Profissional', 'Formação Acadêmica', 'Educação', 'Habilidades',
+    'Competências:', 'Hard Skills', 'Idiomas', 'Languages', 'Cursos',
+    'Certificações', 'Formações Complementares', 'Projetos', 'Portfólio',
+    '1. Experiência', '- Habilidades', '• Idiomas:', 'Work Experience',
+]
+
+LINHAS_EXEMPLO = [
+    '2019 - 2023 Desenvolvedor na Empresa X',
+    'Desenvolvimento de APIs utilizando Python, Django e PostgreSQL.',
+    'Liderança de equipe com Scrum e Kanban.',
+    'Bacharelado em Sistemas de Informação - Universidade Y',
+    'Inglês avançado, espanhol intermediário',
+    'Experiência com AWS, Docker e Kubernetes em produção.',
+    '',
+]
+
+
+def gerar_curriculo(blocos, semente=0):
+    """
+    Gera um currículo sintético com `blocos` seções de conteúdo variado.
+    """
+    aleatorio = random.Random(semente)
+    linhas = ['Fulano de Tal', 'fulano@email.com', '']
+    for _ in range(blocos):
+        linhas.append(aleatorio.choice(TITULOS_EXEMPLO))
+        for _ in range(aleatorio.randint(2, 12)):
+            linhas.append(aleatorio.choice(LINHAS_EXEMPLO))
+        linhas.append('')
+    return '\n'.join(linhas)
+
+
+def localizar_secoes_legado(texto):
+    """
+    Implementação anterior: um re.finditer sobre o texto inteiro para cada
+    padrão de PADROES_SECOES. Mantida como referência de saída e de tempo.
+    """
+    from core.views import PADROES_SECOES
+
+    texto_lower = texto.lower()
+    posicoes_titulos = []
+
+    for tipo_secao, padroes in PADROES_SECOES.items():
+        for padrao in padroes:
+            regex_completo = r'(?:^|\n)\s*(?:\d+\.?\s*|[-•*]\s*)?' + padrao + r'\s*:?\s*(?:\n|$)'
+            for match in re.finditer(regex_completo, texto_lower, re.MULTILINE | re.IGNORECASE):
+                posicoes_titulos.append({
+                    'tipo': tipo_secao,
+                    'inicio': match.start(),
+                    'fim_titulo': match.end(),
+                })
+
+    posicoes_titulos.sort(key=lambda x: x['inicio'])
+
+    secoes_detectadas = {}
+    for i, secao in enumerate(posicoes_titulos):
+        inicio_conteudo = secao['fim_titulo']
+        if i + 1 < len(posicoes_titulos):
+            fim_conteudo = posicoes_titulos[i + 1]['inicio']
+        else:
+            fim_conteudo = len(texto)
+
+        conteudo = texto[inicio_conteudo:fim_conteudo].strip()
+        if secao['tipo'] in secoes_detectadas:
+            secoes_detectadas[secao['tipo']] += '\n\n' + conteudo
+        else:
+            secoes_detectadas[secao['tipo']] = conteudo
+
+    return secoes_detectadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--blocos', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    configurar_django()
+    from core.views import detectar_secoes_inteligente
+
+    print(f"{'blocos':>8} {'caracteres':>11} {'legado (ms)':>12} {'uma passada (ms)':>17} {'ganho':>7}")
+    for blocos in args.blocos:
+        texto = gerar_curriculo(blocos)
+        if detectar_secoes_inteligente(texto) != localizar_secoes_legado(texto):
+            raise SystemExit(f"Saída divergente para {blocos} blocos")
+
+        legado = cronometrar(localizar_secoes_legado, texto, repeticoes=args.repeticoes)
+        novo = cronometrar(detectar_secoes_inteligente, texto, repeticoes=args.repeticoes)
+        print(f"{blocos:>8} {len(texto):>11} {legado * 1000:>12.2f} {novo * 1000:>17.2f} {legado / novo:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# Em benchmarks/toxicidade.py
+"""
+Compara o filtro de toxicidade compartilhado (profession_detector.toxicidade),
+que varre o texto uma vez, com as implementações antigas: um re.search por
+palavra de CORE_OFFENSIVE mais quatro regex, e uma busca de substring por
+termo de PALAVRAS_INADEQUADAS.
+
+Uso: python -m benchmarks.toxicidade [--palavras 1000 10000 100000]
+"""
+
+import argparse
+import random
+import re
+
+from . import configurar_django, cronometrar
+
+PALAVRAS_NEUTRAS = [
+    'gosto', 'de', 'jogar', 'bola', 'com', 'amigos', 'nos', 'fins', 'semana',
+    'leio', 'livros', 'sobre', 'história', 'cozinho', 'para', 'família',
+    'curso', 'cultura', 'computador', 'programação', 'música', 'natureza',
+]
+
+
+def gerar_texto(palavras, semente=0, ofensas=('merda', 'filho da puta', 'vai se foder')):
+    """
+    Gera um texto com `palavras` palavras neutras e algumas ofensas no meio.
+    """
+    aleatorio = random.Random(semente)
+    texto = [aleatorio.choice(PALAVRAS_NEUTRAS) for _ in range(palavras)]
+    for ofensa in ofensas:
+        texto.insert(aleatorio.randrange(len(texto) + 1), ofensa)
+    return ' '.join(texto)
+
+
+def analisar_toxicidade_legado(texto):
+    """
+    Implementação anterior de analisar_toxicidade. Mantida como referência
+    de saída e de tempo.
+    """
+    from profession_detector.toxicidade import CORE_OFFENSIVE, PALAVRAS_POSITIVAS
+
+    if not texto or len(texto.strip()) < 5:
+        return None
+
+    texto_lower = texto.lower()
+    alertas = []
+    confianca_total = 0
+
+    palavras_encontradas = []
+    for palavra in CORE_OFFENSIVE:
+        padrao = r'\b' + re.escape(palavra) + r'\b'
+        if re.search(padrao, texto_lower):
+            palavras_encontradas.append(palavra)
+            confianca_total += 0.9
+
+    if palavras_encontradas:
+        alertas.append("palavra_ofensiva_core")
+
+    padroes = {
+        r'\bv[aá]i?\s+(?:s[ei]|t[ei])\s+(?:foder|ferrar|lascar)': 0.9,
+        r'\b(?:filho|filha)\s+d[aeo]\s+(?:puta|rapariga)': 0.95,
+        r'(.)\1{5,}': 0.3,
+        r'\barrombad[ao]s?\b': 0.85
+    }
+    for padrao, peso in padroes.items():
+        if re.search(padrao, texto_lower):
+            alertas.append("padrao_agressivo")
+            confianca_total += peso
+
+    palavras_no_texto = set(texto_lower.split())
+    if len(palavras_no_texto.intersection(PALAVRAS_POSITIVAS)) >= 2:
+        confianca_total *= 0.3
+
+    if confianca_total >= 0.9:
+        return {
+            'detectado': True,
+            'confianca': min(confianca_total, 1.0),
+            'tipos': list(set(alertas)),
+            'quantidade': len(alertas),
+            'palavras': palavras_encontradas if palavras_encontradas else None,
+            'mensagem': 'Detectamos linguagem inadequada ou comportamento suspeito em seu texto.'
+        }
+    return None
+
+
+def detectar_linguagem_inapropriada_legado(texto):
+    """
+    Implementação anterior (busca de substring, sem limite de palavra).
+    """
+    from profession_detector.toxicidade import PALAVRAS_INADEQUADAS
+
+    if not texto:
+        return None
+    texto_lower = texto.lower()
+    palavras_detectadas = [palavra for palavra in PALAVRAS_INADEQUADAS if palavra in texto_lower]
+    if palavras_detectadas:
+        return {
+            'detectado': True,
+            'quantidade': len(palavras_detectadas),
+            'palavras': palavras_detectadas[:3],
+            'tem_mais': len(palavras_detectadas) > 3
+        }
+    return None
+
+
+def resumo(deteccao):
+    """
+    Parte comparável de uma detecção (a ordem das palavras antigas vinha de um set).
+    """
+    if deteccao is None:
+        return None
+    return (deteccao['confianca'], sorted(deteccao['tipos']), deteccao['quantidade'],
+            sorted(deteccao['palavras'] or []))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--palavras', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    configurar_django()
+    from profession_detector.toxicidade import analisar_toxicidade, detectar_linguagem_inapropriada
+
+    print(f"{'palavras':>9} {'legado (ms)':>12} {'filtro (ms)':>12} {'ganho':>7}")
+    for palavras in args.palavras:
+        texto = gerar_texto(palavras)
+        if resumo(analisar_toxicidade(texto)) != resumo(analisar_toxicidade_legado(texto)):
+            raise SystemExit(f"Detecção divergente para {palavras} palavras")
+
+        def legado():
+            analisar_toxicidade_legado(texto)
+            detectar_linguagem_inapropriada_legado(texto)
+
+        def filtro():
+            analisar_toxicidade(texto)
+            detectar_linguagem_inapropriada(texto)
+
+        tempo_legado = cronometrar(legado, repeticoes=args.repeticoes)
+        tempo_filtro = cronometrar(filtro, repeticoes=args.repeticoes)
+        print(f"{palavras:>9} {tempo_legado * 1000:>12.2f} {tempo_filtro * 1000:>12.2f} "
+              f"{tempo_legado / tempo_filtro:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,3 +12,6 @@ python manage.py collectstatic --no-input
 
 # 3. Aplica as migrações do banco de dados
 python manage.py migrate
+
+# Com EXTRACAO_ASSINCRONA=True, rode também um serviço à parte com
+# "python manage.py run_extraction_worker" (ver README, Fila de extração)
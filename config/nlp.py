@@ -0,0 +1,163 @@
+# config/nlp.py
+import gc
+import threading
+
+import spacy
+from django.conf import settings
+
+MODELO_PADRAO = "pt_core_news_sm"
+MODELO_VETORES = "pt_core_news_md"
+
+# Modelos (em ordem de preferência) e componentes que cada tarefa precisa.
+# componentes=None executa o pipeline completo; () executa só o tokenizador.
+TAREFAS = {
+    'curriculo': {'modelos': [MODELO_PADRAO], 'componentes': None},
+    'habilidades': {'modelos': [MODELO_PADRAO], 'componentes': ()},
+    'contratos': {'modelos': [MODELO_PADRAO], 'componentes': ('ner',)},
+    'detector': {
+        'modelos': [MODELO_VETORES, MODELO_PADRAO],
+        'componentes': ('morphologizer', 'parser', 'attribute_ruler', 'lemmatizer'),
+    },
+}
+
+_modelos = {}
+_visoes = {}
+_preparacoes = {}
+_lock = threading.RLock()
+
+
+class VisaoPipeline:
+    """
+    Visão de um modelo já carregado que executa apenas os componentes pedidos.
+    Usa o parâmetro `disable` do spaCy a cada chamada, então o modelo
+    compartilhado nunca é alterado e a visão pode ser usada entre threads.
+    """
+
+    def __init__(self, nome_modelo, nlp, componentes=None):
+        self.nome_modelo = nome_modelo
+        self.nlp = nlp
+        self.desativados = _componentes_desativados(nlp, componentes)
+
+    def __call__(self, texto):
+        return self.nlp(texto, disable=self.desativados)
+
+    def pipe(self, textos, **kwargs):
+        return self.nlp.pipe(textos, disable=self.desativados, **kwargs)
+
+    @property
+    def pipe_names(self):
+        return [nome for nome in self.nlp.pipe_names if nome not in self.desativados]
+
+    def __getattr__(self, nome):
+        # vocab, make_doc, tokenizer, max_length, meta...
+        return getattr(self.nlp, nome)
+
+    def __repr__(self):
+        return f"<VisaoPipeline {self.nome_modelo} {self.pipe_names}>"
+
+
+def _componentes_desativados(nlp, componentes):
+    if componentes is None:
+        return ()
+    ativos = set(componentes)
+    # Componentes que escutam um tok2vec compartilhado dependem dele
+    for nome, componente in nlp.pipeline:
+        ouvintes = getattr(componente, 'listening_components', None)
+        if ouvintes and ativos.intersection(ouvintes):
+            ativos.add(nome)
+    return tuple(nome for nome in nlp.pipe_names if nome not in ativos)
+
+
+def carregar_modelo(nome):
+    """
+    Carrega o modelo na primeira chamada e reaproveita a mesma instância
+    em todas as chamadas seguintes do processo.
+    """
+    nlp = _modelos.get(nome)
+    if nlp is None:
+        with _lock:
+            nlp = _modelos.get(nome)
+            if nlp is None:
+                nlp = spacy.load(nome)
+                _modelos[nome] = nlp
+    return nlp
+
+
+def obter_nlp(tarefa):
+    """
+    Retorna a visão do pipeline adequada à tarefa (ver TAREFAS). Tenta os
+    modelos na ordem de preferência; se nenhum estiver instalado, levanta
+    o OSError do último.
+    """
+    visao = _visoes.get(tarefa)
+    if visao is not None:
+        return visao
+
+    config = TAREFAS[tarefa]
+    with _lock:
+        visao = _visoes.get(tarefa)
+        if visao is not None:
+            return visao
+
+        erro = None
+        for nome in config['modelos']:
+            try:
+                nlp = carregar_modelo(nome)
+            except OSError as e:
+                print(f"AVISO: Modelo {nome} indisponível para '{tarefa}': {e}")
+                erro = e
+                continue
+            visao = VisaoPipeline(nome, nlp, config['componentes'])
+            _visoes[tarefa] = visao
+            return visao
+        raise erro
+
+
+def definir_modelo(nome, nlp):
+    """
+    Registra uma instância já carregada sob o nome do modelo (útil em testes
+    e em scripts que montam o próprio pipeline).
+    """
+    with _lock:
+        _modelos[nome] = nlp
+        _visoes.clear()
+
+
+def descarregar_modelos():
+    """
+    Esquece todos os modelos e visões carregados neste processo.
+    """
+    with _lock:
+        _modelos.clear()
+        _visoes.clear()
+
+
+def registrar_preparacao(tarefa, funcao):
+    """
+    Registra uma função chamada com a visão da tarefa logo depois que
+    precarregar_modelos a carrega (por exemplo, para montar índices derivados
+    do modelo antes do fork dos workers).
+    """
+    with _lock:
+        _preparacoes.setdefault(tarefa, []).append(funcao)
+
+
+def precarregar_modelos(tarefas=None):
+    """
+    Carrega antecipadamente os modelos das tarefas indicadas (por padrão as
+    de settings.NLP_PRECARREGAR). Chamado no processo mestre do gunicorn com
+    --preload, faz os workers herdarem os modelos via copy-on-write; o
+    gc.freeze() evita que o coletor de lixo toque nessas páginas depois do fork.
+    """
+    if tarefas is None:
+        tarefas = getattr(settings, 'NLP_PRECARREGAR', [])
+    if not tarefas:
+        return
+    for tarefa in tarefas:
+        try:
+            nlp = obter_nlp(tarefa)
+        except OSError:
+            continue
+        for funcao in _preparacoes.get(tarefa, []):
+            funcao(nlp)
+    gc.freeze()
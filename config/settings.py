@@ -126,9 +126,72 @@ DEFAULT_FILE_STORAGE = 'config.storages.SupabaseStorage'
 SUPABASE_URL = os.environ.get('SUPABASE_URL')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
 SUPABASE_BUCKET = os.environ.get('SUPABASE_BUCKET')
+# Validade (s) e tamanho do cache de existência/URL pública do SupabaseStorage
+SUPABASE_CACHE_TTL = int(os.environ.get('SUPABASE_CACHE_TTL', 300))
+SUPABASE_CACHE_TAMANHO = int(os.environ.get('SUPABASE_CACHE_TAMANHO', 1024))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# --- Modelos do spaCy (config/nlp.py) ---
+# Tarefas cujos modelos são carregados já na importação do WSGI, por exemplo
+# "curriculo contratos detector". Com gunicorn --preload os workers herdam os
+# modelos do processo mestre em vez de cada um carregar a sua cópia.
+NLP_PRECARREGAR = os.environ.get('NLP_PRECARREGAR', '').split()
+
+# --- Fila de extração (core/fila.py) ---
+# Com False (padrão), tudo roda na requisição. Com True, os uploads apenas
+# enfileiram a extração, que só é feita se houver um processo rodando
+# "python manage.py run_extraction_worker" ao lado do gunicorn.
+EXTRACAO_ASSINCRONA = os.environ.get('EXTRACAO_ASSINCRONA', 'False') == 'True'
+EXTRACAO_MAX_TENTATIVAS = int(os.environ.get('EXTRACAO_MAX_TENTATIVAS', 3))
+
+# Limites de leitura dos arquivos enviados. O padrão (0) lê o arquivo inteiro;
+# com um limite, o texto além dele fica fora da extração.
+EXTRACAO_MAX_PAGINAS = int(os.environ.get('EXTRACAO_MAX_PAGINAS', 0))
+EXTRACAO_MAX_CARACTERES = int(os.environ.get('EXTRACAO_MAX_CARACTERES', 0))
+# Contratos maiores que EXTRACAO_NER_TAMANHO_TRECHO caracteres passam pelo NER
+# em trechos (cortados em páginas/parágrafos, com EXTRACAO_NER_SOBREPOSICAO
+# caracteres repetidos entre vizinhos), o que limita a memória do modelo. 0 desativa.
+EXTRACAO_NER_TAMANHO_TRECHO = int(os.environ.get('EXTRACAO_NER_TAMANHO_TRECHO', 100000))
+EXTRACAO_NER_SOBREPOSICAO = int(os.environ.get('EXTRACAO_NER_SOBREPOSICAO', 2000))
+# Upload em lote de contratos (extractor:upload_lote): processos que extraem os
+# arquivos em paralelo, cada um com o seu modelo (1 = na própria requisição), e
+# limites do lote, contando os arquivos de dentro dos .zip. Cada worker do
+# gunicorn cria o seu pool: ver gunicorn.conf.py antes de aumentar.
+EXTRACAO_LOTE_PROCESSOS = int(os.environ.get('EXTRACAO_LOTE_PROCESSOS', 1))
+EXTRACAO_LOTE_MAX_ARQUIVOS = int(os.environ.get('EXTRACAO_LOTE_MAX_ARQUIVOS', 100))
+EXTRACAO_LOTE_MAX_MB = int(os.environ.get('EXTRACAO_LOTE_MAX_MB', 200))
+
+# --- Taxonomias extras de habilidades (arquivos JSON {categoria: [skills]}) ---
+# Separadas por espaço; editar um arquivo recarrega o matcher sem reiniciar.
+TAXONOMIAS_HABILIDADES = os.environ.get('TAXONOMIAS_HABILIDADES', '').split()
+
+# --- Índice de profissões do detector (profession_detector/indices.py) ---
+# Vetores pré-calculados da taxonomia, um arquivo por modelo e versão da
+# taxonomia; os workers leem o arquivo em vez de recalcular. Vazio desativa.
+DETECTOR_CACHE_DIR = os.environ.get('DETECTOR_CACHE_DIR', str(BASE_DIR / '.cache' / 'detector'))
+# Arquivo (JSON ou YAML) com a taxonomia de profissões; vazio usa o
+# profession_detector/dados/profissoes.json. É compilado para DETECTOR_CACHE_DIR
+# e recarregado automaticamente quando editado.
+DETECTOR_TAXONOMIA = os.environ.get('DETECTOR_TAXONOMIA', '')
+# Profissões sem termo em comum com o texto só são pontuadas se estiverem entre
+# as N semanticamente mais próximas (mantém a latência fixa em taxonomias grandes)
+DETECTOR_LISTA_SEMANTICA = int(os.environ.get('DETECTOR_LISTA_SEMANTICA', 100))
+# A partir de DETECTOR_ANN_MINIMO profissões, essa lista sai de uma busca
+# aproximada (IVF) que visita DETECTOR_ANN_SONDAS grupos: mais sondas, mais
+# revocação e mais latência. DETECTOR_ANN_SONDAS=0 força a busca exata.
+DETECTOR_ANN_MINIMO = int(os.environ.get('DETECTOR_ANN_MINIMO', 5000))
+DETECTOR_ANN_SONDAS = int(os.environ.get('DETECTOR_ANN_SONDAS', 16))
+# API em lote (profession_detector:sugestoes_em_lote): limites por requisição
+# e tamanho dos lotes passados ao nlp.pipe
+DETECTOR_LOTE_MAX_TEXTOS = int(os.environ.get('DETECTOR_LOTE_MAX_TEXTOS', 1000))
+DETECTOR_LOTE_MAX_CARACTERES = int(os.environ.get('DETECTOR_LOTE_MAX_CARACTERES', 5000))
+DETECTOR_LOTE_TAMANHO = int(os.environ.get('DETECTOR_LOTE_TAMANHO', 64))
+# Cache LRU dos resultados do detector por texto normalizado (0 desativa). Com
+# o nome de um dos CACHES do Django, os resultados são compartilhados entre processos.
+DETECTOR_CACHE_SUGESTOES = int(os.environ.get('DETECTOR_CACHE_SUGESTOES', 1024))
+DETECTOR_CACHE_SUGESTOES_ALIAS = os.environ.get('DETECTOR_CACHE_SUGESTOES_ALIAS', '')
+
 # Configuração para arquivos de mídia (uploads dos usuários)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
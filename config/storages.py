@@ -1,36 +1,182 @@
 # config/storages.py
+import io
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files.storage import Storage
+from storage3.exceptions import StorageException
 from supabase import create_client, Client
-import io
+
+# Usado com DEBUG quando SUPABASE_BUCKET não está definido
+BUCKET_PADRAO = 'documentos'
+
+
+class CacheTTL:
+    """
+    Cache pequeno com validade (em segundos) e tamanho máximo: ao passar do
+    limite, as entradas mais antigas são descartadas.
+    """
+
+    def __init__(self, ttl=300, tamanho_maximo=1024):
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave, padrao=None):
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return padrao
+            valor, expira_em = item
+            if expira_em <= time.monotonic():
+                del self._dados[chave]
+                return padrao
+            return valor
+
+    def definir(self, chave, valor):
+        with self._lock:
+            self._dados[chave] = (valor, time.monotonic() + self.ttl)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def remover(self, chave):
+        with self._lock:
+            self._dados.pop(chave, None)
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+
+# --- SUBSTITUTO LOCAL DO CLIENTE DO SUPABASE ---
+class _BucketLocal:
+    def __init__(self, pasta, url_base):
+        self.pasta = Path(pasta)
+        self.url_base = url_base
+
+    def upload(self, path, file):
+        destino = self.pasta / path
+        if destino.exists():
+            raise StorageException({'statusCode': 409, 'error': 'Duplicate', 'message': 'The resource already exists'})
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(file)
+
+    def download(self, path):
+        try:
+            return (self.pasta / path).read_bytes()
+        except FileNotFoundError:
+            raise StorageException({'statusCode': 404, 'error': 'not_found', 'message': 'Object not found'})
+
+    def remove(self, paths):
+        for path in paths:
+            (self.pasta / path).unlink(missing_ok=True)
+
+    def exists(self, path):
+        return (self.pasta / path).is_file()
+
+    def get_public_url(self, path):
+        return f"{self.url_base}{path}"
+
+
+class _ArmazenamentoLocal:
+    def __init__(self, pasta, url_base):
+        self.pasta = Path(pasta)
+        self.url_base = url_base
+
+    def from_(self, bucket):
+        return _BucketLocal(self.pasta / bucket, f"{self.url_base}{bucket}/")
+
+
+class ClienteLocal:
+    """
+    Cliente com a mesma interface usada do supabase (client.storage.from_(bucket)
+    com upload/download/remove/exists/get_public_url), gravando numa pasta
+    local. Usado em desenvolvimento (DEBUG) sem SUPABASE_URL e nos testes.
+    """
+
+    def __init__(self, pasta, url_base='/media/'):
+        self.storage = _ArmazenamentoLocal(pasta, url_base)
+
+
+# Um cliente por processo: o supabase mantém um pool de conexões HTTP, então
+# reaproveitá-lo evita um novo handshake a cada instância do storage
+_cliente = None
+_lock_cliente = threading.Lock()
+
+
+def obter_cliente():
+    global _cliente
+    if _cliente is None:
+        with _lock_cliente:
+            if _cliente is None:
+                if settings.SUPABASE_URL:
+                    _cliente = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+                elif settings.DEBUG:
+                    print("AVISO: SUPABASE_URL não configurada; arquivos gravados em MEDIA_ROOT.")
+                    _cliente = ClienteLocal(settings.MEDIA_ROOT, settings.MEDIA_URL)
+                else:
+                    # Em produção o disco local pode ser efêmero: os uploads se perderiam
+                    raise ImproperlyConfigured("Defina SUPABASE_URL e SUPABASE_KEY (ou use DEBUG=True).")
+    return _cliente
+
 
 class SupabaseStorage(Storage):
-    def __init__(self):
-        self.client: Client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_KEY
+    def __init__(self, client=None, bucket_name=None, cache_ttl=None, cache_tamanho=None):
+        self.client: Client = client or obter_cliente()
+        self.bucket_name = bucket_name or getattr(settings, 'SUPABASE_BUCKET', None)
+        if not self.bucket_name:
+            if not settings.DEBUG:
+                raise ImproperlyConfigured("Defina SUPABASE_BUCKET (ou use DEBUG=True).")
+            self.bucket_name = BUCKET_PADRAO
+        # Existência e URL pública de cada objeto; _save e delete mantêm o
+        # cache em dia, o TTL cobre remoções feitas fora deste processo
+        self.cache = CacheTTL(
+            ttl=cache_ttl if cache_ttl is not None else getattr(settings, 'SUPABASE_CACHE_TTL', 300),
+            tamanho_maximo=cache_tamanho or getattr(settings, 'SUPABASE_CACHE_TAMANHO', 1024),
         )
-        self.bucket_name = settings.SUPABASE_BUCKET
+
+    @property
+    def bucket(self):
+        return self.client.storage.from_(self.bucket_name)
 
     def _save(self, name, content):
         content.seek(0)
-        self.client.storage.from_(self.bucket_name).upload(name, content.read())
+        self.bucket.upload(name, content.read())
+        self.cache.definir(('existe', name), True)
         return name
 
     def _open(self, name, mode='rb'):
-        response = self.client.storage.from_(self.bucket_name).download(name)
+        response = self.bucket.download(name)
         return io.BytesIO(response)
 
     def delete(self, name):
-        self.client.storage.from_(self.bucket_name).remove(name)
+        self.bucket.remove([name])
+        self.cache.remover(('existe', name))
+        self.cache.remover(('url', name))
 
     def url(self, name):
-        return self.client.storage.from_(self.bucket_name).get_public_url(name)
+        url = self.cache.obter(('url', name))
+        if url is None:
+            url = self.bucket.get_public_url(name)
+            self.cache.definir(('url', name), url)
+        return url
 
     def exists(self, name):
-        # Esta verificação pode ser lenta. Em um app maior, considere otimizar.
-        try:
-            self.client.storage.from_(self.bucket_name).download(name)
+        # Consulta só os metadados (HEAD), sem baixar o objeto. Apenas respostas
+        # positivas vão para o cache: um "não existe" guardado poderia esconder
+        # um arquivo com o mesmo nome enviado por outro processo
+        if self.cache.obter(('existe', name)):
             return True
-        except Exception:
-            return False
\ No newline at end of file
+        try:
+            existe = self.bucket.exists(name)
+        except StorageException:
+            existe = False
+        if existe:
+            self.cache.definir(('existe', name), True)
+        return existe
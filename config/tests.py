@@ -0,0 +1,137 @@
+import shutil
+import tempfile
+from unittest import mock
+
+import spacy
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+
+from . import nlp as gerenciador_nlp
+from . import storages
+from .storages import ClienteLocal, SupabaseStorage
+
+
+def montar_pipeline():
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("entity_ruler", name="ner").add_patterns([{"label": "ORG", "pattern": "Acme"}])
+    return nlp
+
+
+class GerenciadorModelosTests(SimpleTestCase):
+    def setUp(self):
+        gerenciador_nlp.descarregar_modelos()
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def test_modelo_carregado_uma_vez_por_processo(self):
+        with mock.patch.object(gerenciador_nlp.spacy, "load", return_value=montar_pipeline()) as load:
+            curriculo = gerenciador_nlp.obter_nlp('curriculo')
+            contratos = gerenciador_nlp.obter_nlp('contratos')
+            self.assertIs(gerenciador_nlp.obter_nlp('curriculo'), curriculo)
+
+        load.assert_called_once_with(gerenciador_nlp.MODELO_PADRAO)
+        self.assertIs(curriculo.nlp, contratos.nlp)
+
+    def test_visao_executa_apenas_componentes_pedidos(self):
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+
+        tokens = gerenciador_nlp.obter_nlp('habilidades')
+        self.assertEqual(tokens.pipe_names, [])
+        doc = tokens("Contrato com a Acme. Segunda frase.")
+        self.assertEqual(doc.ents, ())
+        self.assertFalse(doc.has_annotation("SENT_START"))
+
+        contratos = gerenciador_nlp.obter_nlp('contratos')
+        self.assertEqual(contratos.desativados, ("sentencizer",))
+        docs = list(contratos.pipe(["Contrato com a Acme."]))
+        self.assertEqual([ent.text for ent in docs[0].ents], ["Acme"])
+
+        # O modelo compartilhado continua com todos os componentes ativos
+        self.assertEqual(contratos.nlp.pipe_names, ["sentencizer", "ner"])
+
+    def test_detector_usa_modelo_alternativo(self):
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        with mock.patch.object(gerenciador_nlp.spacy, "load", side_effect=OSError("ausente")):
+            detector = gerenciador_nlp.obter_nlp('detector')
+        self.assertEqual(detector.nome_modelo, gerenciador_nlp.MODELO_PADRAO)
+
+    def test_precarregar_modelos(self):
+        with mock.patch.object(gerenciador_nlp.spacy, "load", return_value=montar_pipeline()) as load, \
+                mock.patch.object(gerenciador_nlp.gc, "freeze") as freeze:
+            gerenciador_nlp.precarregar_modelos(['curriculo', 'contratos'])
+        load.assert_called_once_with(gerenciador_nlp.MODELO_PADRAO)
+        freeze.assert_called_once()
+
+    def test_precarregar_executa_preparacoes_da_tarefa(self):
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        preparacao = mock.Mock()
+        with mock.patch.dict(gerenciador_nlp._preparacoes, {'contratos': [preparacao]}), \
+                mock.patch.object(gerenciador_nlp.gc, "freeze"):
+            gerenciador_nlp.precarregar_modelos(['curriculo', 'contratos'])
+        preparacao.assert_called_once_with(gerenciador_nlp.obter_nlp('contratos'))
+
+
+class SupabaseStorageTests(SimpleTestCase):
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        self.storage = SupabaseStorage(client=ClienteLocal(pasta), bucket_name="arquivos")
+
+        # Conta as chamadas ao bucket sem mudar o comportamento
+        bucket = self.storage.client.storage.from_("arquivos")
+        self.bucket = mock.Mock(wraps=bucket)
+        self.storage.client.storage.from_ = mock.Mock(return_value=self.bucket)
+
+    def test_exists_nao_baixa_o_objeto(self):
+        nome = self.storage.save("curriculos/cv.pdf", ContentFile(b"%PDF"))
+        self.storage.cache.limpar()
+        self.bucket.reset_mock()
+
+        self.assertTrue(self.storage.exists(nome))
+        self.assertFalse(self.storage.exists("curriculos/outro.pdf"))
+        self.bucket.download.assert_not_called()
+        self.assertEqual(self.bucket.exists.call_count, 2)
+
+    def test_cache_de_existencia_e_url(self):
+        nome = self.storage.save("curriculos/cv.pdf", ContentFile(b"%PDF"))
+        segundo = self.storage.save("curriculos/cv.pdf", ContentFile(b"%PDF"))
+
+        # O nome ocupado pelo primeiro upload é resolvido pelo cache
+        self.assertNotEqual(nome, segundo)
+        self.assertEqual(self.bucket.upload.call_count, 2)
+        self.assertNotIn(mock.call(nome), self.bucket.exists.call_args_list[1:])
+
+        for _ in range(3):
+            self.assertEqual(self.storage.url(nome), "/media/arquivos/curriculos/cv.pdf")
+        self.bucket.get_public_url.assert_called_once_with(nome)
+
+        self.storage.delete(nome)
+        self.assertFalse(self.storage.exists(nome))
+
+    @override_settings(SUPABASE_BUCKET=None, DEBUG=True)
+    def test_bucket_padrao_sem_configuracao(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        storage = SupabaseStorage(client=ClienteLocal(pasta))
+
+        nome = storage.save("curriculos/cv.pdf", ContentFile(b"%PDF"))
+        self.assertTrue(storage.exists(nome))
+        self.assertEqual(storage.url(nome), "/media/documentos/curriculos/cv.pdf")
+
+    @override_settings(SUPABASE_URL=None, SUPABASE_BUCKET=None, DEBUG=False)
+    def test_sem_configuracao_fora_do_debug(self):
+        # Fora do DEBUG não há disco local nem bucket adivinhado
+        with self.assertRaises(ImproperlyConfigured):
+            SupabaseStorage(client=ClienteLocal(tempfile.gettempdir()))
+        with mock.patch.object(storages, '_cliente', None), self.assertRaises(ImproperlyConfigured):
+            storages.obter_cliente()
+
+    def test_cache_expira(self):
+        nome = self.storage.save("cv.pdf", ContentFile(b"%PDF"))
+        self.bucket.reset_mock()
+        self.assertTrue(self.storage.exists(nome))
+        self.bucket.exists.assert_not_called()
+        with mock.patch("config.storages.time.monotonic", return_value=10 ** 9):
+            self.storage.exists(nome)
+        self.bucket.exists.assert_called_once_with(nome)
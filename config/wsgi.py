@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Carrega os modelos do spaCy antes do fork dos workers (gunicorn --preload)
+from config.nlp import precarregar_modelos  # noqa: E402
+
+precarregar_modelos()
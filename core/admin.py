@@ -1,10 +1,15 @@
 # Em core/admin.py
 
 from django.contrib import admin
-from .models import Candidato
+from .models import Candidato, TarefaExtracao
 
 @admin.register(Candidato)
 class CandidatoAdmin(admin.ModelAdmin):
     list_display = ('nome_completo', 'email', 'telefone', 'data_de_upload')
     search_fields = ('nome_completo', 'email', 'habilidades', 'texto_do_curriculo')
-    list_filter = ('data_de_upload',)
\ No newline at end of file
+    list_filter = ('data_de_upload',)
+
+@admin.register(TarefaExtracao)
+class TarefaExtracaoAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'objeto_id', 'status', 'tentativas', 'worker', 'criada_em', 'concluida_em')
+    list_filter = ('status', 'tipo')
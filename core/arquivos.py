@@ -0,0 +1,105 @@
+# Em core/arquivos.py
+
+import hashlib
+import os
+
+import docx
+import fitz  # PyMuPDF
+from django.conf import settings
+
+
+def calcular_hash_conteudo(arquivo):
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo enviado (UploadedFile/File)
+    lendo em blocos, sem carregar tudo na memória. Aceita também bytes.
+    """
+    if isinstance(arquivo, bytes):
+        return hashlib.sha256(arquivo).hexdigest()
+
+    sha256 = hashlib.sha256()
+    for bloco in arquivo.chunks():
+        sha256.update(bloco)
+    arquivo.seek(0)
+    return sha256.hexdigest()
+
+
+# --- EXTRAÇÃO DE TEXTO ---
+def _nome_do_arquivo(arquivo, nome_arquivo=None):
+    if nome_arquivo:
+        return str(nome_arquivo)
+    if isinstance(arquivo, (str, os.PathLike)):
+        return str(arquivo)
+    return getattr(arquivo, 'name', None) or ''
+
+
+def _abrir_pdf(arquivo):
+    if isinstance(arquivo, (str, os.PathLike)):
+        return fitz.open(arquivo)
+    # Arquivo em memória (UploadedFile, BytesIO...): nada é gravado em disco
+    arquivo.seek(0)
+    conteudo = arquivo.read()
+    arquivo.seek(0)
+    return fitz.open(stream=conteudo, filetype='pdf')
+
+
+def _abrir_docx(arquivo):
+    if isinstance(arquivo, (str, os.PathLike)):
+        return docx.Document(arquivo)
+    arquivo.seek(0)
+    doc = docx.Document(arquivo)
+    arquivo.seek(0)
+    return doc
+
+
+def _ler_trechos(arquivo, nome, max_paginas):
+    if nome.lower().endswith('.pdf'):
+        with _abrir_pdf(arquivo) as doc:
+            for numero, pagina in enumerate(doc):
+                if max_paginas and numero >= max_paginas:
+                    return
+                yield pagina.get_text()
+    elif nome.lower().endswith('.docx'):
+        doc = _abrir_docx(arquivo)
+        for paragrafo in doc.paragraphs:
+            yield paragrafo.text + "\n"
+
+
+def iterar_texto_de_arquivo(arquivo, max_paginas=None, max_caracteres=None, nome_arquivo=None):
+    """
+    Lê o PDF página a página (ou o DOCX parágrafo a parágrafo) gerando tuplas
+    (offset, trecho), onde offset é a posição do trecho no texto completo.
+
+    `arquivo` pode ser um caminho ou um objeto de arquivo já aberto (por
+    exemplo o UploadedFile da requisição), que é lido direto da memória. O
+    tipo vem da extensão de `nome_arquivo` ou, na falta dele, de arquivo.name.
+
+    A leitura para assim que um dos limites é atingido: max_paginas (só PDF)
+    e max_caracteres, que corta o último trecho. Por padrão os limites vêm de
+    settings.EXTRACAO_MAX_PAGINAS e EXTRACAO_MAX_CARACTERES; 0 desativa.
+    """
+    if max_paginas is None:
+        max_paginas = getattr(settings, 'EXTRACAO_MAX_PAGINAS', 0)
+    if max_caracteres is None:
+        max_caracteres = getattr(settings, 'EXTRACAO_MAX_CARACTERES', 0)
+
+    nome = _nome_do_arquivo(arquivo, nome_arquivo)
+    offset = 0
+    for trecho in _ler_trechos(arquivo, nome, max_paginas):
+        if max_caracteres and offset + len(trecho) >= max_caracteres:
+            trecho = trecho[:max_caracteres - offset]
+            if trecho:
+                yield offset, trecho
+            return
+        yield offset, trecho
+        offset += len(trecho)
+
+
+def extrair_texto_de_arquivo(arquivo, **opcoes):
+    """Extrai texto de arquivos PDF ou DOCX (caminho ou arquivo aberto)."""
+    trechos = []
+    try:
+        for _, trecho in iterar_texto_de_arquivo(arquivo, **opcoes):
+            trechos.append(trecho)
+    except Exception as e:
+        print(f"Erro ao ler o arquivo {_nome_do_arquivo(arquivo, opcoes.get('nome_arquivo'))}: {e}")
+    return "".join(trechos)
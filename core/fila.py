@@ -0,0 +1,159 @@
+# Em core/fila.py
+
+import os
+import socket
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import TarefaExtracao
+
+# Função que executa a extração de cada tipo de tarefa (recebe o id do objeto).
+# Referenciadas por caminho para que o core não importe os outros apps.
+EXECUTORES = {
+    TarefaExtracao.TIPO_CURRICULO: 'core.views.executar_extracao_curriculo',
+    TarefaExtracao.TIPO_DOCUMENTO: 'extractor.views.executar_extracao_documento',
+}
+
+
+def identificador_worker():
+    """
+    Identificador único do worker, gravado nas tarefas que ele reivindica.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def enfileirar(tipo, objeto_id):
+    return TarefaExtracao.objects.create(tipo=tipo, objeto_id=objeto_id)
+
+
+def tarefa_mais_recente(tipo, objeto_id):
+    return (
+        TarefaExtracao.objects
+        .filter(tipo=tipo, objeto_id=objeto_id)
+        .order_by('-criada_em', '-id')
+        .first()
+    )
+
+
+def extracao_em_andamento(tipo, objeto_id):
+    """
+    True se o objeto já tem uma extração na fila ou sendo processada.
+    """
+    tarefa = tarefa_mais_recente(tipo, objeto_id)
+    return tarefa is not None and not tarefa.finalizada
+
+
+def reivindicar_tarefas(worker, limite=10):
+    """
+    Marca até `limite` tarefas pendentes como 'processando' para este worker
+    e as retorna.
+
+    No Postgres as linhas são travadas com SELECT ... FOR UPDATE SKIP LOCKED,
+    então workers concorrentes pegam lotes disjuntos sem esperar uns pelos
+    outros. No SQLite (sem lock de linha) a garantia vem do UPDATE condicional
+    em status=pendente: só o worker cujo UPDATE alterou a linha fica com ela.
+    """
+    with transaction.atomic():
+        pendentes = (
+            TarefaExtracao.objects
+            .filter(status=TarefaExtracao.PENDENTE)
+            .order_by('criada_em', 'id')
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            pendentes = pendentes.select_for_update(skip_locked=True)
+        ids = list(pendentes.values_list('id', flat=True)[:limite])
+        if not ids:
+            return []
+
+        TarefaExtracao.objects.filter(id__in=ids, status=TarefaExtracao.PENDENTE).update(
+            status=TarefaExtracao.PROCESSANDO,
+            worker=worker,
+            iniciada_em=timezone.now(),
+            tentativas=F('tentativas') + 1,
+        )
+
+    return list(
+        TarefaExtracao.objects
+        .filter(id__in=ids, status=TarefaExtracao.PROCESSANDO, worker=worker)
+        .order_by('criada_em', 'id')
+    )
+
+
+def liberar_tarefas_travadas(tempo_limite):
+    """
+    Devolve à fila as tarefas que estão 'processando' há mais de
+    `tempo_limite` segundos (por exemplo, quando um worker morreu no meio).
+    As que já usaram as EXTRACAO_MAX_TENTATIVAS ficam com erro: uma tarefa
+    que derruba o worker (falta de memória, segfault) não volta para sempre.
+    Retorna (devolvidas, com_erro).
+    """
+    limite = timezone.now() - timedelta(seconds=tempo_limite)
+    max_tentativas = getattr(settings, 'EXTRACAO_MAX_TENTATIVAS', 3)
+    travadas = TarefaExtracao.objects.filter(
+        status=TarefaExtracao.PROCESSANDO,
+        iniciada_em__lt=limite,
+    )
+    with transaction.atomic():
+        com_erro = travadas.filter(tentativas__gte=max_tentativas).update(
+            status=TarefaExtracao.ERRO,
+            worker=None,
+            erro=f"Tarefa interrompida {max_tentativas} vez(es) sem terminar (tempo limite de {tempo_limite} s).",
+            concluida_em=timezone.now(),
+        )
+        devolvidas = travadas.update(status=TarefaExtracao.PENDENTE, worker=None)
+    return devolvidas, com_erro
+
+
+def executar_tarefa(tarefa):
+    """
+    Executa uma tarefa já reivindicada e registra o resultado. Em caso de
+    erro a tarefa volta para a fila até atingir EXTRACAO_MAX_TENTATIVAS.
+
+    O resultado só é gravado se a tarefa ainda for deste worker: se ela foi
+    devolvida à fila por tempo limite e reivindicada por outro, o registro
+    do outro worker prevalece.
+    """
+    executor = import_string(EXECUTORES[tarefa.tipo])
+    worker = tarefa.worker
+    try:
+        executor(tarefa.objeto_id)
+    except Exception:
+        erro = traceback.format_exc()
+        print(f"Erro ao processar {tarefa}: {erro}")
+        max_tentativas = getattr(settings, 'EXTRACAO_MAX_TENTATIVAS', 3)
+        tarefa.status = (
+            TarefaExtracao.PENDENTE if tarefa.tentativas < max_tentativas
+            else TarefaExtracao.ERRO
+        )
+        tarefa.erro = erro
+        tarefa.worker = None
+    else:
+        tarefa.status = TarefaExtracao.CONCLUIDA
+        tarefa.erro = None
+    if tarefa.finalizada:
+        tarefa.concluida_em = timezone.now()
+
+    atualizadas = TarefaExtracao.objects.filter(
+        pk=tarefa.pk, status=TarefaExtracao.PROCESSANDO, worker=worker,
+    ).update(status=tarefa.status, erro=tarefa.erro, worker=tarefa.worker, concluida_em=tarefa.concluida_em)
+    if not atualizadas:
+        print(f"AVISO: {tarefa} foi reivindicada por outro worker; resultado de {worker} descartado.")
+        tarefa.refresh_from_db()
+    return tarefa
+
+
+def processar_lote(worker, limite=10):
+    """
+    Reivindica e executa um lote de tarefas. Retorna quantas foram executadas.
+    """
+    tarefas = reivindicar_tarefas(worker, limite)
+    for tarefa in tarefas:
+        executar_tarefa(tarefa)
+    return len(tarefas)
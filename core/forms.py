@@ -4,6 +4,10 @@ from django import forms
 from .models import Candidato, ConfiguracaoExtracao
 
 class CandidatoForm(forms.ModelForm):
+    # Reenvios do mesmo arquivo reaproveitam a análise salva, a menos que
+    # esta opção seja marcada.
+    forcar_reextracao = forms.BooleanField(required=False, label="Analisar novamente se o arquivo já foi enviado")
+
     class Meta:
         model = Candidato
         # Vamos pedir apenas o arquivo no formulário inicial.
@@ -0,0 +1,240 @@
+# Em core/habilidades.py
+
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from spacy.matcher import PhraseMatcher
+
+# --- TAXONOMIA PADRÃO DE HABILIDADES ---
+SKILLS_PROGRAMACAO = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'go', 'rust', 'kotlin',
+    'swift', 'ruby', 'php', 'perl', 'scala', 'r', 'matlab', 'julia', 'dart', 'objective-c',
+    'vb.net', 'visual basic', 'cobol', 'fortran', 'assembly', 'lua', 'groovy', 'elixir',
+    'clojure', 'haskell', 'erlang', 'f#', 'bash', 'shell script', 'powershell'
+]
+
+SKILLS_WEB = [
+    'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'bootstrap', 'tailwind',
+    'material-ui', 'react', 'react.js', 'vue', 'vue.js', 'angular', 'angularjs', 'svelte',
+    'next.js', 'nuxt.js', 'gatsby', 'jquery', 'backbone.js', 'ember.js', 'webpack', 'vite',
+    'node.js', 'express', 'nestjs', 'fastify', 'koa', 'asp.net', 'asp.net core', 'spring boot',
+    'django', 'flask', 'fastapi', 'rails', 'laravel', 'symfony', 'codeigniter', 'yii'
+]
+
+SKILLS_MOBILE = [
+    'android', 'ios', 'react native', 'flutter', 'ionic', 'xamarin', 'cordova', 'phonegap',
+    'kotlin android', 'swift ios', 'swiftui', 'jetpack compose', 'android studio', 'xcode'
+]
+
+SKILLS_DADOS = [
+    'sql', 'nosql', 'postgresql', 'mysql', 'mariadb', 'oracle', 'sql server', 'mongodb',
+    'redis', 'cassandra', 'dynamodb', 'elasticsearch', 'neo4j', 'couchdb', 'firebase',
+    'pandas', 'numpy', 'scipy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'opencv',
+    'data science', 'machine learning', 'deep learning', 'nlp', 'computer vision', 'ai',
+    'big data', 'hadoop', 'spark', 'kafka', 'airflow', 'dbt', 'snowflake', 'databricks',
+    'power bi', 'tableau', 'looker', 'qlik', 'metabase', 'grafana', 'kibana', 'superset'
+]
+
+SKILLS_DEVOPS = [
+    'docker', 'kubernetes', 'jenkins', 'gitlab ci', 'github actions', 'circleci', 'travis ci',
+    'terraform', 'ansible', 'puppet', 'chef', 'vagrant', 'prometheus', 'nagios', 'datadog',
+    'aws', 'azure', 'gcp', 'google cloud', 'heroku', 'digitalocean', 'linode', 'cloudflare',
+    'linux', 'unix', 'ubuntu', 'centos', 'debian', 'red hat', 'nginx', 'apache', 'tomcat',
+    'ci/cd', 'devops', 'sre', 'observabilidade', 'monitoramento', 'iaac', 'gitops'
+]
+
+SKILLS_GESTAO = [
+    'gestão de projetos', 'scrum', 'agile', 'kanban', 'pmp', 'prince2', 'pmbok', 'jira',
+    'trello', 'asana', 'monday', 'ms project', 'gestão de equipes', 'liderança', 'coaching'
+]
+
+SKILLS_DESIGN = [
+    'photoshop', 'illustrator', 'indesign', 'adobe xd', 'figma', 'sketch', 'invision',
+    'canva', 'ui/ux', 'design thinking', 'prototipagem', 'wireframe'
+]
+
+SKILLS_MARKETING = [
+    'marketing digital', 'seo', 'sem', 'google ads', 'facebook ads', 'social media',
+    'copywriting', 'google analytics', 'crm', 'salesforce', 'hubspot'
+]
+
+SKILLS_OFFICE = [
+    'excel', 'word', 'powerpoint', 'outlook', 'google sheets', 'google docs',
+    'pacote office', 'microsoft office', 'google workspace'
+]
+
+TAXONOMIA_PADRAO = {
+    'Programação': SKILLS_PROGRAMACAO,
+    'Web': SKILLS_WEB,
+    'Mobile': SKILLS_MOBILE,
+    'Dados': SKILLS_DADOS,
+    'DevOps': SKILLS_DEVOPS,
+    'Gestão': SKILLS_GESTAO,
+    'Design': SKILLS_DESIGN,
+    'Marketing': SKILLS_MARKETING,
+    'Office': SKILLS_OFFICE,
+}
+
+
+# --- REGISTRO DE HABILIDADES ---
+class RegistroHabilidades:
+    """
+    Guarda as taxonomias de habilidades do processo e o PhraseMatcher
+    compilado a partir delas. O matcher é construído uma única vez por
+    vocabulário e só é recompilado quando uma taxonomia é adicionada,
+    removida ou recarregada.
+    """
+
+    def __init__(self, taxonomias=None, arquivos=()):
+        self._lock = threading.Lock()
+        self._taxonomias = dict(taxonomias or {})
+        self._arquivos = [Path(caminho) for caminho in arquivos]
+        self._mtimes = {}
+        self._versao = 0
+        self._categorias = None
+        self._matchers = {}
+        self._carregar_arquivos()
+
+    @property
+    def versao(self):
+        return self._versao
+
+    def registrar_taxonomia(self, nome, categorias):
+        """
+        Adiciona (ou substitui) uma taxonomia no formato {categoria: [skills]}.
+        """
+        with self._lock:
+            self._taxonomias[nome] = {
+                categoria: list(skills) for categoria, skills in categorias.items()
+            }
+            self._invalidar()
+
+    def remover_taxonomia(self, nome):
+        with self._lock:
+            if self._taxonomias.pop(nome, None) is not None:
+                self._invalidar()
+
+    def recarregar(self):
+        """
+        Relê os arquivos de taxonomia configurados e força a recompilação
+        do matcher, sem precisar reiniciar o servidor.
+        """
+        with self._lock:
+            self._mtimes.clear()
+            self._carregar_arquivos()
+            self._invalidar()
+
+    def categorias(self):
+        """
+        Retorna o mapeamento habilidade -> categoria (em minúsculas).
+        """
+        self._verificar_arquivos()
+        categorias = self._categorias
+        if categorias is None:
+            with self._lock:
+                if self._categorias is None:
+                    self._categorias = self._montar_categorias()
+                categorias = self._categorias
+        return categorias
+
+    def categoria(self, habilidade):
+        return self.categorias().get(habilidade.lower())
+
+    def obter_matcher(self, nlp):
+        """
+        Retorna o PhraseMatcher compilado para o vocabulário do pipeline
+        informado. Cada categoria é registrada como um rótulo do matcher,
+        então os matches já chegam categorizados.
+        """
+        self._verificar_arquivos()
+        chave = id(nlp.vocab)
+        entrada = self._matchers.get(chave)
+        if entrada is None or entrada[0] != self._versao:
+            with self._lock:
+                entrada = self._matchers.get(chave)
+                if entrada is None or entrada[0] != self._versao:
+                    # Guarda o vocab junto para que o id não seja reutilizado
+                    entrada = (self._versao, nlp.vocab, self._compilar(nlp))
+                    self._matchers[chave] = entrada
+        return entrada[2]
+
+    def encontrar(self, nlp, doclike):
+        """
+        Aplica o matcher sobre um Doc ou Span e retorna pares (texto, categoria).
+        """
+        matcher = self.obter_matcher(nlp)
+        return [
+            (span.text.lower(), span.label_)
+            for span in matcher(doclike, as_spans=True)
+        ]
+
+    def _compilar(self, nlp):
+        matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        for categoria, skills in self._agrupar_por_categoria().items():
+            matcher.add(categoria, list(nlp.tokenizer.pipe(skills)))
+        return matcher
+
+    def _agrupar_por_categoria(self):
+        agrupado = {}
+        for categorias in self._taxonomias.values():
+            for categoria, skills in categorias.items():
+                agrupado.setdefault(categoria, []).extend(skills)
+        return agrupado
+
+    def _montar_categorias(self):
+        mapeamento = {}
+        for categoria, skills in self._agrupar_por_categoria().items():
+            for skill in skills:
+                mapeamento.setdefault(skill.lower(), categoria)
+        return mapeamento
+
+    def _invalidar(self):
+        self._versao += 1
+        self._categorias = None
+        self._matchers = {}
+
+    def _carregar_arquivos(self):
+        for caminho in self._arquivos:
+            try:
+                # Guardado mesmo se a leitura falhar: um arquivo inválido só é
+                # lido de novo quando for editado, não a cada verificação
+                self._mtimes[caminho] = caminho.stat().st_mtime
+                with open(caminho, encoding='utf-8') as arquivo:
+                    self._taxonomias[caminho.stem] = json.load(arquivo)
+            except (OSError, ValueError) as e:
+                print(f"Erro ao carregar a taxonomia {caminho}: {e}")
+
+    def _verificar_arquivos(self):
+        # Recarrega automaticamente se algum arquivo de taxonomia mudou
+        for caminho in self._arquivos:
+            try:
+                mtime = caminho.stat().st_mtime
+            except OSError:
+                continue
+            if self._mtimes.get(caminho) != mtime:
+                self.recarregar()
+                return
+
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obter_registro_habilidades():
+    """
+    Retorna o registro compartilhado pelo processo, criado na primeira chamada
+    com a taxonomia padrão e os arquivos JSON listados em
+    settings.TAXONOMIAS_HABILIDADES.
+    """
+    global _registro
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroHabilidades(
+                    {'padrao': TAXONOMIA_PADRAO},
+                    arquivos=getattr(settings, 'TAXONOMIAS_HABILIDADES', ()),
+                )
+    return _registro
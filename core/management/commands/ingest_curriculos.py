@@ -0,0 +1,217 @@
+# Em core/management/commands/ingest_curriculos.py
+
+import io
+import os
+import threading
+import time
+import zipfile
+from multiprocessing import Pool
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from config.nlp import obter_nlp
+from core.arquivos import calcular_hash_conteudo, extrair_texto_de_arquivo
+from core.models import Candidato, ConfiguracaoExtracao
+from core.views import VERSAO_PIPELINE, preencher_candidato, processar_curriculo_com_spacy
+
+EXTENSOES = ('.pdf', '.docx')
+
+
+def listar_arquivos(origem):
+    """
+    Percorre a pasta (recursivamente) ou o .zip e gera tuplas
+    (chave, caminho, membro), sem carregar o conteúdo dos arquivos.
+    """
+    if zipfile.is_zipfile(origem):
+        with zipfile.ZipFile(origem) as arquivo_zip:
+            for membro in arquivo_zip.namelist():
+                if membro.lower().endswith(EXTENSOES):
+                    yield f"{origem.name}::{membro}", origem, membro
+    else:
+        for caminho in sorted(origem.rglob('*')):
+            if caminho.is_file() and caminho.name.lower().endswith(EXTENSOES):
+                yield str(caminho.relative_to(origem)), caminho, None
+
+
+# .zip aberto uma vez por processo (ver abrir_zip); reabrir a cada membro
+# relê o diretório central inteiro, o que fica quadrático em arquivos grandes
+_arquivo_zip = None
+
+
+def abrir_zip(origem):
+    """
+    Initializer do pool (e do próprio processo, sem pool): deixa o .zip de
+    origem aberto para as leituras seguintes. Pastas não precisam de nada.
+    """
+    global _arquivo_zip
+    _arquivo_zip = zipfile.ZipFile(origem) if zipfile.is_zipfile(origem) else None
+
+
+def fechar_zip():
+    global _arquivo_zip
+    if _arquivo_zip is not None:
+        _arquivo_zip.close()
+        _arquivo_zip = None
+
+
+def ler_conteudo(caminho, membro):
+    if membro is None:
+        return caminho.read_bytes()
+    return _arquivo_zip.read(membro)
+
+
+def extrair_texto(item):
+    """
+    Executada nos processos do pool: calcula o hash e extrai o texto de um
+    arquivo da pasta ou de um membro do .zip. O conteúdo volta junto para
+    ser gravado sem ler o arquivo de novo.
+    """
+    chave, caminho, membro = item
+    conteudo = ler_conteudo(caminho, membro)
+    texto = extrair_texto_de_arquivo(io.BytesIO(conteudo), nome_arquivo=membro or caminho.name)
+    return chave, calcular_hash_conteudo(conteudo), texto, conteudo
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa em lote currículos (.pdf/.docx) de uma pasta ou arquivo .zip. "
+        "Pode ser interrompido e executado de novo: continua de onde parou."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('origem', help="Pasta ou arquivo .zip com os currículos.")
+        parser.add_argument('--processos', type=int, default=os.cpu_count() or 1,
+                            help="Processos para extrair o texto dos arquivos.")
+        parser.add_argument('--n-process', type=int, default=1,
+                            help="Processos usados pelo nlp.pipe do spaCy.")
+        parser.add_argument('--batch-size', type=int, default=32,
+                            help="Tamanho do lote do nlp.pipe.")
+        parser.add_argument('--lote-banco', type=int, default=100,
+                            help="Candidatos gravados por bulk_create.")
+        parser.add_argument('--checkpoint',
+                            help="Arquivo com as chaves já importadas (padrão: <origem>.checkpoint).")
+
+    def handle(self, *args, **options):
+        origem = Path(options['origem']).resolve()
+        if not origem.exists():
+            raise CommandError(f"Origem não encontrada: {origem}")
+
+        caminho_checkpoint = Path(options['checkpoint'] or f"{origem}.checkpoint")
+        importados = set()
+        if caminho_checkpoint.exists():
+            importados = set(caminho_checkpoint.read_text(encoding='utf-8').splitlines())
+            self.stdout.write(f"Retomando: {len(importados)} arquivo(s) já importado(s).")
+
+        pendentes = (item for item in listar_arquivos(origem) if item[0] not in importados)
+        itens = {}
+
+        # O Pool.imap consome a entrada sem limite; a janela impede que textos
+        # extraídos se acumulem na memória enquanto o spaCy ainda não os leu.
+        # Precisa cobrir os lotes que o nlp.pipe lê adiantado (2 por processo).
+        janela = threading.Semaphore(
+            options['batch_size'] * (2 * options['n_process'] + 2) + 4 * options['processos']
+        )
+
+        # Com o pool, a entrada é lida pela thread de tarefas dele, que fica
+        # esperando a janela; sem este aviso, o pool.terminate() de uma
+        # interrupção esperaria por ela para sempre.
+        parar = threading.Event()
+
+        def registrar(pendentes):
+            for item in pendentes:
+                while not janela.acquire(timeout=1):
+                    if parar.is_set():
+                        return
+                if parar.is_set():
+                    return
+                itens[item[0]] = item
+                yield item
+
+        config, created = ConfiguracaoExtracao.objects.get_or_create(id=1)
+        nlp = obter_nlp('curriculo')
+
+        # Os processos filhos não devem herdar conexões abertas com o banco
+        connections.close_all()
+        if options['processos'] > 1:
+            pool = Pool(options['processos'], initializer=abrir_zip, initargs=(origem,))
+        else:
+            pool = None
+            abrir_zip(origem)
+        mapear = pool.imap if pool else map
+
+        self.inicio = time.perf_counter()
+        self.total = 0
+        self.repetidos = 0
+        hashes_vistos = set()
+
+        def novos(extraidos):
+            # Arquivos já importados (mesmo conteúdo) não passam pelo spaCy
+            for chave, hash_conteudo, texto, conteudo in extraidos:
+                if hash_conteudo in hashes_vistos or \
+                        Candidato.objects.filter(hash_conteudo=hash_conteudo).exists():
+                    janela.release()
+                    itens.pop(chave)
+                    self.repetidos += 1
+                    continue
+                hashes_vistos.add(hash_conteudo)
+                # O conteúdo fica aqui, e não no contexto do nlp.pipe, que
+                # seria copiado para os processos do spaCy
+                _, caminho, membro = itens[chave]
+                itens[chave] = (Path(membro or caminho.name).name, conteudo)
+                yield texto, (chave, hash_conteudo)
+
+        buffer = []
+        try:
+            extraidos = mapear(extrair_texto, registrar(pendentes))
+            for doc, (chave, hash_conteudo) in nlp.pipe(novos(extraidos), as_tuples=True,
+                                                        batch_size=options['batch_size'],
+                                                        n_process=options['n_process']):
+                janela.release()
+                resultado = processar_curriculo_com_spacy(doc.text, doc=doc, config=config)
+                buffer.append((chave, hash_conteudo, doc.text, resultado))
+                if len(buffer) >= options['lote_banco']:
+                    self._gravar(buffer, itens, caminho_checkpoint)
+                    buffer = []
+            if buffer:
+                self._gravar(buffer, itens, caminho_checkpoint)
+        finally:
+            # Libera a thread do pool se ela estiver esperando a janela
+            parar.set()
+            janela.release()
+            if pool:
+                pool.terminate()
+            else:
+                fechar_zip()
+
+        decorrido = time.perf_counter() - self.inicio
+        taxa = self.total / decorrido if decorrido else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.total} currículo(s) importado(s) em {decorrido:.1f}s ({taxa:.1f} docs/s)."
+        ))
+        if self.repetidos:
+            self.stdout.write(f"{self.repetidos} arquivo(s) ignorado(s): conteúdo já importado.")
+
+    def _gravar(self, buffer, itens, caminho_checkpoint):
+        candidatos = []
+        for chave, hash_conteudo, texto, resultado in buffer:
+            nome_arquivo, conteudo = itens.pop(chave)
+            candidato = Candidato(
+                curriculo_original=ContentFile(conteudo, name=nome_arquivo),
+                hash_conteudo=hash_conteudo,
+                versao_pipeline=VERSAO_PIPELINE,
+            )
+            candidatos.append(preencher_candidato(candidato, texto, resultado))
+
+        with transaction.atomic():
+            Candidato.objects.bulk_create(candidatos)
+
+        # Só marca como importado depois que o lote foi gravado no banco
+        with open(caminho_checkpoint, 'a', encoding='utf-8') as checkpoint:
+            checkpoint.writelines(f"{chave}\n" for chave, _, _, _ in buffer)
+
+        self.total += len(candidatos)
+        decorrido = time.perf_counter() - self.inicio
+        self.stdout.write(f"{self.total} importado(s) - {self.total / decorrido:.1f} docs/s")
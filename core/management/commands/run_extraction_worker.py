@@ -0,0 +1,62 @@
+# Em core/management/commands/run_extraction_worker.py
+
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.fila import identificador_worker, liberar_tarefas_travadas, processar_lote
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de extração de currículos e documentos em segundo plano."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=10,
+                            help="Quantidade de tarefas reivindicadas por vez.")
+        parser.add_argument('--intervalo', type=float, default=2.0,
+                            help="Segundos de espera quando a fila está vazia.")
+        parser.add_argument('--tempo-limite', type=int, default=600,
+                            help="Segundos após os quais uma tarefa 'processando' volta para a fila.")
+        parser.add_argument('--uma-vez', action='store_true',
+                            help="Esvazia a fila e termina, em vez de continuar aguardando.")
+
+    def handle(self, *args, **options):
+        worker = identificador_worker()
+        self.parar = False
+        # Os tratadores anteriores voltam na saída: processos criados depois
+        # (pools de extração, por exemplo) não devem herdar este
+        anteriores = {sinal: signal.signal(sinal, self._sinal_parada)
+                      for sinal in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            self._executar(worker, options)
+        finally:
+            for sinal, tratador in anteriores.items():
+                signal.signal(sinal, tratador)
+
+    def _executar(self, worker, options):
+        self.stdout.write(f"Worker {worker} iniciado.")
+        total = 0
+        while not self.parar:
+            liberadas, com_erro = liberar_tarefas_travadas(options['tempo_limite'])
+            if liberadas:
+                self.stdout.write(f"{liberadas} tarefa(s) travada(s) devolvida(s) à fila.")
+            if com_erro:
+                self.stdout.write(self.style.WARNING(
+                    f"{com_erro} tarefa(s) travada(s) sem tentativas restantes marcada(s) com erro."
+                ))
+
+            processadas = processar_lote(worker, options['lote'])
+            total += processadas
+            if processadas:
+                self.stdout.write(f"{processadas} tarefa(s) processada(s) (total: {total}).")
+            elif options['uma_vez']:
+                break
+            else:
+                time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} encerrado após {total} tarefa(s)."))
+
+    def _sinal_parada(self, signum, frame):
+        # Termina o lote atual antes de sair
+        self.parar = True
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_configuracaoextracao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaExtracao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('curriculo', 'Currículo'), ('documento', 'Documento')], max_length=20)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='pendente', max_length=20)),
+                ('tentativas', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, max_length=100, null=True)),
+                ('erro', models.TextField(blank=True, null=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True)),
+                ('concluida_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarefa de Extração',
+                'verbose_name_plural': 'Tarefas de Extração',
+                'ordering': ['criada_em'],
+                'indexes': [models.Index(fields=['status', 'criada_em'], name='core_tarefa_status_dd0698_idx'), models.Index(fields=['tipo', 'objeto_id'], name='core_tarefa_tipo_ed1c9a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_tarefaextracao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidato',
+            name='hash_conteudo',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidato',
+            name='versao_pipeline',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+    ]
@@ -15,6 +15,10 @@ class Candidato(models.Model):
     # --- NOVOS CAMPOS ADICIONADOS AQUI ---
     formacao_academica = models.TextField(blank=True, null=True, verbose_name="Formação Acadêmica")
     idiomas = models.TextField(blank=True, null=True, verbose_name="Idiomas")
+
+    # SHA-256 do arquivo enviado: reenvios do mesmo arquivo reaproveitam a análise
+    hash_conteudo = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    versao_pipeline = models.CharField(max_length=20, blank=True, null=True)
     
     data_de_upload = models.DateTimeField(auto_now_add=True)
 
@@ -39,4 +43,56 @@ class ConfiguracaoExtracao(models.Model):
         return "Configurações de Extração"
 
     class Meta:
-        verbose_name_plural = "Configurações de Extração"
\ No newline at end of file
+        verbose_name_plural = "Configurações de Extração"
+
+# --- FILA DE EXTRAÇÃO EM SEGUNDO PLANO ---
+class TarefaExtracao(models.Model):
+    """
+    Uma extração (currículo ou documento) aguardando o comando
+    run_extraction_worker. A própria tabela funciona como fila, sem broker
+    externo: os workers reivindicam as tarefas pendentes com lock de linha.
+    """
+    TIPO_CURRICULO = 'curriculo'
+    TIPO_DOCUMENTO = 'documento'
+    TIPO_CHOICES = [
+        (TIPO_CURRICULO, 'Currículo'),
+        (TIPO_DOCUMENTO, 'Documento'),
+    ]
+
+    PENDENTE = 'pendente'
+    PROCESSANDO = 'processando'
+    CONCLUIDA = 'concluida'
+    ERRO = 'erro'
+    STATUS_CHOICES = [
+        (PENDENTE, 'Pendente'),
+        (PROCESSANDO, 'Processando'),
+        (CONCLUIDA, 'Concluída'),
+        (ERRO, 'Erro'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    objeto_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDENTE)
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    erro = models.TextField(blank=True, null=True)
+
+    criada_em = models.DateTimeField(auto_now_add=True)
+    iniciada_em = models.DateTimeField(blank=True, null=True)
+    concluida_em = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.objeto_id} ({self.get_status_display()})"
+
+    @property
+    def finalizada(self):
+        return self.status in (self.CONCLUIDA, self.ERRO)
+
+    class Meta:
+        verbose_name = "Tarefa de Extração"
+        verbose_name_plural = "Tarefas de Extração"
+        ordering = ['criada_em']
+        indexes = [
+            models.Index(fields=['status', 'criada_em']),
+            models.Index(fields=['tipo', 'objeto_id']),
+        ]
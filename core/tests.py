@@ -1,3 +1,478 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import signal
+import tempfile
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import docx
+import fitz
+import spacy
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from config import nlp as gerenciador_nlp
+from benchmarks.secoes import gerar_curriculo, localizar_secoes_legado
+
+from . import views
+from .arquivos import extrair_texto_de_arquivo, iterar_texto_de_arquivo
+from .fila import executar_tarefa, liberar_tarefas_travadas, processar_lote, reivindicar_tarefas
+from .habilidades import RegistroHabilidades
+from .management.commands import ingest_curriculos
+from .models import Candidato, TarefaExtracao
+
+
+CURRICULO_EXEMPLO = """Maria Souza Lima
+maria.lima@email.com
+(11) 98765-4321
+
+Objetivo
+Atuar como desenvolvedora back-end.
+
+Experiência Profissional
+2019 - 2023 Empresa X
+Desenvolvimento de APIs utilizando Python e Django.
+
+Formação Acadêmica
+Bacharelado em Ciência da Computação
+
+Habilidades
+- Python
+- Docker
+- PostgreSQL
+
+Idiomas
+Inglês avançado
+"""
+
+
+def gerar_docx(texto):
+    documento = docx.Document()
+    for linha in texto.split("\n"):
+        documento.add_paragraph(linha)
+    conteudo = io.BytesIO()
+    documento.save(conteudo)
+    return conteudo.getvalue()
+
+
+class ContadorDeChamadas:
+    """
+    Envolve um pipeline do spaCy contando quantas vezes o modelo é executado.
+    """
+
+    def __init__(self, nlp):
+        self._nlp = nlp
+        self.chamadas = 0
+
+    def __call__(self, texto, *args, **kwargs):
+        self.chamadas += 1
+        return self._nlp(texto, *args, **kwargs)
+
+    def pipe(self, textos, *args, **kwargs):
+        for doc in self._nlp.pipe(textos, *args, **kwargs):
+            self.chamadas += 1
+            yield doc
+
+    def __getattr__(self, nome):
+        return getattr(self._nlp, nome)
+
+
+class PipelineCurriculoTests(TestCase):
+    def setUp(self):
+        self.nlp = ContadorDeChamadas(spacy.blank("pt"))
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, self.nlp)
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def test_modelo_executado_uma_vez_por_curriculo(self):
+        views.processar_curriculo_com_spacy(CURRICULO_EXEMPLO)
+        self.assertEqual(self.nlp.chamadas, 1)
+
+        views.processar_curriculo_com_spacy(CURRICULO_EXEMPLO)
+        self.assertEqual(self.nlp.chamadas, 2)
+
+    def test_extracao_usa_doc_compartilhado(self):
+        nome, email, telefone, habilidades, experiencia, formacao, idiomas = (
+            views.processar_curriculo_com_spacy(CURRICULO_EXEMPLO)
+        )
+
+        self.assertEqual(nome, "Maria Souza Lima")
+        self.assertEqual(email, "maria.lima@email.com")
+        self.assertIn("python", habilidades)
+        self.assertIn("docker", habilidades)
+        self.assertIn("django", habilidades)
+        self.assertIn("Bacharelado", formacao)
+        self.assertIn("Inglês", idiomas)
+
+    def test_secoes_localizadas_correspondem_ao_texto(self):
+        secoes_localizadas = views.localizar_secoes(CURRICULO_EXEMPLO)
+        secoes = views.detectar_secoes_inteligente(CURRICULO_EXEMPLO, secoes_localizadas)
+
+        for tipo, inicio, fim in secoes_localizadas:
+            self.assertIn(CURRICULO_EXEMPLO[inicio:fim], secoes[tipo])
+        self.assertEqual(secoes['habilidades'], "- Python\n- Docker\n- PostgreSQL")
+
+        doc = self.nlp(CURRICULO_EXEMPLO)
+        spans = views.mapear_secoes_no_doc(doc, secoes_localizadas)
+        self.assertEqual(spans['habilidades'][0].text, secoes['habilidades'])
+
+    def test_deteccao_em_uma_passada_igual_a_anterior(self):
+        textos = [CURRICULO_EXEMPLO, "\nHabilidades\n\n\nIdiomas:\nInglês"]
+        textos += [gerar_curriculo(40, semente) for semente in range(5)]
+        for texto in textos:
+            self.assertEqual(
+                views.detectar_secoes_inteligente(texto),
+                localizar_secoes_legado(texto),
+            )
+
+
+class RegistroHabilidadesTests(TestCase):
+    def setUp(self):
+        self.nlp = spacy.blank("pt")
+        self.registro = RegistroHabilidades({'padrao': {'Web': ['django', 'node.js']}})
+
+    def test_matcher_compilado_uma_vez(self):
+        matcher = self.registro.obter_matcher(self.nlp)
+        self.assertIs(self.registro.obter_matcher(self.nlp), matcher)
+
+    def test_matches_chegam_categorizados(self):
+        doc = self.nlp("APIs em Django e Node.js")
+        self.assertEqual(
+            self.registro.encontrar(self.nlp, doc),
+            [('django', 'Web'), ('node.js', 'Web')],
+        )
+        self.assertEqual(self.registro.categoria('Django'), 'Web')
+
+    def test_registrar_taxonomia_recompila(self):
+        matcher = self.registro.obter_matcher(self.nlp)
+        self.registro.registrar_taxonomia('extra', {'Dados': ['power bi']})
+
+        self.assertIsNot(self.registro.obter_matcher(self.nlp), matcher)
+        doc = self.nlp("Relatórios em Power BI")
+        self.assertEqual(self.registro.encontrar(self.nlp, doc), [('power bi', 'Dados')])
+
+        self.registro.remover_taxonomia('extra')
+        self.assertEqual(self.registro.encontrar(self.nlp, doc), [])
+
+    def test_recarrega_arquivo_alterado(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / "extra.json"
+            caminho.write_text(json.dumps({'Dados': ['airflow']}), encoding='utf-8')
+            registro = RegistroHabilidades(arquivos=[caminho])
+            self.assertEqual(registro.categoria('airflow'), 'Dados')
+
+            caminho.write_text(json.dumps({'Dados': ['dbt']}), encoding='utf-8')
+            os.utime(caminho, (0, 0))
+            self.assertIsNone(registro.categoria('airflow'))
+            self.assertEqual(registro.categoria('dbt'), 'Dados')
+
+    def test_arquivo_invalido_so_e_relido_quando_muda(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / "extra.json"
+            caminho.write_text("{invalido", encoding='utf-8')
+            with mock.patch('builtins.print'):
+                registro = RegistroHabilidades(arquivos=[caminho])
+            with mock.patch.object(registro, 'recarregar', wraps=registro.recarregar) as recarregar:
+                registro.obter_matcher(self.nlp)
+                registro.obter_matcher(self.nlp)
+                self.assertEqual(recarregar.call_count, 0)
+
+                caminho.write_text(json.dumps({'Dados': ['dbt']}), encoding='utf-8')
+                os.utime(caminho, (0, 0))
+                self.assertEqual(registro.categoria('dbt'), 'Dados')
+                self.assertEqual(recarregar.call_count, 1)
+
+
+class FilaExtracaoTests(TestCase):
+    def setUp(self):
+        pasta_media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta_media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=pasta_media, EXTRACAO_ASSINCRONA=True)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, spacy.blank("pt"))
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def enviar_curriculo(self):
+        arquivo = SimpleUploadedFile("curriculo.docx", gerar_docx(CURRICULO_EXEMPLO))
+        return self.client.post(reverse('core:upload_curriculo'), {'curriculo_original': arquivo})
+
+    def test_upload_apenas_enfileira(self):
+        resposta = self.enviar_curriculo()
+
+        candidato = Candidato.objects.get()
+        self.assertRedirects(resposta, reverse('core:detalhe_candidato', args=[candidato.id]))
+        self.assertIsNone(candidato.nome_completo)
+        self.assertIn("Maria Souza Lima", candidato.texto_do_curriculo)
+
+        tarefa = TarefaExtracao.objects.get()
+        self.assertEqual((tarefa.tipo, tarefa.objeto_id), (TarefaExtracao.TIPO_CURRICULO, candidato.id))
+        self.assertEqual(tarefa.status, TarefaExtracao.PENDENTE)
+
+        status = self.client.get(reverse('core:status_tarefa', args=[tarefa.id])).json()
+        self.assertEqual(status['status'], TarefaExtracao.PENDENTE)
+        self.assertFalse(status['finalizada'])
+
+    def test_worker_processa_a_fila(self):
+        self.enviar_curriculo()
+        tratador = signal.getsignal(signal.SIGTERM)
+        call_command('run_extraction_worker', '--uma-vez', stdout=io.StringIO())
+        # Pools criados depois não podem herdar o tratador do worker
+        self.assertIs(signal.getsignal(signal.SIGTERM), tratador)
+
+        candidato = Candidato.objects.get()
+        self.assertEqual(candidato.nome_completo, "Maria Souza Lima")
+        self.assertIn("python", candidato.habilidades)
+
+        tarefa = TarefaExtracao.objects.get()
+        self.assertEqual(tarefa.status, TarefaExtracao.CONCLUIDA)
+        self.assertEqual(tarefa.tentativas, 1)
+        status = self.client.get(reverse('core:status_tarefa', args=[tarefa.id])).json()
+        self.assertTrue(status['finalizada'])
+
+    def test_worker_nao_le_o_arquivo_de_volta(self):
+        self.enviar_curriculo()
+        candidato = Candidato.objects.get()
+        candidato.curriculo_original.storage.delete(candidato.curriculo_original.name)
+
+        call_command('run_extraction_worker', '--uma-vez', stdout=io.StringIO())
+
+        candidato.refresh_from_db()
+        self.assertEqual(candidato.nome_completo, "Maria Souza Lima")
+
+    def test_workers_reivindicam_lotes_disjuntos(self):
+        for objeto_id in range(5):
+            TarefaExtracao.objects.create(tipo=TarefaExtracao.TIPO_CURRICULO, objeto_id=objeto_id)
+
+        primeiro = reivindicar_tarefas("worker-a", limite=3)
+        segundo = reivindicar_tarefas("worker-b", limite=3)
+
+        self.assertEqual([t.objeto_id for t in primeiro], [0, 1, 2])
+        self.assertEqual([t.objeto_id for t in segundo], [3, 4])
+        self.assertEqual(reivindicar_tarefas("worker-c"), [])
+
+    @override_settings(EXTRACAO_MAX_TENTATIVAS=2)
+    def test_tarefa_com_erro_e_reprocessada_ate_o_limite(self):
+        tarefa = TarefaExtracao.objects.create(tipo=TarefaExtracao.TIPO_CURRICULO, objeto_id=999)
+
+        processar_lote("worker-a")
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaExtracao.PENDENTE)
+
+        processar_lote("worker-a")
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaExtracao.ERRO)
+        self.assertIn("DoesNotExist", tarefa.erro)
+
+
+    @override_settings(EXTRACAO_MAX_TENTATIVAS=2)
+    def test_tarefa_travada_sem_tentativas_fica_com_erro(self):
+        antiga = timezone.now() - timedelta(hours=1)
+        for objeto_id, tentativas in ((1, 1), (2, 2)):
+            TarefaExtracao.objects.create(
+                tipo=TarefaExtracao.TIPO_CURRICULO, objeto_id=objeto_id, status=TarefaExtracao.PROCESSANDO,
+                worker="morto", iniciada_em=antiga, tentativas=tentativas,
+            )
+
+        self.assertEqual(liberar_tarefas_travadas(600), (1, 1))
+        status = dict(TarefaExtracao.objects.values_list('objeto_id', 'status'))
+        self.assertEqual(status, {1: TarefaExtracao.PENDENTE, 2: TarefaExtracao.ERRO})
+
+    def test_worker_lento_nao_sobrescreve_outro(self):
+        TarefaExtracao.objects.create(tipo=TarefaExtracao.TIPO_CURRICULO, objeto_id=999)
+        tarefa, = reivindicar_tarefas("worker-lento")
+
+        # Enquanto o lento trabalha, a tarefa é liberada e reivindicada por outro
+        TarefaExtracao.objects.filter(pk=tarefa.pk).update(status=TarefaExtracao.PENDENTE, worker=None)
+        reivindicar_tarefas("worker-novo")
+
+        executar_tarefa(tarefa)
+        tarefa.refresh_from_db()
+        self.assertEqual((tarefa.status, tarefa.worker), (TarefaExtracao.PROCESSANDO, "worker-novo"))
+        self.assertIsNone(tarefa.erro)
+
+
+class ExtracaoTextoTests(SimpleTestCase):
+    def setUp(self):
+        self.pasta = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.pasta, ignore_errors=True)
+
+        self.pdf = str(self.pasta / "curriculo.pdf")
+        with fitz.open() as documento:
+            for numero in range(3):
+                documento.new_page().insert_text((72, 72), f"Pagina {numero}")
+            documento.save(self.pdf)
+
+        self.docx = str(self.pasta / "curriculo.docx")
+        Path(self.docx).write_bytes(gerar_docx(CURRICULO_EXEMPLO))
+
+    def test_trechos_com_offsets_do_texto_completo(self):
+        for caminho in (self.pdf, self.docx):
+            texto = extrair_texto_de_arquivo(caminho, max_paginas=0, max_caracteres=0)
+            trechos = list(iterar_texto_de_arquivo(caminho, max_paginas=0, max_caracteres=0))
+            self.assertGreater(len(trechos), 1)
+            for offset, trecho in trechos:
+                self.assertEqual(texto[offset:offset + len(trecho)], trecho)
+        self.assertIn("Pagina 2", extrair_texto_de_arquivo(self.pdf))
+
+    def test_extrai_de_arquivo_em_memoria(self):
+        for caminho in (self.pdf, self.docx):
+            enviado = SimpleUploadedFile(Path(caminho).name, Path(caminho).read_bytes())
+            self.assertEqual(extrair_texto_de_arquivo(enviado), extrair_texto_de_arquivo(caminho))
+            self.assertEqual(enviado.tell(), 0)
+
+    def test_limites_de_paginas_e_caracteres(self):
+        paginas = list(iterar_texto_de_arquivo(self.pdf, max_paginas=2, max_caracteres=0))
+        self.assertEqual(len(paginas), 2)
+
+        texto = extrair_texto_de_arquivo(self.docx, max_caracteres=40)
+        self.assertEqual(texto, CURRICULO_EXEMPLO[:40])
+        with override_settings(EXTRACAO_MAX_PAGINAS=1):
+            self.assertNotIn("Pagina 1", extrair_texto_de_arquivo(self.pdf))
+
+
+class DeduplicacaoUploadTests(TestCase):
+    def setUp(self):
+        pasta_media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta_media, ignore_errors=True)
+        self.pasta_media = Path(pasta_media)
+        configuracao = override_settings(MEDIA_ROOT=pasta_media, EXTRACAO_ASSINCRONA=False)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, spacy.blank("pt"))
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+        self.conteudo = gerar_docx(CURRICULO_EXEMPLO)
+        processar = mock.patch.object(
+            views, 'processar_curriculo_com_spacy', wraps=views.processar_curriculo_com_spacy
+        )
+        self.processar = processar.start()
+        self.addCleanup(processar.stop)
+
+    def enviar(self, **dados):
+        arquivo = SimpleUploadedFile("curriculo.docx", self.conteudo)
+        return self.client.post(reverse('core:upload_curriculo'), {'curriculo_original': arquivo, **dados})
+
+    def test_reenvio_reaproveita_resultado_e_arquivo(self):
+        self.enviar()
+        candidato = Candidato.objects.get()
+        resposta = self.enviar()
+
+        self.assertRedirects(resposta, reverse('core:detalhe_candidato', args=[candidato.id]))
+        self.assertEqual(Candidato.objects.count(), 1)
+        self.assertEqual(self.processar.call_count, 1)
+        self.assertEqual(len(list((self.pasta_media / "curriculos").iterdir())), 1)
+        self.assertEqual(len(candidato.hash_conteudo), 64)
+        self.assertEqual(candidato.versao_pipeline, views.VERSAO_PIPELINE)
+
+    def test_reextracao_forcada_ou_por_nova_versao(self):
+        self.enviar()
+        self.enviar(forcar_reextracao='on')
+        self.assertEqual(self.processar.call_count, 2)
+
+        with mock.patch.object(views, 'VERSAO_PIPELINE', '2'):
+            self.enviar()
+            self.enviar()
+        self.assertEqual(self.processar.call_count, 3)
+
+        candidato = Candidato.objects.get()
+        self.assertEqual(candidato.versao_pipeline, '2')
+        self.assertEqual(candidato.nome_completo, "Maria Souza Lima")
+
+
+class IngestaoCurriculosTests(TestCase):
+    def setUp(self):
+        self.pasta = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.pasta, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=str(self.pasta / "media"))
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, spacy.blank("pt"))
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+        self.origem = self.pasta / "arquivo"
+        self.origem.mkdir()
+        for nome in ("ana", "bruno", "carla"):
+            texto = CURRICULO_EXEMPLO.replace("Maria Souza Lima", f"{nome.title()} Souza Lima")
+            (self.origem / f"{nome}.docx").write_bytes(gerar_docx(texto))
+
+    def importar(self, origem, *args):
+        saida = io.StringIO()
+        call_command('ingest_curriculos', str(origem), '--processos', '1', '--lote-banco', '2',
+                     *args, stdout=saida)
+        return saida.getvalue()
+
+    def test_importa_pasta_e_retoma_sem_duplicar(self):
+        saida = self.importar(self.origem)
+
+        self.assertIn("3 currículo(s) importado(s)", saida)
+        self.assertIn("docs/s", saida)
+        nomes = set(Candidato.objects.values_list('nome_completo', flat=True))
+        self.assertEqual(nomes, {"Ana Souza Lima", "Bruno Souza Lima", "Carla Souza Lima"})
+        self.assertTrue(all(c.curriculo_original for c in Candidato.objects.all()))
+
+        (self.origem / "daniel.docx").write_bytes(gerar_docx("Daniel Souza Lima\n"))
+        saida = self.importar(self.origem)
+        self.assertIn("Retomando: 3", saida)
+        self.assertIn("1 currículo(s) importado(s)", saida)
+        self.assertEqual(Candidato.objects.count(), 4)
+
+    def test_importa_arquivo_zip(self):
+        caminho_zip = self.pasta / "curriculos.zip"
+        with zipfile.ZipFile(caminho_zip, "w") as arquivo_zip:
+            for caminho in self.origem.iterdir():
+                arquivo_zip.write(caminho, f"lote/{caminho.name}")
+            arquivo_zip.writestr("leia-me.txt", "ignorado")
+
+        abrir = mock.Mock(wraps=zipfile.ZipFile)
+        with mock.patch.object(ingest_curriculos.zipfile, 'ZipFile', abrir):
+            self.importar(caminho_zip)
+        self.assertEqual(Candidato.objects.count(), 3)
+        # Uma vez para listar e outra para ler os membros, não uma por membro
+        aberturas = [chamada for chamada in abrir.call_args_list if chamada.args[0] == caminho_zip]
+        self.assertEqual(len(aberturas), 2)
+
+    def test_interrupcao_com_pool_e_retomada(self):
+        # Mais arquivos que a janela (12 com estes parâmetros): a thread do
+        # pool fica esperando quando a importação é interrompida
+        for numero in range(20):
+            texto = CURRICULO_EXEMPLO.replace("Maria", f"Pessoa{numero}")
+            (self.origem / f"pessoa{numero}.docx").write_bytes(gerar_docx(texto))
+        caminho_zip = self.pasta / "curriculos.zip"
+        with zipfile.ZipFile(caminho_zip, "w") as arquivo_zip:
+            for caminho in sorted(self.origem.iterdir()):
+                arquivo_zip.write(caminho, caminho.name)
+
+        gravar = ingest_curriculos.Command._gravar
+
+        def gravar_e_interromper(comando, *args):
+            gravar(comando, *args)
+            raise RuntimeError("interrompido")
+
+        with mock.patch.object(ingest_curriculos.Command, '_gravar', gravar_e_interromper):
+            with self.assertRaisesMessage(RuntimeError, "interrompido"):
+                self.importar(caminho_zip, '--processos', '2', '--batch-size', '1')
+        self.assertEqual(Candidato.objects.count(), 2)
+
+        saida = self.importar(caminho_zip, '--processos', '2')
+        self.assertIn("Retomando: 2", saida)
+        self.assertIn("21 currículo(s) importado(s)", saida)
+        self.assertEqual(Candidato.objects.count(), 23)
+
+    def test_ignora_arquivos_com_conteudo_ja_importado(self):
+        (self.origem / "ana-copia.docx").write_bytes((self.origem / "ana.docx").read_bytes())
+
+        saida = self.importar(self.origem)
+
+        self.assertIn("3 currículo(s) importado(s)", saida)
+        self.assertIn("1 arquivo(s) ignorado(s)", saida)
+        self.assertEqual(Candidato.objects.exclude(hash_conteudo=None).count(), 3)
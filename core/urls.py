@@ -11,4 +11,5 @@ urlpatterns = [
     path('historico/', views.historico_candidatos, name='historico_candidatos'),
     path('candidato/<int:candidato_id>/delete/', views.delete_candidato, name='delete_candidato'), # NOVA LINHA
     path('configuracoes/', views.configuracao_view, name='configuracoes'),
+    path('tarefa/<int:tarefa_id>/status/', views.status_tarefa, name='status_tarefa'),
 ]
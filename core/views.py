@@ -1,118 +1,180 @@
 # Em core/views.py
 
-import spacy
-from spacy.matcher import PhraseMatcher, Matcher
-import fitz  # PyMuPDF
-import docx
+from django.conf import settings
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from .forms import CandidatoForm, ConfiguracaoForm
-from .models import Candidato, ConfiguracaoExtracao
+from .models import Candidato, ConfiguracaoExtracao, TarefaExtracao
+from .habilidades import obter_registro_habilidades
+from .fila import enfileirar, extracao_em_andamento, tarefa_mais_recente
+from .arquivos import calcular_hash_conteudo, extrair_texto_de_arquivo
 import re
 from django.contrib import messages
 from collections import defaultdict
+from config.nlp import obter_nlp
 
-# Carregue o modelo do spaCy uma vez quando o servidor iniciar
-nlp = spacy.load("pt_core_news_sm")
-
-# --- FUNÇÃO AUXILIAR PARA EXTRAIR TEXTO ---
-def extrair_texto_de_arquivo(caminho_arquivo):
-    """Extrai texto de arquivos PDF ou DOCX."""
-    texto = ""
-    try:
-        if caminho_arquivo.lower().endswith('.pdf'):
-            with fitz.open(caminho_arquivo) as doc:
-                for pagina in doc:
-                    texto += pagina.get_text()
-        elif caminho_arquivo.lower().endswith('.docx'):
-            doc = docx.Document(caminho_arquivo)
-            for paragrafo in doc.paragraphs:
-                texto += paragrafo.text + "\n"
-    except Exception as e:
-        print(f"Erro ao ler o arquivo {caminho_arquivo}: {e}")
-    return texto
+# Versão da extração gravada em cada candidato. Aumente ao mudar o pipeline:
+# reenvios de arquivos analisados em uma versão anterior são reprocessados.
+VERSAO_PIPELINE = '1'
 
 # --- DETECÇÃO INTELIGENTE DE SEÇÕES ---
-def detectar_secoes_inteligente(texto):
+# Dicionário com variações de títulos para cada seção
+PADROES_SECOES = {
+    'objetivo': [
+        r'objetivo\s*(?:profissional)?', r'objetivo\s*de\s*carreira', r'resumo\s*profissional',
+        r'sobre\s*mim', r'perfil\s*profissional', r'apresentação', r'summary', r'objective'
+    ],
+    'experiencia': [
+        r'experiência\s*(?:profissional)?', r'histórico\s*profissional', r'trajetória\s*profissional',
+        r'experiências', r'atuação\s*profissional', r'vivência\s*profissional',
+        r'(?:work\s*)?experience', r'employment\s*history', r'atividades\s*acadêmicas?\s*relevantes?'
+    ],
+    'formacao': [
+        r'formação\s*(?:acadêmica)?', r'educação', r'escolaridade', r'qualificações?\s*acadêmicas?',
+        r'titulação', r'graduação', r'education', r'academic\s*background'
+    ],
+    'habilidades': [
+        r'habilidades', r'competências', r'skills', r'conhecimentos', r'tecnologias',
+        r'ferramentas', r'capacitações', r'qualificações', r'expertise', r'domínios',
+        r'hard\s*skills', r'soft\s*skills', r'principais\s*competências'
+    ],
+    'idiomas': [
+        r'idiomas', r'línguas', r'languages', r'proficiência\s*em\s*idiomas'
+    ],
+    'cursos': [
+        r'cursos', r'certificações', r'certificados', r'treinamentos', r'workshops',
+        r'extensões?\s*curriculares?', r'formações?\s*complementares?', r'qualificações?\s*adicionais?',
+        r'certifications', r'training'
+    ],
+    'projetos': [
+        r'projetos', r'portfólio', r'trabalhos\s*realizados', r'projects', r'portfolio'
+    ]
+}
+
+# Prefixo e sufixo comuns a todos os títulos: início de linha (com possível
+# numeração ou marcador) e fim de linha (com possível dois-pontos)
+_PREFIXO_TITULO = r'(?:^|\n)\s*(?:\d+\.?\s*|[-•*]\s*)?'
+_SUFIXO_TITULO = r'\s*:?\s*(?:\n|$)'
+_FLAGS_TITULO = re.MULTILINE | re.IGNORECASE
+
+
+def _compilar_padroes_secoes(padroes_secoes):
     """
-    Detecta seções do currículo de forma flexível, identificando títulos
-    com variações e também usando análise semântica do conteúdo.
+    Junta todos os padrões em uma única alternância com grupos nomeados,
+    para que os títulos sejam encontrados em uma só passada pelo texto.
+    Também compila cada padrão isolado, usado apenas para confirmar títulos
+    que casam com mais de um padrão na mesma posição.
+    """
+    alternativas = []
+    individuais = []
+    for tipo_secao, padroes in padroes_secoes.items():
+        for padrao in padroes:
+            alternativas.append(f'(?P<p{len(individuais)}>{padrao})')
+            individuais.append(
+                (tipo_secao, re.compile(_PREFIXO_TITULO + padrao + _SUFIXO_TITULO, _FLAGS_TITULO))
+            )
+    combinado = re.compile(
+        _PREFIXO_TITULO + '(?:' + '|'.join(alternativas) + ')' + _SUFIXO_TITULO,
+        _FLAGS_TITULO,
+    )
+    return combinado, individuais
+
+
+REGEX_TITULOS, PADROES_INDIVIDUAIS = _compilar_padroes_secoes(PADROES_SECOES)
+
+def localizar_secoes(texto):
+    """
+    Localiza os títulos de seção do currículo e devolve uma lista de tuplas
+    (tipo, inicio, fim) com os deslocamentos de caractere do conteúdo de cada
+    seção no texto original, já sem os espaços das bordas.
     """
-    
-    # Dicionário com variações de títulos para cada seção
-    PADROES_SECOES = {
-        'objetivo': [
-            r'objetivo\s*(?:profissional)?', r'objetivo\s*de\s*carreira', r'resumo\s*profissional',
-            r'sobre\s*mim', r'perfil\s*profissional', r'apresentação', r'summary', r'objective'
-        ],
-        'experiencia': [
-            r'experiência\s*(?:profissional)?', r'histórico\s*profissional', r'trajetória\s*profissional',
-            r'experiências', r'atuação\s*profissional', r'vivência\s*profissional',
-            r'(?:work\s*)?experience', r'employment\s*history', r'atividades\s*acadêmicas?\s*relevantes?'
-        ],
-        'formacao': [
-            r'formação\s*(?:acadêmica)?', r'educação', r'escolaridade', r'qualificações?\s*acadêmicas?',
-            r'titulação', r'graduação', r'education', r'academic\s*background'
-        ],
-        'habilidades': [
-            r'habilidades', r'competências', r'skills', r'conhecimentos', r'tecnologias',
-            r'ferramentas', r'capacitações', r'qualificações', r'expertise', r'domínios',
-            r'hard\s*skills', r'soft\s*skills', r'principais\s*competências'
-        ],
-        'idiomas': [
-            r'idiomas', r'línguas', r'languages', r'proficiência\s*em\s*idiomas'
-        ],
-        'cursos': [
-            r'cursos', r'certificações', r'certificados', r'treinamentos', r'workshops',
-            r'extensões?\s*curriculares?', r'formações?\s*complementares?', r'qualificações?\s*adicionais?',
-            r'certifications', r'training'
-        ],
-        'projetos': [
-            r'projetos', r'portfólio', r'trabalhos\s*realizados', r'projects', r'portfolio'
-        ]
-    }
     
     texto_lower = texto.lower()
-    secoes_detectadas = {}
     
-    # Encontra todas as posições de possíveis títulos
+    # Encontra todas as posições de possíveis títulos em uma única passada
     posicoes_titulos = []
     
-    for tipo_secao, padroes in PADROES_SECOES.items():
-        for padrao in padroes:
-            # Busca o padrão no início de linha (com possível numeração ou marcador)
-            regex_completo = r'(?:^|\n)\s*(?:\d+\.?\s*|[-•*]\s*)?' + padrao + r'\s*:?\s*(?:\n|$)'
-            for match in re.finditer(regex_completo, texto_lower, re.MULTILINE | re.IGNORECASE):
+    for match in REGEX_TITULOS.finditer(texto_lower):
+        inicio = match.start()
+        indice = int(match.lastgroup[1:])
+        posicoes_titulos.append({
+            'tipo': PADROES_INDIVIDUAIS[indice][0],
+            'inicio': inicio,
+            'fim_titulo': match.end(),
+            'titulo_texto': match.group().strip()
+        })
+
+        # Um mesmo título pode casar com mais de um padrão (na ordem original)
+        for tipo_secao, regex in PADROES_INDIVIDUAIS[indice + 1:]:
+            outro = regex.match(texto_lower, inicio)
+            if outro:
                 posicoes_titulos.append({
                     'tipo': tipo_secao,
-                    'inicio': match.start(),
-                    'fim_titulo': match.end(),
-                    'titulo_texto': match.group().strip()
+                    'inicio': inicio,
+                    'fim_titulo': outro.end(),
+                    'titulo_texto': outro.group().strip()
                 })
     
-    # Ordena por posição no texto
-    posicoes_titulos.sort(key=lambda x: x['inicio'])
-    
-    # Extrai o conteúdo de cada seção
+    # Calcula os limites do conteúdo de cada seção
+    secoes_localizadas = []
     for i, secao in enumerate(posicoes_titulos):
-        tipo = secao['tipo']
         inicio_conteudo = secao['fim_titulo']
-        
+
         # Define o fim do conteúdo (início da próxima seção ou fim do texto)
         if i + 1 < len(posicoes_titulos):
             fim_conteudo = posicoes_titulos[i + 1]['inicio']
         else:
             fim_conteudo = len(texto)
-        
-        conteudo = texto[inicio_conteudo:fim_conteudo].strip()
-        
+
+        # Equivalente a texto[inicio:fim].strip(), mas preservando os offsets
+        bruto = texto[inicio_conteudo:fim_conteudo]
+        sem_borda = bruto.strip()
+        if sem_borda:
+            inicio = inicio_conteudo + (len(bruto) - len(bruto.lstrip()))
+            fim = inicio + len(sem_borda)
+        else:
+            inicio = fim = inicio_conteudo
+
+        secoes_localizadas.append((secao['tipo'], inicio, fim))
+
+    return secoes_localizadas
+
+def detectar_secoes_inteligente(texto, secoes_localizadas=None):
+    """
+    Detecta seções do currículo de forma flexível, identificando títulos
+    com variações e também usando análise semântica do conteúdo.
+    """
+    if secoes_localizadas is None:
+        secoes_localizadas = localizar_secoes(texto)
+
+    secoes_detectadas = {}
+    for tipo, inicio, fim in secoes_localizadas:
+        conteudo = texto[inicio:fim]
+
         # Se já existe uma seção desse tipo, concatena (para múltiplas seções similares)
         if tipo in secoes_detectadas:
             secoes_detectadas[tipo] += '\n\n' + conteudo
         else:
             secoes_detectadas[tipo] = conteudo
-    
+
     return secoes_detectadas
 
+def mapear_secoes_no_doc(doc, secoes_localizadas):
+    """
+    Projeta as seções localizadas no texto sobre o Doc já processado,
+    devolvendo um dicionário tipo -> lista de Spans. Assim os extratores
+    reaproveitam a análise do documento inteiro em vez de chamar o modelo
+    novamente para cada trecho.
+    """
+    spans_secoes = defaultdict(list)
+    for tipo, inicio, fim in secoes_localizadas:
+        if inicio == fim:
+            continue
+        span = doc.char_span(inicio, fim, alignment_mode='expand')
+        if span is not None:
+            spans_secoes[tipo].append(span)
+    return dict(spans_secoes)
+
 # --- EXTRAÇÃO INTELIGENTE DE NOME ---
 def extrair_nome_inteligente(texto, doc):
     """
@@ -123,8 +185,10 @@ def extrair_nome_inteligente(texto, doc):
     """
     
     # Estratégia 1: Entidades nomeadas no início (primeiros 500 caracteres)
-    doc_inicio = nlp(texto[:500])
-    nomes_candidatos = [ent.text for ent in doc_inicio.ents if ent.label_ == 'PER']
+    nomes_candidatos = [
+        ent.text for ent in doc.ents
+        if ent.label_ == 'PER' and ent.end_char <= 500
+    ]
     
     if nomes_candidatos:
         # Pega o nome mais longo (geralmente o nome completo)
@@ -181,98 +245,32 @@ def extrair_contatos_inteligente(texto):
     return email, telefone
 
 # --- EXTRAÇÃO AVANÇADA DE HABILIDADES ---
-def extrair_habilidades_avancada(texto, secoes):
+def extrair_habilidades_avancada(doc, secoes, spans_secoes):
     """
-    Extrai habilidades usando:
+    Extrai habilidades a partir do Doc já processado usando:
     1. Lista de skills conhecidas (matcher)
     2. Análise da seção específica de habilidades
     3. Análise de contexto de experiências
     4. Padrões linguísticos
     """
     
-    # Lista expandida de habilidades (mantém sua lista original)
-    SKILLS_PROGRAMACAO = [
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'go', 'rust', 'kotlin',
-        'swift', 'ruby', 'php', 'perl', 'scala', 'r', 'matlab', 'julia', 'dart', 'objective-c',
-        'vb.net', 'visual basic', 'cobol', 'fortran', 'assembly', 'lua', 'groovy', 'elixir',
-        'clojure', 'haskell', 'erlang', 'f#', 'bash', 'shell script', 'powershell'
-    ]
-
-    SKILLS_WEB = [
-        'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'bootstrap', 'tailwind',
-        'material-ui', 'react', 'react.js', 'vue', 'vue.js', 'angular', 'angularjs', 'svelte',
-        'next.js', 'nuxt.js', 'gatsby', 'jquery', 'backbone.js', 'ember.js', 'webpack', 'vite',
-        'node.js', 'express', 'nestjs', 'fastify', 'koa', 'asp.net', 'asp.net core', 'spring boot',
-        'django', 'flask', 'fastapi', 'rails', 'laravel', 'symfony', 'codeigniter', 'yii'
-    ]
-
-    SKILLS_MOBILE = [
-        'android', 'ios', 'react native', 'flutter', 'ionic', 'xamarin', 'cordova', 'phonegap',
-        'kotlin android', 'swift ios', 'swiftui', 'jetpack compose', 'android studio', 'xcode'
-    ]
-
-    SKILLS_DADOS = [
-        'sql', 'nosql', 'postgresql', 'mysql', 'mariadb', 'oracle', 'sql server', 'mongodb',
-        'redis', 'cassandra', 'dynamodb', 'elasticsearch', 'neo4j', 'couchdb', 'firebase',
-        'pandas', 'numpy', 'scipy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'opencv',
-        'data science', 'machine learning', 'deep learning', 'nlp', 'computer vision', 'ai',
-        'big data', 'hadoop', 'spark', 'kafka', 'airflow', 'dbt', 'snowflake', 'databricks',
-        'power bi', 'tableau', 'looker', 'qlik', 'metabase', 'grafana', 'kibana', 'superset'
-    ]
-
-    SKILLS_DEVOPS = [
-        'docker', 'kubernetes', 'jenkins', 'gitlab ci', 'github actions', 'circleci', 'travis ci',
-        'terraform', 'ansible', 'puppet', 'chef', 'vagrant', 'prometheus', 'nagios', 'datadog',
-        'aws', 'azure', 'gcp', 'google cloud', 'heroku', 'digitalocean', 'linode', 'cloudflare',
-        'linux', 'unix', 'ubuntu', 'centos', 'debian', 'red hat', 'nginx', 'apache', 'tomcat',
-        'ci/cd', 'devops', 'sre', 'observabilidade', 'monitoramento', 'iaac', 'gitops'
-    ]
-
-    SKILLS_GESTAO = [
-        'gestão de projetos', 'scrum', 'agile', 'kanban', 'pmp', 'prince2', 'pmbok', 'jira',
-        'trello', 'asana', 'monday', 'ms project', 'gestão de equipes', 'liderança', 'coaching'
-    ]
-
-    SKILLS_DESIGN = [
-        'photoshop', 'illustrator', 'indesign', 'adobe xd', 'figma', 'sketch', 'invision',
-        'canva', 'ui/ux', 'design thinking', 'prototipagem', 'wireframe'
-    ]
-
-    SKILLS_MARKETING = [
-        'marketing digital', 'seo', 'sem', 'google ads', 'facebook ads', 'social media',
-        'copywriting', 'google analytics', 'crm', 'salesforce', 'hubspot'
-    ]
-
-    SKILLS_OFFICE = [
-        'excel', 'word', 'powerpoint', 'outlook', 'google sheets', 'google docs',
-        'pacote office', 'microsoft office', 'google workspace'
-    ]
-
-    # Junta todas as habilidades
-    TODAS_SKILLS = (
-        SKILLS_PROGRAMACAO + SKILLS_WEB + SKILLS_MOBILE + SKILLS_DADOS +
-        SKILLS_DEVOPS + SKILLS_GESTAO + SKILLS_DESIGN + SKILLS_MARKETING + SKILLS_OFFICE
-    )
-
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    patterns = [nlp.make_doc(skill) for skill in TODAS_SKILLS]
-    matcher.add("SKILL_MATCH", patterns)
+    matcher = obter_registro_habilidades().obter_matcher(obter_nlp('habilidades'))
 
     habilidades_encontradas = set()
 
     # 1. Busca na seção específica de habilidades
     texto_habilidades = secoes.get('habilidades', '')
     if texto_habilidades:
-        doc_hab = nlp(texto_habilidades)
-        matches = matcher(doc_hab)
-        for match_id, start, end in matches:
-            habilidades_encontradas.add(doc_hab[start:end].text.lower())
+        for span_hab in spans_secoes.get('habilidades', []):
+            for match in matcher(span_hab, as_spans=True):
+                habilidades_encontradas.add(match.text.lower())
 
-        # Extrai noun chunks e entidades
-        for chunk in doc_hab.noun_chunks:
-            texto_chunk = chunk.text.strip()
-            if len(texto_chunk) > 2 and not chunk.root.is_stop:
-                habilidades_encontradas.add(texto_chunk.lower())
+            # Extrai noun chunks (exige a análise sintática do modelo)
+            if doc.has_annotation("DEP"):
+                for chunk in span_hab.noun_chunks:
+                    texto_chunk = chunk.text.strip()
+                    if len(texto_chunk) > 2 and not chunk.root.is_stop:
+                        habilidades_encontradas.add(texto_chunk.lower())
 
         # Procura padrões de lista (ex: "- Python", "• JavaScript")
         linhas = texto_habilidades.split('\n')
@@ -282,10 +280,8 @@ def extrair_habilidades_avancada(texto, secoes):
                 habilidades_encontradas.add(linha.lower())
 
     # 2. Busca no texto completo (com menos agressividade)
-    doc_completo = nlp(texto)
-    matches = matcher(doc_completo)
-    for match_id, start, end in matches:
-        habilidades_encontradas.add(doc_completo[start:end].text.lower())
+    for match in matcher(doc, as_spans=True):
+        habilidades_encontradas.add(match.text.lower())
 
     # 3. Busca em contexto de experiências (ex: "utilizando Python", "expertise em AWS")
     texto_exp = secoes.get('experiencia', '')
@@ -356,16 +352,24 @@ def extrair_experiencia_inteligente(secoes):
     return experiencia_texto
 
 # --- FUNÇÃO PRINCIPAL DE PROCESSAMENTO ---
-def processar_curriculo_com_spacy(texto):
+def processar_curriculo_com_spacy(texto, doc=None, config=None):
     """
     Função principal que orquestra toda a extração de dados do currículo.
+    O modelo do spaCy é executado uma única vez; todos os extratores
+    consomem o mesmo Doc e as seções são mapeadas sobre ele por offsets.
+    Quem já processou o texto (ex.: nlp.pipe em lote) pode passar o `doc`
+    e a `config` prontos.
     """
 
-    config, created = ConfiguracaoExtracao.objects.get_or_create(id=1)
-    doc = nlp(texto)
+    if config is None:
+        config, created = ConfiguracaoExtracao.objects.get_or_create(id=1)
+    if doc is None:
+        doc = obter_nlp('curriculo')(texto)
 
-    # Detecta as seções do currículo
-    secoes = detectar_secoes_inteligente(texto)
+    # Detecta as seções do currículo e as projeta sobre o Doc
+    secoes_localizadas = localizar_secoes(texto)
+    secoes = detectar_secoes_inteligente(texto, secoes_localizadas)
+    spans_secoes = mapear_secoes_no_doc(doc, secoes_localizadas)
 
     # Extrai informações básicas
     nome = extrair_nome_inteligente(texto, doc)
@@ -374,7 +378,7 @@ def processar_curriculo_com_spacy(texto):
     # Extrai habilidades (se configurado)
     habilidades_texto = None
     if config.extrair_habilidades:
-        habilidades_texto = extrair_habilidades_avancada(texto, secoes)
+        habilidades_texto = extrair_habilidades_avancada(doc, secoes, spans_secoes)
 
     # Extrai experiência (se configurado)
     experiencia_texto = None
@@ -412,28 +416,83 @@ def processar_curriculo_com_spacy(texto):
     return (nome, email, telefone, habilidades_texto, experiencia_texto,
             formacao_texto, idiomas_texto)
 
+# --- EXTRAÇÃO (CHAMADA NA REQUISIÇÃO OU PELO WORKER DA FILA) ---
+def executar_extracao_curriculo(candidato_id):
+    """
+    Processa o texto do currículo e preenche os campos do candidato. O texto
+    normalmente já foi extraído no upload; só registros sem texto (antigos)
+    fazem o arquivo ser lido de volta do storage.
+    """
+    candidato_obj = Candidato.objects.get(pk=candidato_id)
+
+    texto_extraido = candidato_obj.texto_do_curriculo
+    if texto_extraido is None:
+        with candidato_obj.curriculo_original.open('rb') as arquivo:
+            texto_extraido = extrair_texto_de_arquivo(arquivo)
+
+    resultado = processar_curriculo_com_spacy(texto_extraido)
+    preencher_candidato(candidato_obj, texto_extraido, resultado)
+    candidato_obj.versao_pipeline = VERSAO_PIPELINE
+
+    candidato_obj.save()
+    return candidato_obj
+
+def preencher_candidato(candidato_obj, texto_extraido, resultado):
+    """
+    Copia o resultado de processar_curriculo_com_spacy para o candidato.
+    """
+    nome, email, telefone, habilidades, experiencia, formacao, idiomas = resultado
+
+    candidato_obj.texto_do_curriculo = texto_extraido
+    candidato_obj.nome_completo = nome
+    candidato_obj.email = email
+    candidato_obj.telefone = telefone
+    candidato_obj.habilidades = habilidades
+    candidato_obj.experiencia = experiencia
+    candidato_obj.formacao_academica = formacao
+    candidato_obj.idiomas = idiomas
+    return candidato_obj
+
+def agendar_extracao_curriculo(candidato_obj):
+    if settings.EXTRACAO_ASSINCRONA:
+        # O worker (manage.py run_extraction_worker) faz a extração
+        enfileirar(TarefaExtracao.TIPO_CURRICULO, candidato_obj.id)
+    else:
+        executar_extracao_curriculo(candidato_obj.id)
+
 # --- VIEW DE UPLOAD ---
 def upload_curriculo(request):
     if request.method == 'POST':
         form = CandidatoForm(request.POST, request.FILES)
         if form.is_valid():
-            candidato_obj = form.save()
-
-            caminho_arquivo = candidato_obj.curriculo_original.path
-            texto_extraido = extrair_texto_de_arquivo(caminho_arquivo)
-
-            nome, email, telefone, habilidades, experiencia, formacao, idiomas = processar_curriculo_com_spacy(texto_extraido)
-
-            candidato_obj.texto_do_curriculo = texto_extraido
-            candidato_obj.nome_completo = nome
-            candidato_obj.email = email
-            candidato_obj.telefone = telefone
-            candidato_obj.habilidades = habilidades
-            candidato_obj.experiencia = experiencia
-            candidato_obj.formacao_academica = formacao
-            candidato_obj.idiomas = idiomas
-
-            candidato_obj.save()
+            arquivo = form.cleaned_data['curriculo_original']
+            hash_conteudo = calcular_hash_conteudo(arquivo)
+            candidato_obj = (
+                Candidato.objects
+                .filter(hash_conteudo=hash_conteudo)
+                .order_by('-data_de_upload')
+                .first()
+            )
+
+            if candidato_obj is None:
+                # O texto sai do arquivo ainda em memória; o storage só recebe
+                # o upload e o worker não precisa baixá-lo de volta
+                candidato_obj = form.save(commit=False)
+                candidato_obj.hash_conteudo = hash_conteudo
+                candidato_obj.texto_do_curriculo = extrair_texto_de_arquivo(arquivo)
+                candidato_obj.save()
+                agendar_extracao_curriculo(candidato_obj)
+            elif extracao_em_andamento(TarefaExtracao.TIPO_CURRICULO, candidato_obj.id):
+                # O mesmo arquivo já está na fila: basta acompanhar a extração
+                messages.info(request, "Este currículo já está sendo analisado.")
+            elif form.cleaned_data['forcar_reextracao'] or candidato_obj.versao_pipeline != VERSAO_PIPELINE:
+                # Reaproveita o arquivo já armazenado e refaz só a extração
+                candidato_obj.texto_do_curriculo = extrair_texto_de_arquivo(arquivo)
+                candidato_obj.save(update_fields=['texto_do_curriculo'])
+                agendar_extracao_curriculo(candidato_obj)
+                messages.info(request, "Este currículo já havia sido enviado e foi analisado novamente.")
+            else:
+                messages.info(request, "Este currículo já havia sido analisado. Exibindo o resultado salvo.")
 
             return redirect('core:detalhe_candidato', candidato_id=candidato_obj.id)
     else:
@@ -449,9 +508,18 @@ def detalhe_candidato(request, candidato_id):
     if candidato.habilidades:
         habilidades_lista = [h.strip() for h in candidato.habilidades.split(',')]
 
+    # Categoria de cada habilidade vem do mapeamento já compilado no registro
+    categorias = obter_registro_habilidades().categorias()
+    habilidades_categorizadas = [
+        (habilidade, categorias.get(habilidade.lower()))
+        for habilidade in habilidades_lista
+    ]
+
     contexto = {
         'candidato': candidato,
         'habilidades_lista': habilidades_lista,
+        'habilidades_categorizadas': habilidades_categorizadas,
+        'tarefa': tarefa_mais_recente(TarefaExtracao.TIPO_CURRICULO, candidato.id),
     }
 
     return render(request, 'core/detalhe_candidato.html', contexto)
@@ -489,3 +557,19 @@ def configuracao_view(request):
         'form': form
     }
     return render(request, 'core/configuracoes.html', contexto)
+
+
+def status_tarefa(request, tarefa_id):
+    """
+    Endpoint consultado periodicamente pelas páginas de resultado enquanto
+    a extração está na fila.
+    """
+    tarefa = get_object_or_404(TarefaExtracao, pk=tarefa_id)
+    return JsonResponse({
+        'id': tarefa.id,
+        'tipo': tarefa.tipo,
+        'objeto_id': tarefa.objeto_id,
+        'status': tarefa.status,
+        'finalizada': tarefa.finalizada,
+        'tentativas': tarefa.tentativas,
+    })
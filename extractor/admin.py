@@ -1,9 +1,16 @@
 # Em extractor/admin.py
 
 from django.contrib import admin
-from .models import Documento
+from .models import Documento, EntidadeExtraida
 
 @admin.register(Documento)
 class DocumentoAdmin(admin.ModelAdmin):
     list_display = ('titulo', 'data_de_upload')
-    search_fields = ('titulo', 'texto_do_documento')
\ No newline at end of file
+    search_fields = ('titulo', 'texto_do_documento')
+
+@admin.register(EntidadeExtraida)
+class EntidadeExtraidaAdmin(admin.ModelAdmin):
+    list_display = ('texto', 'tipo', 'documento')
+    list_filter = ('tipo',)
+    search_fields = ('texto_normalizado',)
+    raw_id_fields = ('documento',)
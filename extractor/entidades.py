@@ -0,0 +1,67 @@
+# Em extractor/entidades.py
+
+import re
+import unicodedata
+
+from django.db import transaction
+
+from .models import EntidadeExtraida
+
+# CPFs, CNPJs e afins: só dígitos e pontuação
+_SO_NUMERO = re.compile(r"[\d.\-/\s]+")
+_NAO_DIGITO = re.compile(r"\D")
+
+TAMANHO_LOTE = 500
+
+
+def normalizar_entidade(texto):
+    """
+    Forma usada na busca: números de documento ficam só com os dígitos
+    ("12.345.678/0001-90" -> "12345678000190"); o resto fica sem acentos,
+    em minúsculas e com os espaços colapsados.
+    """
+    texto = texto.strip()
+    if _SO_NUMERO.fullmatch(texto) and any(c.isdigit() for c in texto):
+        return _NAO_DIGITO.sub("", texto)
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    normalizado = " ".join(texto.casefold().split())
+    return normalizado[:EntidadeExtraida._meta.get_field('texto_normalizado').max_length]
+
+
+def agrupar_entidades(entidades):
+    """
+    Agrupa as entidades por tipo, sem repetir textos, com o total de
+    ocorrências de cada tipo: {tipo: {'textos': [...], 'total': n}}.
+    """
+    textos, totais = {}, {}
+    for entidade in entidades or []:
+        tipo = entidade.get('tipo', 'Outros')
+        # dict como conjunto ordenado: deduplica sem perder a ordem
+        textos.setdefault(tipo, {})[entidade.get('texto')] = None
+        totais[tipo] = totais.get(tipo, 0) + 1
+    return {tipo: {'textos': list(unicos), 'total': totais[tipo]} for tipo, unicos in textos.items()}
+
+
+def indexar_entidades(documento, entidades):
+    """
+    Substitui as linhas de EntidadeExtraida do documento pelas `entidades`
+    ({'texto', 'tipo', 'inicio', 'fim'}; as posições faltam nas extrações
+    antigas). Retorna quantas linhas foram gravadas.
+    """
+    linhas = [
+        EntidadeExtraida(
+            documento=documento,
+            tipo=entidade.get('tipo', 'Outros'),
+            texto=entidade['texto'],
+            texto_normalizado=normalizar_entidade(entidade['texto']),
+            inicio=entidade.get('inicio'),
+            fim=entidade.get('fim'),
+        )
+        for entidade in entidades or []
+        if entidade.get('texto')
+    ]
+    with transaction.atomic():
+        EntidadeExtraida.objects.filter(documento=documento).delete()
+        EntidadeExtraida.objects.bulk_create(linhas, batch_size=TAMANHO_LOTE)
+    return len(linhas)
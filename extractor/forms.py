@@ -4,7 +4,31 @@ from django import forms
 from .models import Documento
 
 class DocumentoForm(forms.ModelForm):
+    # Reenvios do mesmo arquivo reaproveitam a análise salva, a menos que
+    # esta opção seja marcada.
+    forcar_reextracao = forms.BooleanField(required=False, label="Analisar novamente se o arquivo já foi enviado")
+
     class Meta:
         model = Documento
         # CORREÇÃO: Adicione a vírgula no final para criar uma tupla.
-        fields = ('arquivo_original',)
\ No newline at end of file
+        fields = ('arquivo_original',)
+
+# --- UPLOAD EM LOTE ---
+class MultiplosArquivosInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultiplosArquivosField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", MultiplosArquivosInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        if isinstance(data, (list, tuple)):
+            return [super(MultiplosArquivosField, self).clean(arquivo, initial) for arquivo in data]
+        return [super().clean(data, initial)]
+
+
+class LoteDocumentosForm(forms.Form):
+    arquivos = MultiplosArquivosField(label="Arquivos (.pdf, .docx ou .zip)")
+    forcar_reextracao = forms.BooleanField(required=False, label="Analisar novamente os arquivos já enviados")
@@ -0,0 +1,44 @@
+# Em extractor/intervalos.py
+
+from bisect import bisect_left, bisect_right
+
+
+class IntervalosOcupados:
+    """
+    Trechos [inicio, fim) do texto já ocupados por entidades. Como só são
+    adicionados trechos que não se sobrepõem aos anteriores, eles ficam
+    disjuntos e ordenados pelo início, e portanto também pelo fim: a consulta
+    de sobreposição só precisa olhar o último trecho que começa antes do fim
+    do candidato (busca binária), em vez de percorrer todos.
+    """
+
+    def __init__(self):
+        self._inicios = []
+        self._fins = []
+
+    def sobrepoe(self, inicio, fim):
+        """
+        True se [inicio, fim) cruza algum trecho ocupado ou está contido nele.
+        """
+        if inicio == fim:
+            # Trecho vazio: conta como contido também se tocar uma borda
+            i = bisect_right(self._inicios, inicio)
+            return i > 0 and self._fins[i - 1] >= inicio
+        i = bisect_left(self._inicios, fim)
+        if i == 0:
+            return False
+        return self._fins[i - 1] > inicio
+
+    def adicionar(self, inicio, fim):
+        """
+        Marca [inicio, fim) como ocupado. Chame só depois de sobrepoe() dar False.
+        """
+        i = bisect_left(self._inicios, inicio)
+        self._inicios.insert(i, inicio)
+        self._fins.insert(i, fim)
+
+    def __len__(self):
+        return len(self._inicios)
+
+    def __iter__(self):
+        return zip(self._inicios, self._fins)
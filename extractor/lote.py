@@ -0,0 +1,226 @@
+# Em extractor/lote.py
+
+import atexit
+import io
+import threading
+import time
+import zipfile
+from multiprocessing import Pool
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+
+from config.nlp import obter_nlp
+from core.arquivos import calcular_hash_conteudo, extrair_texto_de_arquivo
+
+EXTENSOES = ('.pdf', '.docx')
+
+PROCESSADO = 'processado'
+EXISTENTE = 'existente'
+ERRO = 'erro'
+
+
+# --- ARQUIVOS DO LOTE ---
+def listar_arquivos_enviados(arquivos, max_arquivos=None, max_bytes=None):
+    """
+    Gera (nome, conteúdo) para cada arquivo enviado, abrindo os .zip e
+    pegando os .pdf/.docx de dentro deles. Levanta ValueError se o lote
+    passar de `max_arquivos` arquivos ou `max_bytes` bytes (descompactados).
+    """
+    if max_arquivos is None:
+        max_arquivos = settings.EXTRACAO_LOTE_MAX_ARQUIVOS
+    if max_bytes is None:
+        max_bytes = settings.EXTRACAO_LOTE_MAX_MB * 1024 * 1024
+
+    itens = []
+    total = 0
+
+    def adicionar(nome, tamanho, ler):
+        nonlocal total
+        total += tamanho
+        if max_arquivos and len(itens) >= max_arquivos:
+            raise ValueError(f"O lote passa de {max_arquivos} arquivos.")
+        if max_bytes and total > max_bytes:
+            raise ValueError(f"O lote passa de {max_bytes // (1024 * 1024)} MB descompactado.")
+        itens.append((nome, ler()))
+
+    for arquivo in arquivos:
+        if arquivo.name.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(arquivo) as arquivo_zip:
+                    for membro in arquivo_zip.infolist():
+                        # O tamanho declarado é conferido antes de descompactar
+                        if not membro.is_dir() and membro.filename.lower().endswith(EXTENSOES):
+                            adicionar(f"{arquivo.name}/{membro.filename}", membro.file_size,
+                                      lambda: arquivo_zip.read(membro))
+            except zipfile.BadZipFile:
+                raise ValueError(f"{arquivo.name} não é um arquivo .zip válido.")
+        elif arquivo.name.lower().endswith(EXTENSOES):
+            adicionar(arquivo.name, arquivo.size, arquivo.read)
+        else:
+            raise ValueError(f"{arquivo.name}: envie arquivos .pdf, .docx ou .zip.")
+    return itens
+
+
+# --- PROCESSOS DO POOL ---
+def _inicializar_worker():
+    # Cada processo carrega o modelo uma vez (com fork, herda o já carregado)
+    try:
+        obter_nlp('contratos')
+    except OSError:
+        pass  # O erro aparece no resultado de cada arquivo
+
+
+def processar_arquivo(item):
+    """
+    Executada nos processos do pool: extrai o texto e as entidades de um
+    arquivo do lote. Não acessa o banco; quem grava é o processo da requisição.
+    """
+    from .views import processar_documento_com_spacy
+
+    nome, conteudo = item
+    resultado = {'texto': None, 'entidades': None, 'erro': None}
+    inicio = time.perf_counter()
+    try:
+        texto = extrair_texto_de_arquivo(io.BytesIO(conteudo), nome_arquivo=nome)
+        if not texto.strip():
+            raise ValueError("Nenhum texto encontrado no arquivo.")
+        resultado['texto'] = texto
+        resultado['entidades'] = processar_documento_com_spacy(texto)
+    except Exception as e:
+        resultado['erro'] = str(e) or e.__class__.__name__
+    resultado['tempo'] = time.perf_counter() - inicio
+    return resultado
+
+
+_pool = None
+_pool_processos = 1
+_pool_lock = threading.Lock()
+
+
+def obter_pool(processos=None):
+    """
+    Pool de processos do processo atual, criado na primeira chamada com
+    `processos` workers (padrão: settings.EXTRACAO_LOTE_PROCESSOS) e
+    reaproveitado por todas as requisições seguintes, com os modelos já
+    carregados. Nunca é recriado aqui: outra requisição pode estar lendo os
+    resultados dele. Retorna None se o lote deve rodar no próprio processo.
+    """
+    global _pool, _pool_processos
+    if processos is None:
+        processos = settings.EXTRACAO_LOTE_PROCESSOS
+    if _pool is None and processos <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Os processos do pool não usam o banco e não devem herdar as
+            # conexões abertas da requisição
+            connections.close_all()
+            _pool = Pool(processos, initializer=_inicializar_worker)
+            _pool_processos = processos
+        return _pool
+
+
+def redefinir_pool():
+    """
+    Encerra o pool (testes, benchmarks e saída do processo); não deve ser
+    chamada enquanto houver lotes em andamento.
+    """
+    global _pool, _pool_processos
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+            _pool.join()
+        _pool, _pool_processos = None, 1
+
+
+atexit.register(redefinir_pool)
+
+
+# --- LOTE ---
+def processar_lote(itens, forcar_reextracao=False):
+    """
+    Processa os arquivos (nome, conteúdo) no pool de processos (ver
+    obter_pool) e grava os documentos. Como no upload
+    individual, arquivos já analisados na versão atual do pipeline só são
+    reprocessados com `forcar_reextracao`, e conteúdos repetidos no lote
+    passam uma vez só pelo modelo. Retorna o resumo para a página do lote.
+    """
+    from .entidades import agrupar_entidades, indexar_entidades
+    from .models import Documento
+    from .views import VERSAO_PIPELINE
+
+    inicio = time.perf_counter()
+
+    hashes = [calcular_hash_conteudo(conteudo) for _, conteudo in itens]
+    anteriores = {}
+    for documento in Documento.objects.filter(hash_conteudo__in=set(hashes)).order_by('data_de_upload'):
+        anteriores[documento.hash_conteudo] = documento  # fica o mais recente
+
+    # Índice do primeiro arquivo de cada conteúdo que precisa do modelo
+    pendentes = {}
+    for indice, hash_conteudo in enumerate(hashes):
+        anterior = anteriores.get(hash_conteudo)
+        if anterior is not None and anterior.versao_pipeline == VERSAO_PIPELINE and not forcar_reextracao:
+            continue
+        pendentes.setdefault(hash_conteudo, indice)
+
+    # O pool tem tamanho fixo; o lote só limita quantos workers ficam ocupados
+    pool = obter_pool() if pendentes else None
+    processos = max(1, min(_pool_processos if pool else 1, len(pendentes)))
+    mapear = pool.imap if pool else map
+    resultados = {}
+    for indice, resultado in zip(pendentes.values(), mapear(processar_arquivo, (itens[i] for i in pendentes.values()))):
+        nome, conteudo = itens[indice]
+        if resultado['erro'] is None:
+            documento = anteriores.get(hashes[indice])
+            if documento is None:
+                documento = Documento(arquivo_original=ContentFile(conteudo, name=Path(nome).name),
+                                      hash_conteudo=hashes[indice])
+            documento.titulo = documento.arquivo_original.name
+            documento.texto_do_documento = resultado['texto']
+            documento.entidades_extraidas = resultado['entidades']
+            documento.entidades_agrupadas = agrupar_entidades(resultado['entidades'])
+            documento.versao_pipeline = VERSAO_PIPELINE
+            documento.save()
+            indexar_entidades(documento, documento.entidades_extraidas)
+            anteriores[hashes[indice]] = documento
+        resultados[indice] = resultado
+
+    arquivos = []
+    for indice, (nome, _) in enumerate(itens):
+        documento = anteriores.get(hashes[indice])
+        # Cópias de um arquivo do lote compartilham o resultado dele
+        primeiro = pendentes.get(hashes[indice])
+        resultado = resultados.get(primeiro)
+        if resultado is not None and resultado['erro']:
+            status, erro = ERRO, resultado['erro']
+        elif primeiro == indice:
+            status, erro = PROCESSADO, None
+        else:
+            status, erro = EXISTENTE, None
+        tempo = resultado['tempo'] if primeiro == indice else 0.0
+        arquivos.append({
+            'nome': nome,
+            'status': status,
+            'documento': documento if status != ERRO else None,
+            'entidades': len(documento.entidades_extraidas or []) if documento and status != ERRO else 0,
+            'erro': erro,
+            'tempo': tempo,
+        })
+
+    decorrido = time.perf_counter() - inicio
+    tempo_arquivos = sum(arquivo['tempo'] for arquivo in arquivos)
+    return {
+        'arquivos': arquivos,
+        'processos': processos,
+        'tempo_total': decorrido,
+        'tempo_arquivos': tempo_arquivos,
+        'ganho': tempo_arquivos / decorrido if decorrido else 1.0,
+        'contagem': {
+            status: sum(1 for arquivo in arquivos if arquivo['status'] == status)
+            for status in (PROCESSADO, EXISTENTE, ERRO)
+        },
+    }
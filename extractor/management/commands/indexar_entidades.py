@@ -0,0 +1,44 @@
+# Em extractor/management/commands/indexar_entidades.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from extractor.entidades import indexar_entidades
+from extractor.models import Documento
+from extractor.views import VERSAO_PIPELINE, executar_extracao_documento
+
+
+class Command(BaseCommand):
+    help = ("Preenche a tabela de entidades indexadas (EntidadeExtraida) a partir do "
+            "JSON entidades_extraidas dos documentos já processados.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faltantes', action='store_true',
+                            help="Só os documentos que ainda não têm entidades indexadas.")
+        parser.add_argument('--reextrair', action='store_true',
+                            help="Reprocessa com o modelo os documentos de versões anteriores do pipeline "
+                                 "(que não guardavam as posições das entidades).")
+        parser.add_argument('--lote', type=int, default=200,
+                            help="Documentos lidos do banco por vez.")
+
+    def handle(self, *args, **options):
+        documentos = Documento.objects.exclude(entidades_extraidas=None).order_by('pk')
+        if options['faltantes']:
+            documentos = documentos.filter(entidades__isnull=True)
+
+        inicio = time.perf_counter()
+        total_documentos = total_entidades = reextraidos = 0
+        for documento in documentos.only('pk', 'entidades_extraidas', 'versao_pipeline').iterator(chunk_size=options['lote']):
+            if options['reextrair'] and documento.versao_pipeline != VERSAO_PIPELINE:
+                documento = executar_extracao_documento(documento.pk)
+                total_entidades += len(documento.entidades_extraidas)
+                reextraidos += 1
+            else:
+                total_entidades += indexar_entidades(documento, documento.entidades_extraidas)
+            total_documentos += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total_entidades} entidade(s) de {total_documentos} documento(s) indexada(s), "
+            f"{reextraidos} reprocessado(s) ({time.perf_counter() - inicio:.2f} s)."
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='hash_conteudo',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='versao_pipeline',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+    ]
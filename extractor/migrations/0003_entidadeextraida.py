@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0002_documento_hash_conteudo_documento_versao_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntidadeExtraida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50)),
+                ('texto', models.TextField()),
+                ('texto_normalizado', models.CharField(max_length=255)),
+                ('inicio', models.PositiveIntegerField(blank=True, null=True)),
+                ('fim', models.PositiveIntegerField(blank=True, null=True)),
+                ('documento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entidades', to='extractor.documento')),
+            ],
+            options={
+                'verbose_name': 'Entidade Extraída',
+                'verbose_name_plural': 'Entidades Extraídas',
+                'ordering': ['documento', 'inicio'],
+                'indexes': [models.Index(fields=['texto_normalizado', 'tipo'], name='extractor_e_texto_n_f2058b_idx'), models.Index(fields=['tipo', 'texto_normalizado'], name='extractor_e_tipo_ae07e7_idx')],
+            },
+        ),
+    ]
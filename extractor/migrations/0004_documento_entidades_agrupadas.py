@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+def agrupar_entidades(entidades):
+    # Cópia de extractor.entidades.agrupar_entidades no momento desta migração
+    textos, totais = {}, {}
+    for entidade in entidades or []:
+        tipo = entidade.get('tipo', 'Outros')
+        textos.setdefault(tipo, {})[entidade.get('texto')] = None
+        totais[tipo] = totais.get(tipo, 0) + 1
+    return {tipo: {'textos': list(unicos), 'total': totais[tipo]} for tipo, unicos in textos.items()}
+
+
+def preencher_entidades_agrupadas(apps, schema_editor):
+    Documento = apps.get_model('extractor', 'Documento')
+    documentos = (
+        Documento.objects
+        .filter(entidades_extraidas__isnull=False, entidades_agrupadas__isnull=True)
+        .only('pk', 'entidades_extraidas')
+    )
+    lote = []
+    for documento in documentos.iterator(chunk_size=200):
+        documento.entidades_agrupadas = agrupar_entidades(documento.entidades_extraidas)
+        lote.append(documento)
+        if len(lote) >= 200:
+            Documento.objects.bulk_update(lote, ['entidades_agrupadas'])
+            lote = []
+    if lote:
+        Documento.objects.bulk_update(lote, ['entidades_agrupadas'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0003_entidadeextraida'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='entidades_agrupadas',
+            field=models.JSONField(blank=True, null=True, verbose_name='Entidades por tipo (JSON)'),
+        ),
+        migrations.RunPython(preencher_entidades_agrupadas, migrations.RunPython.noop),
+    ]
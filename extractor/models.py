@@ -10,6 +10,13 @@ class Documento(models.Model):
     # JSONField é perfeito para guardar dados estruturados, como nossa lista de entidades.
     # Cada entidade será um dicionário, ex: {'texto': 'Google', 'tipo': 'ORG'}
     entidades_extraidas = models.JSONField(blank=True, null=True, verbose_name="Entidades (JSON)")
+    # As mesmas entidades agrupadas por tipo para a página de resultado:
+    # {tipo: {'textos': [únicos, na ordem do documento], 'total': ocorrências}}
+    entidades_agrupadas = models.JSONField(blank=True, null=True, verbose_name="Entidades por tipo (JSON)")
+
+    # SHA-256 do arquivo enviado: reenvios do mesmo arquivo reaproveitam a análise
+    hash_conteudo = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    versao_pipeline = models.CharField(max_length=20, blank=True, null=True)
     
     data_de_upload = models.DateTimeField(auto_now_add=True)
 
@@ -19,4 +26,31 @@ class Documento(models.Model):
     class Meta:
         verbose_name = "Documento"
         verbose_name_plural = "Documentos"
-        ordering = ['-data_de_upload']
\ No newline at end of file
+        ordering = ['-data_de_upload']
+
+# --- ENTIDADES INDEXADAS (BUSCA ENTRE DOCUMENTOS) ---
+class EntidadeExtraida(models.Model):
+    """
+    Cópia normalizada de cada item de Documento.entidades_extraidas, para
+    consultas entre documentos ("quais contratos citam este CNPJ") pelo
+    índice do banco, sem carregar o JSON de todos os documentos.
+    """
+    documento = models.ForeignKey(Documento, on_delete=models.CASCADE, related_name='entidades')
+    tipo = models.CharField(max_length=50)
+    texto = models.TextField()
+    # Sem acentos e em minúsculas; números de documento só com os dígitos
+    texto_normalizado = models.CharField(max_length=255)
+    inicio = models.PositiveIntegerField(blank=True, null=True)
+    fim = models.PositiveIntegerField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.tipo}: {self.texto}"
+
+    class Meta:
+        verbose_name = "Entidade Extraída"
+        verbose_name_plural = "Entidades Extraídas"
+        ordering = ['documento', 'inicio']
+        indexes = [
+            models.Index(fields=['texto_normalizado', 'tipo']),
+            models.Index(fields=['tipo', 'texto_normalizado']),
+        ]
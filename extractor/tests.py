@@ -1,3 +1,375 @@
-from django.test import TestCase
+import importlib
+import io
+import random
+import shutil
+import tempfile
+import zipfile
 
-# Create your tests here.
+import spacy
+from unittest import mock
+from django.apps import apps
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from benchmarks.contratos import gerar_contrato, processar_documento_legado
+from benchmarks.contratos import montar_pipeline as montar_pipeline_contrato
+from config import nlp as gerenciador_nlp
+from core.models import TarefaExtracao
+from core.tests import gerar_docx
+
+from . import lote
+from .intervalos import IntervalosOcupados
+from .entidades import agrupar_entidades, normalizar_entidade
+from .lote import listar_arquivos_enviados, obter_pool, redefinir_pool
+from .models import Documento, EntidadeExtraida
+from .trechos import _unir_emendas, analisar_em_trechos, dividir_em_trechos
+from .views import VERSAO_PIPELINE, processar_documento_com_spacy
+
+
+CONTRATO_EXEMPLO = """CONTRATO DE PRESTAÇÃO DE SERVIÇOS
+CONTRATANTE: Acme Ltda
+CNPJ: 12.345.678/0001-90
+CONTRATADA: Maria Souza
+CPF: 123.456.789-00
+OBJETO: Desenvolvimento de sistema web
+VALOR: R$ 10.000,00
+"""
+
+
+def sem_posicoes(entidades):
+    return [{'texto': e['texto'], 'tipo': e['tipo']} for e in entidades]
+
+
+def montar_pipeline():
+    nlp = spacy.blank("pt")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([
+        {"label": "ORG", "pattern": "Acme Ltda"},
+        {"label": "PER", "pattern": "Maria Souza"},
+    ])
+    return nlp
+
+
+class ExtracaoDocumentoTests(TestCase):
+    def setUp(self):
+        pasta_media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta_media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=pasta_media, EXTRACAO_ASSINCRONA=True)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def test_upload_enfileira_e_worker_extrai(self):
+        arquivo = SimpleUploadedFile("contrato.docx", gerar_docx(CONTRATO_EXEMPLO))
+        resposta = self.client.post(reverse('extractor:upload_documento'), {'arquivo_original': arquivo})
+
+        documento = Documento.objects.get()
+        self.assertRedirects(resposta, reverse('extractor:resultado_extracao', args=[documento.id]))
+        self.assertIsNone(documento.entidades_extraidas)
+        tarefa = TarefaExtracao.objects.get(tipo=TarefaExtracao.TIPO_DOCUMENTO)
+        self.assertEqual(tarefa.objeto_id, documento.id)
+
+        call_command('run_extraction_worker', '--uma-vez', stdout=io.StringIO())
+
+        documento.refresh_from_db()
+        entidades = {(e['tipo'], e['texto']) for e in documento.entidades_extraidas}
+        self.assertIn(("Documento (CNPJ)", "12.345.678/0001-90"), entidades)
+        self.assertIn(("Parte (Organização)", "Acme Ltda"), entidades)
+        self.assertIn(("Parte (Pessoa)", "Maria Souza"), entidades)
+        self.assertEqual(documento.entidades_agrupadas, agrupar_entidades(documento.entidades_extraidas))
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaExtracao.CONCLUIDA)
+
+    def test_reenvio_do_mesmo_arquivo_nao_reenfileira(self):
+        conteudo = gerar_docx(CONTRATO_EXEMPLO)
+        for _ in range(2):
+            arquivo = SimpleUploadedFile("contrato.docx", conteudo)
+            self.client.post(reverse('extractor:upload_documento'), {'arquivo_original': arquivo})
+        call_command('run_extraction_worker', '--uma-vez', stdout=io.StringIO())
+
+        arquivo = SimpleUploadedFile("contrato.docx", conteudo)
+        self.client.post(reverse('extractor:upload_documento'), {'arquivo_original': arquivo})
+
+        documento = Documento.objects.get()
+        self.assertEqual(documento.versao_pipeline, VERSAO_PIPELINE)
+        self.assertEqual(TarefaExtracao.objects.filter(tipo=TarefaExtracao.TIPO_DOCUMENTO).count(), 1)
+
+
+class IntervalosOcupadosTests(SimpleTestCase):
+    def test_igual_a_busca_linear(self):
+        aleatorio = random.Random(0)
+        intervalos = IntervalosOcupados()
+        ocupados = []
+        for _ in range(2000):
+            inicio = aleatorio.randrange(5000)
+            fim = inicio + aleatorio.randrange(0, 30)
+            esperado = any(
+                (inicio >= a and fim <= b) or (inicio < b and fim > a) for a, b in ocupados
+            )
+            self.assertEqual(intervalos.sobrepoe(inicio, fim), esperado, (inicio, fim))
+            if not esperado and fim > inicio:
+                intervalos.adicionar(inicio, fim)
+                ocupados.append((inicio, fim))
+        self.assertEqual(list(intervalos), sorted(ocupados))
+
+    def test_mesmas_entidades_da_implementacao_anterior(self):
+        nlp = montar_pipeline_contrato()
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, nlp)
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+        for texto in (CONTRATO_EXEMPLO, gerar_contrato(paginas=3)):
+            self.assertEqual(sem_posicoes(processar_documento_com_spacy(texto)), processar_documento_legado(texto, nlp))
+
+
+class PartesContratoTests(SimpleTestCase):
+    def setUp(self):
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def test_modelo_roda_uma_vez_por_contrato(self):
+        with mock.patch.object(gerenciador_nlp.VisaoPipeline, "__call__", autospec=True,
+                               side_effect=gerenciador_nlp.VisaoPipeline.__call__) as chamada:
+            entidades = sem_posicoes(processar_documento_com_spacy(CONTRATO_EXEMPLO))
+        self.assertEqual(chamada.call_count, 1)
+        self.assertIn({'texto': 'Acme Ltda', 'tipo': 'Parte (Organização)'}, entidades)
+        self.assertIn({'texto': 'Maria Souza', 'tipo': 'Parte (Pessoa)'}, entidades)
+
+    def test_usa_a_posicao_da_linha_da_parte(self):
+        # "Acme Ltda" aparece antes dentro de outra palavra; buscar o texto
+        # a partir do início cairia no meio de um token e perderia a parte
+        texto = "Acordo firmado com Acme Ltdaxx e outros\n" + CONTRATO_EXEMPLO
+        entidades = sem_posicoes(processar_documento_com_spacy(texto))
+        self.assertIn({'texto': 'Acme Ltda', 'tipo': 'Parte (Organização)'}, entidades)
+
+
+class TrechosTests(SimpleTestCase):
+    def test_trechos_cobrem_o_texto_com_sobreposicao(self):
+        texto = gerar_contrato(paginas=5)
+        trechos = list(dividir_em_trechos(texto, 2000, 300))
+        self.assertEqual(trechos[0][0], 0)
+        self.assertEqual(trechos[-1][1], len(texto))
+        for (inicio, fim), (proximo, _) in zip(trechos, trechos[1:]):
+            self.assertLessEqual(fim - inicio, 2000)
+            self.assertLess(inicio, proximo)
+            self.assertLessEqual(proximo, fim)
+            # Cortes em fim de linha, não no meio de uma cláusula
+            self.assertEqual(texto[fim - 1], "\n")
+
+    def test_texto_curto_roda_o_modelo_inteiro(self):
+        self.assertEqual(list(dividir_em_trechos("abc def", 2000, 300)), [(0, 7)])
+        self.assertEqual(list(dividir_em_trechos("abc def", 0, 300)), [(0, 7)])
+
+    def test_mesmas_entidades_em_trechos(self):
+        nlp = montar_pipeline_contrato()
+        nlp.max_length = 5000
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, nlp)
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+        texto = gerar_contrato(paginas=5)
+
+        with override_settings(EXTRACAO_NER_TAMANHO_TRECHO=2000, EXTRACAO_NER_SOBREPOSICAO=300):
+            entidades = processar_documento_com_spacy(texto)
+
+        # O texto inteiro passa do max_length do modelo; a referência roda com folga
+        nlp.max_length = len(texto) + 1
+        self.assertEqual(sem_posicoes(entidades), processar_documento_legado(texto, nlp))
+
+    def test_entidade_na_emenda_vira_uma_so(self):
+        nlp = spacy.blank("pt")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "ORG", "pattern": [{"LOWER": "banco"}, {"LOWER": "central"}]},
+            {"label": "ORG", "pattern": [{"LOWER": "central"}, {"LOWER": "do"}, {"LOWER": "sul"}]},
+        ])
+        texto = "x " * 30 + "Banco Central do Sul" + " y" * 30
+        inicio = texto.index("Banco")
+        with mock.patch("extractor.trechos.dividir_em_trechos",
+                        return_value=iter([(0, inicio + 14), (inicio + 6, len(texto))])):
+            _, entidades = analisar_em_trechos(nlp, texto, [], 0, 0)
+        self.assertEqual(entidades, [(inicio, inicio + len("Banco Central do Sul"), "ORG")])
+
+    def test_unir_emendas_descarta_rotulo_diferente(self):
+        self.assertEqual(
+            _unir_emendas([(0, 5, "ORG"), (3, 9, "ORG"), (8, 12, "PER"), (20, 25, "LOC")]),
+            [(0, 9, "ORG"), (20, 25, "LOC")],
+        )
+
+
+class EntidadesIndexadasTests(TestCase):
+    def setUp(self):
+        pasta_media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta_media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=pasta_media, EXTRACAO_ASSINCRONA=False)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+
+    def enviar(self, nome, texto):
+        arquivo = SimpleUploadedFile(nome, gerar_docx(texto))
+        self.client.post(reverse('extractor:upload_documento'), {'arquivo_original': arquivo})
+        return Documento.objects.get(titulo__endswith=nome)
+
+    def test_normalizacao(self):
+        self.assertEqual(normalizar_entidade("12.345.678/0001-90"), "12345678000190")
+        self.assertEqual(normalizar_entidade("  São   PAULO "), "sao paulo")
+
+    def test_posicoes_apontam_para_o_texto(self):
+        for entidade in processar_documento_com_spacy(CONTRATO_EXEMPLO):
+            self.assertEqual(CONTRATO_EXEMPLO[entidade['inicio']:entidade['fim']], entidade['texto'])
+
+    def test_extracao_preenche_a_tabela(self):
+        documento = self.enviar("contrato.docx", CONTRATO_EXEMPLO)
+        linhas = {(e.tipo, e.texto) for e in documento.entidades.all()}
+        self.assertEqual(linhas, {(e['tipo'], e['texto']) for e in documento.entidades_extraidas})
+        cnpj = documento.entidades.get(tipo="Documento (CNPJ)")
+        self.assertEqual(cnpj.texto_normalizado, "12345678000190")
+        self.assertEqual(documento.texto_do_documento[cnpj.inicio:cnpj.fim], "12.345.678/0001-90")
+
+    def test_busca_por_cnpj_e_por_parte(self):
+        primeiro = self.enviar("a.docx", CONTRATO_EXEMPLO)
+        self.enviar("b.docx", CONTRATO_EXEMPLO.replace("12.345.678/0001-90", "98.765.432/0001-10"))
+
+        resposta = self.client.get(reverse('extractor:buscar_entidades'), {'q': "12345678000190"})
+        self.assertEqual([item['documento'] for item in resposta.context['resultados']], [primeiro])
+
+        resposta = self.client.get(reverse('extractor:buscar_entidades'),
+                                   {'q': "acme ltda", 'tipo': "Parte (Organização)"})
+        self.assertEqual(len(resposta.context['resultados']), 2)
+
+    def test_comando_preenche_documentos_antigos(self):
+        documento = Documento.objects.create(
+            titulo="antigo.docx", arquivo_original="documentos/antigo.docx", versao_pipeline='2',
+            entidades_extraidas=[{'texto': "Acme Ltda", 'tipo': "Parte (Organização)"}],
+        )
+        call_command('indexar_entidades', '--faltantes', stdout=io.StringIO())
+        entidade = EntidadeExtraida.objects.get(documento=documento)
+        self.assertEqual((entidade.texto_normalizado, entidade.inicio), ("acme ltda", None))
+
+        # Rodar de novo não duplica
+        call_command('indexar_entidades', stdout=io.StringIO())
+        self.assertEqual(EntidadeExtraida.objects.filter(documento=documento).count(), 1)
+
+
+class UploadLoteTests(TestCase):
+    def setUp(self):
+        pasta_media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta_media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=pasta_media, EXTRACAO_LOTE_PROCESSOS=1)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_PADRAO, montar_pipeline())
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+        self.addCleanup(redefinir_pool)
+
+    def gerar_zip(self, arquivos):
+        conteudo = io.BytesIO()
+        with zipfile.ZipFile(conteudo, "w") as arquivo_zip:
+            for nome, dados in arquivos.items():
+                arquivo_zip.writestr(nome, dados)
+        return conteudo.getvalue()
+
+    def enviar(self, *arquivos, **dados):
+        return self.client.post(reverse('extractor:upload_lote'), {'arquivos': list(arquivos), **dados})
+
+    def test_arquivos_e_zip_no_mesmo_lote(self):
+        # O .docx guarda a hora em que foi gerado: as cópias usam os mesmos bytes
+        contrato = gerar_docx(CONTRATO_EXEMPLO)
+        outro = gerar_docx(CONTRATO_EXEMPLO.replace("Maria Souza", "Acme Ltda"))
+        resposta = self.enviar(
+            SimpleUploadedFile("a.docx", contrato),
+            SimpleUploadedFile("lote.zip", self.gerar_zip({
+                "b.docx": outro, "copia.docx": contrato, "leia-me.txt": b"x",
+            })),
+        )
+
+        resumo = resposta.context['resumo']
+        situacoes = {arquivo['nome']: arquivo['status'] for arquivo in resumo['arquivos']}
+        self.assertEqual(situacoes, {"a.docx": 'processado', "lote.zip/b.docx": 'processado',
+                                     "lote.zip/copia.docx": 'existente'})
+        self.assertEqual(Documento.objects.count(), 2)
+        documento = Documento.objects.get(entidades_extraidas__isnull=False, titulo__endswith="a.docx")
+        self.assertIn("Parte (Pessoa)", {e.tipo for e in documento.entidades.all()})
+
+        # Reenviar o lote não reprocessa nada
+        resposta = self.enviar(SimpleUploadedFile("a.docx", contrato))
+        self.assertEqual(resposta.context['resumo']['arquivos'][0]['status'], 'existente')
+        self.assertEqual(Documento.objects.count(), 2)
+
+    def test_arquivo_ilegivel_aparece_com_erro(self):
+        resposta = self.enviar(SimpleUploadedFile("vazio.docx", b"nao e um docx"))
+        arquivo, = resposta.context['resumo']['arquivos']
+        self.assertEqual(arquivo['status'], 'erro')
+        self.assertFalse(Documento.objects.exists())
+
+    def test_limite_de_arquivos(self):
+        arquivos = [SimpleUploadedFile(f"{i}.docx", b"x") for i in range(3)]
+        with self.assertRaises(ValueError):
+            listar_arquivos_enviados(arquivos, max_arquivos=2)
+        resposta = self.enviar(SimpleUploadedFile("contrato.txt", b"x"))
+        self.assertFormError(resposta.context['form'], 'arquivos', "contrato.txt: envie arquivos .pdf, .docx ou .zip.")
+
+    def test_pool_de_processos(self):
+        # Os workers herdam (fork) o pipeline de teste e não acessam o banco
+        arquivos = [SimpleUploadedFile(f"{i}.docx", gerar_docx(CONTRATO_EXEMPLO + f"Cláusula {i}\n"))
+                    for i in range(4)]
+        with override_settings(EXTRACAO_LOTE_PROCESSOS=2), \
+                mock.patch.object(lote.connections, "close_all", wraps=lote.connections.close_all) as fechar:
+            resposta = self.enviar(*arquivos)
+        # As conexões da requisição são fechadas antes do fork
+        fechar.assert_called_once_with()
+        resumo = resposta.context['resumo']
+        self.assertEqual(resumo['processos'], 2)
+        self.assertEqual(resumo['contagem']['processado'], 4)
+        self.assertEqual(EntidadeExtraida.objects.filter(tipo="Documento (CNPJ)").count(), 4)
+
+    def test_pool_e_reaproveitado_entre_lotes(self):
+        with override_settings(EXTRACAO_LOTE_PROCESSOS=3):
+            pool = obter_pool()
+            with mock.patch.object(type(pool), "terminate") as terminate:
+                for quantidade in (1, 2):
+                    arquivos = [SimpleUploadedFile(f"{quantidade}-{i}.docx",
+                                                   gerar_docx(CONTRATO_EXEMPLO + f"Lote {quantidade} {i}\n"))
+                                for i in range(quantidade)]
+                    resposta = self.enviar(*arquivos)
+                    self.assertEqual(resposta.context['resumo']['processos'], quantidade)
+                    self.assertIs(obter_pool(), pool)
+            terminate.assert_not_called()
+
+
+class EntidadesAgrupadasTests(TestCase):
+    ENTIDADES = [
+        {'texto': "Acme Ltda", 'tipo': "Organização"},
+        {'texto': "Maria Souza", 'tipo': "Pessoa"},
+        {'texto': "Acme Ltda", 'tipo': "Organização"},
+        {'texto': "Tech Brasil", 'tipo': "Organização"},
+    ]
+
+    def test_agrupa_sem_repetir_e_conta_ocorrencias(self):
+        self.assertEqual(agrupar_entidades(self.ENTIDADES), {
+            "Organização": {'textos': ["Acme Ltda", "Tech Brasil"], 'total': 3},
+            "Pessoa": {'textos': ["Maria Souza"], 'total': 1},
+        })
+        self.assertEqual(agrupar_entidades(None), {})
+
+    def test_pagina_usa_o_agrupamento_salvo(self):
+        documento = Documento.objects.create(
+            titulo="a.docx", arquivo_original="documentos/a.docx", entidades_extraidas=self.ENTIDADES,
+            entidades_agrupadas={"Pessoa": {'textos': ["Maria Souza"], 'total': 1}},
+        )
+        with mock.patch("extractor.views.agrupar_entidades") as agrupar:
+            resposta = self.client.get(reverse('extractor:resultado_extracao', args=[documento.id]))
+        agrupar.assert_not_called()
+        self.assertContains(resposta, "Pessoa (1)")
+
+    def test_migracao_preenche_documentos_antigos(self):
+        antigo = Documento.objects.create(
+            titulo="a.docx", arquivo_original="documentos/a.docx", entidades_extraidas=self.ENTIDADES,
+        )
+        migracao = importlib.import_module("extractor.migrations.0004_documento_entidades_agrupadas")
+        migracao.preencher_entidades_agrupadas(apps, None)
+        antigo.refresh_from_db()
+        self.assertEqual(antigo.entidades_agrupadas, agrupar_entidades(self.ENTIDADES))
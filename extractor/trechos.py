@@ -0,0 +1,125 @@
+# Em extractor/trechos.py
+
+from bisect import bisect_left
+
+# Onde cortar o texto, do melhor para o pior: quebra de página, parágrafo, linha, espaço
+SEPARADORES = ('\f', '\n\n', '\n', ' ')
+
+
+def dividir_em_trechos(texto, tamanho, sobreposicao):
+    """
+    Divide o texto em trechos (inicio, fim) de até `tamanho` caracteres,
+    cortando de preferência em quebras de página ou parágrafo. Cada trecho
+    começa até `sobreposicao` caracteres antes do fim do anterior (no início
+    de uma linha), para que entidades e padrões na emenda apareçam inteiros
+    em pelo menos um dos dois.
+    """
+    if tamanho <= 0 or len(texto) <= tamanho:
+        yield 0, len(texto)
+        return
+    sobreposicao = min(sobreposicao, tamanho // 4)
+
+    inicio = 0
+    while True:
+        fim = min(len(texto), inicio + tamanho)
+        if fim < len(texto):
+            fim = _ponto_de_corte(texto, inicio + tamanho // 2, fim)
+        yield inicio, fim
+        if fim >= len(texto):
+            return
+
+        proximo = fim - sobreposicao
+        for separador in ('\n', ' '):
+            posicao = texto.find(separador, proximo, fim)
+            if posicao != -1:
+                proximo = posicao + 1
+                break
+        inicio = max(proximo, inicio + 1)
+
+
+def _ponto_de_corte(texto, minimo, maximo):
+    for separador in SEPARADORES:
+        posicao = texto.rfind(separador, minimo, maximo)
+        if posicao != -1:
+            return posicao + len(separador)
+    return maximo
+
+
+def analisar_em_trechos(nlp, texto, intervalos, tamanho, sobreposicao, tamanho_lote=2):
+    """
+    Roda o modelo sobre o texto (uma vez só, ou em trechos com nlp.pipe se ele
+    passar de `tamanho` caracteres) e retorna:
+
+    - o conjunto dos `intervalos` (inicio, fim) pedidos que caem em limites
+      de token, como doc.char_span(inicio, fim) is not None;
+    - as entidades [(inicio, fim, rótulo)] em posições do texto inteiro.
+
+    Cada Doc é descartado assim que processado, então a memória do modelo
+    fica limitada ao lote de trechos, qualquer que seja o tamanho do texto.
+    Nas emendas, cada entidade fica com o trecho "dono" da sua posição (o
+    limite é o meio da sobreposição), mais as que passam do fim do trecho
+    anterior; entidades do mesmo rótulo que se cruzam são unidas.
+    """
+    trechos = list(dividir_em_trechos(texto, tamanho, sobreposicao))
+    if len(trechos) == 1:
+        docs = [(nlp(texto), 0)]
+    else:
+        docs = nlp.pipe(
+            ((texto[inicio:fim], k) for k, (inicio, fim) in enumerate(trechos)),
+            as_tuples=True, batch_size=tamanho_lote,
+        )
+
+    pedidos = sorted(set(intervalos))
+    inicios_pedidos = [inicio for inicio, _ in pedidos]
+    verificados = set()
+    alinhados = set()
+    entidades = []
+
+    for doc, k in docs:
+        inicio, fim = trechos[k]
+        esquerda = 0 if k == 0 else (inicio + trechos[k - 1][1]) // 2
+        direita = len(texto) if k == len(trechos) - 1 else (trechos[k + 1][0] + fim) // 2
+
+        # Intervalos pedidos inteiramente dentro deste trecho
+        primeiro, ultimo = bisect_left(inicios_pedidos, inicio), bisect_left(inicios_pedidos, fim)
+        for a, b in pedidos[primeiro:ultimo]:
+            if b <= fim and (a, b) not in verificados:
+                verificados.add((a, b))
+                if doc.char_span(a - inicio, b - inicio) is not None:
+                    alinhados.add((a, b))
+
+        fim_anterior = trechos[k - 1][1] if k else 0
+        for entidade in doc.ents:
+            a, b = entidade.start_char + inicio, entidade.end_char + inicio
+            # Também fica com as que o trecho anterior não via inteiras
+            if esquerda <= a < direita or (a < esquerda and b > fim_anterior):
+                entidades.append((a, b, entidade.label_))
+
+    return alinhados, _unir_emendas(sorted(entidades))
+
+
+def _unir_emendas(entidades):
+    # Entidades (ordenadas) que se cruzam só podem vir de trechos diferentes
+    unidas = []
+    for inicio, fim, rotulo in entidades:
+        if unidas and inicio < unidas[-1][1]:
+            anterior = unidas[-1]
+            if rotulo == anterior[2]:
+                unidas[-1] = (anterior[0], max(anterior[1], fim), rotulo)
+            continue
+        unidas.append((inicio, fim, rotulo))
+    return unidas
+
+
+def entidades_dentro(entidades, inicio, fim):
+    """
+    Entidades (ordenadas) inteiramente dentro de [inicio, fim), como span.ents.
+    """
+    encontradas = []
+    for i in range(bisect_left(entidades, (inicio,)), len(entidades)):
+        a, b, rotulo = entidades[i]
+        if a >= fim:
+            break
+        if b <= fim:
+            encontradas.append((a, b, rotulo))
+    return encontradas
@@ -5,7 +5,9 @@ app_name = 'extractor'
 
 urlpatterns = [
     path('', views.upload_documento, name='upload_documento'),
+    path('lote/', views.upload_lote, name='upload_lote'),
     path('resultado/<int:documento_id>/', views.resultado_extracao, name='resultado_extracao'),
     path('historico/', views.historico_documentos, name='historico_documentos'),
+    path('busca/', views.buscar_entidades, name='buscar_entidades'),
     path('documento/<int:documento_id>/delete/', views.delete_documento, name='delete_documento'), # NOVA LINHA
 ]
\ No newline at end of file
@@ -1,21 +1,42 @@
-import spacy
 import re # Importação necessária para expressões regulares
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from .forms import DocumentoForm
-from .models import Documento
-from core.views import extrair_texto_de_arquivo
-from spacy.matcher import Matcher
+from .forms import DocumentoForm, LoteDocumentosForm
+from .entidades import agrupar_entidades, indexar_entidades, normalizar_entidade
+from .models import Documento, EntidadeExtraida
+from .intervalos import IntervalosOcupados
+from .lote import listar_arquivos_enviados, processar_lote
+from .trechos import analisar_em_trechos, entidades_dentro
+from core.arquivos import calcular_hash_conteudo, extrair_texto_de_arquivo
+from core.fila import enfileirar, extracao_em_andamento, tarefa_mais_recente
+from core.models import TarefaExtracao
 from django.contrib import messages
+from config.nlp import obter_nlp
 
-# Carrega o modelo do spaCy
-nlp = spacy.load("pt_core_news_sm")
+# Versão da extração gravada em cada documento. Aumente ao mudar o pipeline:
+# reenvios de arquivos analisados em uma versão anterior são reprocessados.
+VERSAO_PIPELINE = '3'
 
 # Em extractor/views.py
 
+def intervalo_do_grupo(match, grupo=1):
+    """
+    Posições (inicio, fim) do grupo do match, sem os espaços das pontas. Usa
+    as posições do próprio match (o mesmo texto pode aparecer antes no
+    documento). Retorna None se o grupo estiver vazio.
+    """
+    inicio, fim = match.span(grupo)
+    trecho = match.group(grupo)
+    inicio += len(trecho) - len(trecho.lstrip())
+    fim -= len(trecho) - len(trecho.rstrip())
+    if inicio >= fim:
+        return None
+    return inicio, fim
+
 def processar_documento_com_spacy(texto):
-    doc = nlp(texto)
+    nlp = obter_nlp('contratos')
     entidades = []
-    spans_ocupados = []
+    spans_ocupados = IntervalosOcupados()
 
     stop_list = {
         "contratante", "contratada", "cláusula", "cláusulas", "cláusula primeira", 
@@ -24,96 +45,153 @@ def processar_documento_com_spacy(texto):
         "partes", "instrumento", "presente", "brasileiro", "brasileira", "brasileiro(a)"
     }
 
-    def adicionar_entidade(span, tipo, is_ner=False):
-        # Evita sobreposição e duplicatas
-        for inicio, fim in spans_ocupados:
-            if span.start_char >= inicio and span.end_char <= fim: return
-            if span.start_char < fim and span.end_char > inicio: return
+    def adicionar_entidade(inicio, fim, tipo, is_ner=False):
+        # Evita sobreposição e duplicatas (a camada anterior tem precedência)
+        if spans_ocupados.sobrepoe(inicio, fim): return
         
-        texto_limpo = span.text.strip(" .,:;-")
+        trecho = texto[inicio:fim]
+        texto_limpo = trecho.strip(" .,:;-")
         if is_ner and texto_limpo.lower() in stop_list: return
         if len(texto_limpo) < 2 or texto_limpo in ".,:;": return
 
-        entidades.append({'texto': texto_limpo, 'tipo': tipo})
-        spans_ocupados.append((span.start_char, span.end_char))
+        # Posições do texto limpo no documento
+        inicio_limpo = inicio + len(trecho) - len(trecho.lstrip(" .,:;-"))
+        entidades.append({
+            'texto': texto_limpo, 'tipo': tipo,
+            'inicio': inicio_limpo, 'fim': inicio_limpo + len(texto_limpo),
+        })
+        spans_ocupados.adicionar(inicio, fim)
+
+    # Trechos localizados por regex, que só valem se caírem em limites de token
+    cnpjs = [m.span() for m in re.finditer(r"\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}", texto)]
+    cpfs = [m.span() for m in re.finditer(r"\d{3}\.\d{3}\.\d{3}-\d{2}", texto)]
+    valores = [m.span() for m in re.finditer(r"R\$\s?[\d\.,]+", texto)]
+
+    match_objeto = re.search(r'^\s*objeto.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
+    objeto = intervalo_do_grupo(match_objeto) if match_objeto else None
+
+    partes = {}
+    for parte_keyword in ['contratante', 'contratada']:
+        match_parte = re.search(rf'^\s*{parte_keyword}.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
+        if match_parte:
+            partes[parte_keyword] = intervalo_do_grupo(match_parte)
+
+    # O modelo roda uma única vez: no texto inteiro ou, em documentos muito
+    # grandes, em trechos com nlp.pipe (memória limitada)
+    pedidos = cnpjs + cpfs + valores + [i for i in [objeto, *partes.values()] if i]
+    alinhados, entidades_ner = analisar_em_trechos(
+        nlp, texto, pedidos,
+        settings.EXTRACAO_NER_TAMANHO_TRECHO, settings.EXTRACAO_NER_SOBREPOSICAO,
+    )
 
     # --- CAMADA 1: Regex para dados estruturados (CPF, CNPJ, Valor) ---
-    for match in re.finditer(r"\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}", doc.text):
-        span = doc.char_span(match.start(), match.end())
-        if span: adicionar_entidade(span, "Documento (CNPJ)")
-    for match in re.finditer(r"\d{3}\.\d{3}\.\d{3}-\d{2}", doc.text):
-        span = doc.char_span(match.start(), match.end())
-        if span: adicionar_entidade(span, "Documento (CPF)")
-    for match in re.finditer(r"R\$\s?[\d\.,]+", doc.text):
-        span = doc.char_span(match.start(), match.end())
-        if span: adicionar_entidade(span, "Valor Monetário")
+    for tipo, encontrados in [("Documento (CNPJ)", cnpjs), ("Documento (CPF)", cpfs), ("Valor Monetário", valores)]:
+        for intervalo in encontrados:
+            if intervalo in alinhados: adicionar_entidade(*intervalo, tipo)
 
     # --- CAMADA 2: EXTRAÇÃO DE CONTEXTO GARANTIDA (OBJETO E PARTES) ---
     
     # Extração robusta do OBJETO
-    match_objeto = re.search(r'^\s*objeto.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
-    if match_objeto:
-        texto_objeto = match_objeto.group(1).strip()
-        char_start = texto.find(texto_objeto)
-        if char_start != -1:
-            span = doc.char_span(char_start, char_start + len(texto_objeto))
-            if span: adicionar_entidade(span, "Objeto do Contrato")
+    if objeto in alinhados:
+        adicionar_entidade(*objeto, "Objeto do Contrato")
 
     # Extração GARANTIDA das PARTES com classificação posterior
-    for parte_keyword in ['contratante', 'contratada']:
-        match_parte = re.search(rf'^\s*{parte_keyword}.*:\s*(.*)', texto, re.IGNORECASE | re.MULTILINE)
-        if match_parte:
-            texto_parte = match_parte.group(1).strip()
-            if not texto_parte: continue
-
-            char_start = texto.find(texto_parte)
-            if char_start == -1: continue
-            span_parte = doc.char_span(char_start, char_start + len(texto_parte))
-
-            if span_parte:
-                doc_snippet = nlp(texto_parte)
-                tipo_final = None
-                
-                # Tenta classificar usando a IA no trecho isolado
-                if doc_snippet.ents:
-                    entidade_principal = doc_snippet.ents[0]
-                    if entidade_principal.label_ == 'ORG':
-                        tipo_final = "Parte (Organização)"
-                    elif entidade_principal.label_ == 'PER':
-                        tipo_final = "Parte (Pessoa)"
-                
-                # Se a IA falhou, usa um tipo genérico (NUNCA PERDE A INFORMAÇÃO)
-                if tipo_final is None:
-                    tipo_final = "Parte (Indefinido)"
-                
-                adicionar_entidade(span_parte, tipo_final)
+    for intervalo_parte in partes.values():
+        if intervalo_parte in alinhados:
+            tipo_final = None
+            
+            # Classifica com as entidades que o modelo já encontrou
+            # nesse trecho do documento (sem rodar o modelo de novo)
+            ents_parte = entidades_dentro(entidades_ner, *intervalo_parte)
+            if ents_parte:
+                rotulo_principal = ents_parte[0][2]
+                if rotulo_principal == 'ORG':
+                    tipo_final = "Parte (Organização)"
+                elif rotulo_principal == 'PER':
+                    tipo_final = "Parte (Pessoa)"
+            
+            # Se a IA falhou, usa um tipo genérico (NUNCA PERDE A INFORMAÇÃO)
+            if tipo_final is None:
+                tipo_final = "Parte (Indefinido)"
+            
+            adicionar_entidade(*intervalo_parte, tipo_final)
 
     # --- CAMADA 3: IA Genérica para capturar o que sobrou (locais, datas, etc.) ---
     labels_map = { "PER": "Pessoa", "LOC": "Local", "ORG": "Organização", "DATE": "Data" }
-    for entidade in doc.ents:
-        label = labels_map.get(entidade.label_)
+    for inicio, fim, rotulo in entidades_ner:
+        label = labels_map.get(rotulo)
         if label:
-            adicionar_entidade(entidade, label, is_ner=True)
+            adicionar_entidade(inicio, fim, label, is_ner=True)
             
     return entidades
 
+# --- EXTRAÇÃO (CHAMADA NA REQUISIÇÃO OU PELO WORKER DA FILA) ---
+def executar_extracao_documento(documento_id):
+    """
+    Processa o texto do documento e grava as entidades encontradas. O texto
+    normalmente já foi extraído no upload; só registros sem texto (antigos)
+    fazem o arquivo ser lido de volta do storage.
+    """
+    documento_obj = Documento.objects.get(pk=documento_id)
+
+    texto_extraido = documento_obj.texto_do_documento
+    if texto_extraido is None:
+        with documento_obj.arquivo_original.open('rb') as arquivo:
+            texto_extraido = extrair_texto_de_arquivo(arquivo)
+
+    entidades = processar_documento_com_spacy(texto_extraido)
+
+    documento_obj.titulo = documento_obj.arquivo_original.name
+    documento_obj.texto_do_documento = texto_extraido
+    documento_obj.entidades_extraidas = entidades
+    documento_obj.entidades_agrupadas = agrupar_entidades(entidades)
+    documento_obj.versao_pipeline = VERSAO_PIPELINE
+    documento_obj.save()
+    indexar_entidades(documento_obj, entidades)
+    return documento_obj
+
+def agendar_extracao_documento(documento_obj):
+    if settings.EXTRACAO_ASSINCRONA:
+        # O worker (manage.py run_extraction_worker) faz a extração
+        enfileirar(TarefaExtracao.TIPO_DOCUMENTO, documento_obj.id)
+    else:
+        executar_extracao_documento(documento_obj.id)
+
 # --- VIEW DE UPLOAD (ATUALIZADA) ---
 def upload_documento(request):
     if request.method == 'POST':
         form = DocumentoForm(request.POST, request.FILES)
         if form.is_valid():
-            documento_obj = form.save()
+            arquivo = form.cleaned_data['arquivo_original']
+            hash_conteudo = calcular_hash_conteudo(arquivo)
+            documento_obj = (
+                Documento.objects
+                .filter(hash_conteudo=hash_conteudo)
+                .order_by('-data_de_upload')
+                .first()
+            )
 
-            caminho_arquivo = documento_obj.arquivo_original.path
-            texto_extraido = extrair_texto_de_arquivo(caminho_arquivo)
+            if documento_obj is None:
+                # O texto sai do arquivo ainda em memória; o storage só recebe
+                # o upload e o worker não precisa baixá-lo de volta
+                documento_obj = form.save(commit=False)
+                documento_obj.titulo = documento_obj.arquivo_original.name
+                documento_obj.hash_conteudo = hash_conteudo
+                documento_obj.texto_do_documento = extrair_texto_de_arquivo(arquivo)
+                documento_obj.save()
+                agendar_extracao_documento(documento_obj)
+            elif extracao_em_andamento(TarefaExtracao.TIPO_DOCUMENTO, documento_obj.id):
+                # O mesmo arquivo já está na fila: basta acompanhar a extração
+                messages.info(request, "Este documento já está sendo analisado.")
+            elif form.cleaned_data['forcar_reextracao'] or documento_obj.versao_pipeline != VERSAO_PIPELINE:
+                # Reaproveita o arquivo já armazenado e refaz só a extração
+                documento_obj.texto_do_documento = extrair_texto_de_arquivo(arquivo)
+                documento_obj.save(update_fields=['texto_do_documento'])
+                agendar_extracao_documento(documento_obj)
+                messages.info(request, "Este documento já havia sido enviado e foi analisado novamente.")
+            else:
+                messages.info(request, "Este documento já havia sido analisado. Exibindo o resultado salvo.")
 
-            entidades = processar_documento_com_spacy(texto_extraido)
-
-            documento_obj.titulo = documento_obj.arquivo_original.name
-            documento_obj.texto_do_documento = texto_extraido
-            documento_obj.entidades_extraidas = entidades
-            documento_obj.save()
-            
             return redirect('extractor:resultado_extracao', documento_id=documento_obj.id)
     else:
         form = DocumentoForm()
@@ -121,26 +199,81 @@ def upload_documento(request):
     return render(request, 'extractor/upload_documento.html', {'form': form})
 
 
+# --- UPLOAD EM LOTE (VÁRIOS ARQUIVOS OU .ZIP) ---
+def upload_lote(request):
+    """
+    Extrai vários contratos de uma vez, em paralelo em um pool de processos
+    (settings.EXTRACAO_LOTE_PROCESSOS), e mostra o resumo do lote com a
+    situação e o tempo de cada arquivo. Não passa pela fila de extração.
+    """
+    if request.method == 'POST':
+        form = LoteDocumentosForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                itens = listar_arquivos_enviados(form.cleaned_data['arquivos'])
+            except ValueError as e:
+                form.add_error('arquivos', str(e))
+            else:
+                if not itens:
+                    form.add_error('arquivos', "Nenhum arquivo .pdf ou .docx encontrado.")
+                else:
+                    resumo = processar_lote(itens, forcar_reextracao=form.cleaned_data['forcar_reextracao'])
+                    return render(request, 'extractor/resultado_lote.html', {'resumo': resumo})
+    else:
+        form = LoteDocumentosForm()
+
+    return render(request, 'extractor/upload_lote.html', {'form': form})
+
+
 # --- VIEW DE RESULTADO (ATUALIZADA) ---
 def resultado_extracao(request, documento_id):
     documento = get_object_or_404(Documento, pk=documento_id)
-    
-    entidades_agrupadas = {}
-    if documento.entidades_extraidas:
-        for entidade in documento.entidades_extraidas:
-            tipo = entidade.get('tipo', 'Outros')
-            texto = entidade.get('texto')
-            if tipo not in entidades_agrupadas:
-                entidades_agrupadas[tipo] = []
-            if texto not in entidades_agrupadas[tipo]:
-                entidades_agrupadas[tipo].append(texto)
+
+    # Agrupadas na extração; só documentos sem o campo preenchido são agrupados aqui
+    entidades_agrupadas = documento.entidades_agrupadas
+    if entidades_agrupadas is None:
+        entidades_agrupadas = agrupar_entidades(documento.entidades_extraidas)
 
     contexto = {
         'documento': documento,
-        'entidades_agrupadas': entidades_agrupadas
+        'entidades_agrupadas': entidades_agrupadas,
+        'tarefa': tarefa_mais_recente(TarefaExtracao.TIPO_DOCUMENTO, documento.id),
     }
     return render(request, 'extractor/resultado_extracao.html', contexto)
 
+# --- BUSCA DE ENTIDADES ENTRE DOCUMENTOS ---
+def buscar_entidades(request):
+    """
+    Documentos que citam a entidade buscada (texto exato, sem diferenciar
+    acentos e maiúsculas; CPF/CNPJ com ou sem pontuação), opcionalmente de
+    um tipo. Consulta a tabela EntidadeExtraida pelo índice.
+    """
+    consulta = request.GET.get('q', '').strip()
+    tipo = request.GET.get('tipo', '').strip()
+
+    resultados = []
+    if consulta:
+        entidades = EntidadeExtraida.objects.filter(texto_normalizado=normalizar_entidade(consulta))
+        if tipo:
+            entidades = entidades.filter(tipo=tipo)
+        encontradas = {}
+        for entidade in entidades.select_related('documento').order_by('-documento__data_de_upload', 'inicio'):
+            item = encontradas.setdefault(entidade.documento_id, {
+                'documento': entidade.documento, 'tipos': [], 'ocorrencias': 0,
+            })
+            item['ocorrencias'] += 1
+            if entidade.tipo not in item['tipos']:
+                item['tipos'].append(entidade.tipo)
+        resultados = list(encontradas.values())
+
+    contexto = {
+        'consulta': consulta,
+        'tipo': tipo,
+        'tipos': EntidadeExtraida.objects.order_by('tipo').values_list('tipo', flat=True).distinct(),
+        'resultados': resultados,
+    }
+    return render(request, 'extractor/busca_entidades.html', contexto)
+
 def historico_documentos(request):
     # CORREÇÃO AQUI: de 'data_upload' para 'data_de_upload'
     documentos = Documento.objects.all().order_by('-data_de_upload')
@@ -0,0 +1,15 @@
+# gunicorn.conf.py
+# Carrega a aplicação (e os modelos de settings.NLP_PRECARREGAR) no processo
+# mestre antes do fork, para que os workers compartilhem essas páginas de
+# memória em copy-on-write.
+import os
+
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# O upload em lote de contratos (EXTRACAO_LOTE_PROCESSOS, padrão 1) cria um
+# pool em cada worker, e cada processo do pool carrega o seu modelo: são
+# workers × EXTRACAO_LOTE_PROCESSOS cópias do modelo além das dos workers.
+# Para usar o pool, reduza os workers de modo que o produto caiba nos núcleos
+# e na memória (por exemplo WEB_CONCURRENCY=2 e EXTRACAO_LOTE_PROCESSOS=2
+# numa máquina de 4 núcleos).
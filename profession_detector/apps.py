@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ProfessionDetectorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'profession_detector'
+
+    def ready(self):
+        from config.nlp import registrar_preparacao
+        from .services import preparar_indice
+
+        # Com o detector em NLP_PRECARREGAR, o índice de profissões fica
+        # pronto no processo mestre, antes do fork dos workers
+        registrar_preparacao('detector', preparar_indice)
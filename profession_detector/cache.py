@@ -0,0 +1,136 @@
+# profession_detector/cache.py
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def normalizar_texto(texto):
+    """
+    Forma canônica usada como chave: Unicode NFC, minúsculas e espaços
+    colapsados. O detector pontua o texto já normalizado, então textos que
+    só diferem nisso recebem exatamente o mesmo resultado.
+    """
+    return " ".join(unicodedata.normalize("NFC", texto).lower().split())
+
+
+class CacheSugestoes:
+    """
+    Cache LRU em memória dos resultados do detector, com contadores de
+    acertos e falhas. As chaves levam a versão do índice (modelo + hash da
+    taxonomia), então mudar PROFESSION_KEYWORDS invalida tudo; ao perceber
+    uma versão nova, as entradas da anterior são descartadas.
+
+    Com `alias` (um dos settings.CACHES), os resultados também são gravados
+    no cache do Django e compartilhados entre processos.
+    """
+
+    def __init__(self, tamanho_maximo=1024, alias=None):
+        self.tamanho_maximo = tamanho_maximo
+        self.alias = alias
+        self.acertos = 0
+        self.falhas = 0
+        self._dados = OrderedDict()
+        self._versao = None
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self):
+        return self.tamanho_maximo > 0
+
+    def _chave_compartilhada(self, versao, texto):
+        resumo = hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+        return f"detector:{versao}:{resumo}"
+
+    def obter(self, versao, texto):
+        """
+        Resultado guardado para o texto normalizado, ou None.
+        """
+        if not self.ativo:
+            return None
+        with self._lock:
+            if versao != self._versao:
+                self._dados.clear()
+                self._versao = versao
+            resultado = self._dados.get(texto)
+            if resultado is not None:
+                self._dados.move_to_end(texto)
+                self.acertos += 1
+                return resultado
+
+        if self.alias:
+            resultado = caches[self.alias].get(self._chave_compartilhada(versao, texto))
+            if resultado is not None:
+                self._guardar_local(versao, texto, resultado)
+                with self._lock:
+                    self.acertos += 1
+                return resultado
+
+        with self._lock:
+            self.falhas += 1
+        return None
+
+    def definir(self, versao, texto, resultado):
+        if not self.ativo:
+            return
+        self._guardar_local(versao, texto, resultado)
+        if self.alias:
+            caches[self.alias].set(self._chave_compartilhada(versao, texto), resultado)
+
+    def _guardar_local(self, versao, texto, resultado):
+        with self._lock:
+            if versao != self._versao:
+                self._dados.clear()
+                self._versao = versao
+            self._dados[texto] = resultado
+            self._dados.move_to_end(texto)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'tamanho': len(self._dados),
+                'tamanho_maximo': self.tamanho_maximo,
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+            self._versao = None
+            self.acertos = 0
+            self.falhas = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_sugestoes():
+    """
+    Cache do processo, criado com settings.DETECTOR_CACHE_SUGESTOES (tamanho;
+    0 desativa) e settings.DETECTOR_CACHE_SUGESTOES_ALIAS.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheSugestoes(
+                    getattr(settings, 'DETECTOR_CACHE_SUGESTOES', 1024),
+                    getattr(settings, 'DETECTOR_CACHE_SUGESTOES_ALIAS', '') or None,
+                )
+    return _cache
+
+
+def redefinir_cache_sugestoes():
+    """
+    Descarta o cache do processo; o próximo acesso lê as configurações de novo.
+    """
+    global _cache
+    with _cache_lock:
+        _cache = None
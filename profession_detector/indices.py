@@ -0,0 +1,413 @@
+# profession_detector/indices.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+
+import numpy as np
+import srsly
+from django.conf import settings
+
+# Aumente ao mudar o formato salvo em disco
+VERSAO_FORMATO = 3
+
+
+def _vetores_normalizados(nlp, textos):
+    """
+    Executa o modelo uma vez por texto e retorna {texto: vetor normalizado},
+    deixando de fora os textos sem vetor (ou com vetor nulo).
+    """
+    vetores = {}
+    for texto, doc in zip(textos, nlp.pipe(textos)):
+        if doc.has_vector and doc.vector_norm:
+            vetores[texto] = doc.vector / doc.vector_norm
+    return vetores
+
+
+def _matriz(vetores):
+    return np.array(list(vetores), dtype='float32') if vetores else np.zeros((0, 0), dtype='float32')
+
+
+class MatrizPalavrasChave:
+    """
+    Vetores de todas as palavras-chave da taxonomia, calculados uma única vez
+    e normalizados numa matriz (uma linha por palavra-chave). A similaridade
+    de cosseno dos tokens do usuário com todas as palavras-chave sai de um
+    único produto de matrizes, reduzido ao máximo por profissão.
+    """
+
+    def __init__(self, matriz, colunas, inicios, coluna_da_profissao):
+        self.matriz = matriz
+        self._colunas = colunas
+        self._inicios = inicios
+        self._fins = np.append(inicios[1:], len(colunas)).astype(np.intp)
+        self.coluna_da_profissao = coluna_da_profissao
+
+    @classmethod
+    def construir(cls, nlp, profissoes, vetores=None):
+        if vetores is None:
+            palavras = sorted({palavra for chaves in profissoes.values() for palavra in chaves})
+            vetores = _vetores_normalizados(nlp, palavras)
+
+        # Colunas da matriz agrupadas por profissão; uma palavra-chave presente
+        # em várias profissões aparece uma vez em cada grupo
+        linhas = {palavra: i for i, palavra in enumerate(vetores)}
+        colunas, inicios = [], []
+        coluna_da_profissao = {}
+        for profissao, chaves in profissoes.items():
+            grupo = [linhas[palavra] for palavra in chaves if palavra in linhas]
+            if not grupo:
+                continue
+            coluna_da_profissao[profissao] = len(inicios)
+            inicios.append(len(colunas))
+            colunas.extend(grupo)
+
+        return cls(
+            _matriz(vetores.values()),
+            np.array(colunas, dtype=np.intp),
+            np.array(inicios, dtype=np.intp),
+            coluna_da_profissao,
+        )
+
+    def similaridades(self, tokens, profissoes=None):
+        """
+        Retorna uma matriz (tokens x profissões) com a maior similaridade de
+        cada token com as palavras-chave de cada profissão, nunca abaixo de 0.
+        As colunas seguem a ordem de `profissoes` (por padrão, a ordem de
+        coluna_da_profissao); só as palavras-chave delas entram no cálculo.
+        """
+        if profissoes is None:
+            profissoes = list(self.coluna_da_profissao)
+        resultado = np.zeros((len(tokens), len(profissoes)), dtype='float32')
+        grupos = [
+            (j, self.coluna_da_profissao[profissao])
+            for j, profissao in enumerate(profissoes) if profissao in self.coluna_da_profissao
+        ]
+        if not tokens or not grupos:
+            return resultado
+
+        vetores = np.array([token.vector for token in tokens], dtype='float32')
+        normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+        vetores = np.divide(vetores, normas, out=np.zeros_like(vetores), where=normas > 0)
+
+        destinos = [j for j, _ in grupos]
+        fatias = [self._colunas[self._inicios[g]:self._fins[g]] for _, g in grupos]
+        inicios = np.cumsum([0] + [len(fatia) for fatia in fatias[:-1]])
+
+        cossenos = vetores @ self.matriz[np.concatenate(fatias)].T
+        maximos = np.maximum.reduceat(cossenos, inicios, axis=1)
+        resultado[:, destinos] = np.maximum(maximos, 0)
+        return resultado
+
+    def para_dados(self):
+        return {
+            'matriz': self.matriz,
+            'colunas': self._colunas,
+            'inicios': self._inicios,
+            'coluna_da_profissao': self.coluna_da_profissao,
+        }
+
+    @classmethod
+    def de_dados(cls, dados):
+        return cls(dados['matriz'], dados['colunas'], dados['inicios'], dados['coluna_da_profissao'])
+
+
+class IndiceInvertido:
+    """
+    Índice invertido palavra-chave -> profissões, montado uma vez a partir da
+    taxonomia. Permite achar as profissões que compartilham algum termo com o
+    texto sem percorrer todas as palavras-chave de todas as profissões.
+    """
+
+    def __init__(self, profissoes_por_termo):
+        self.profissoes_por_termo = profissoes_por_termo
+        self.maior_termo = max(map(len, profissoes_por_termo), default=0)
+
+    @classmethod
+    def construir(cls, profissoes):
+        profissoes_por_termo = {}
+        for profissao, chaves in profissoes.items():
+            for chave in chaves:
+                profissoes_por_termo.setdefault(chave, []).append(profissao)
+        return cls(profissoes_por_termo)
+
+    def profissoes_do_termo(self, termo):
+        return self.profissoes_por_termo.get(termo, ())
+
+    def profissoes_contidas(self, texto):
+        """
+        Profissões com alguma palavra-chave contida em `texto` (o mesmo que
+        `keyword in texto` para cada palavra-chave). Só consulta os trechos
+        do texto que cabem na maior palavra-chave.
+        """
+        encontradas = set()
+        for inicio in range(len(texto)):
+            for fim in range(inicio + 1, min(len(texto), inicio + self.maior_termo) + 1):
+                encontradas.update(self.profissoes_por_termo.get(texto[inicio:fim], ()))
+        return encontradas
+
+
+class IndiceIVF:
+    """
+    Busca aproximada de vizinhos (IVF) sobre vetores normalizados: um k-means
+    esférico divide os vetores em grupos e a consulta só é comparada com os
+    vetores dos `sondas` grupos mais próximos. Mais sondas aumentam a
+    revocação e o custo; com todas as sondas a busca é exata. Os vetores
+    ficam copiados na ordem dos grupos, para que cada grupo seja uma fatia
+    contígua da matriz.
+    """
+
+    def __init__(self, grupos, ordem, inicios, vetores):
+        self.grupos = grupos
+        self.ordem = ordem
+        self.inicios = inicios
+        self.vetores = vetores
+
+    @classmethod
+    def construir(cls, vetores, n_grupos=None, iteracoes=10, semente=0):
+        n = len(vetores)
+        if n == 0:
+            return cls(np.zeros((0, vetores.shape[1]), dtype='float32'),
+                       np.zeros(0, dtype='int64'), np.zeros(1, dtype='int64'), vetores)
+        # Padrão: raiz do número de vetores, para grupos de tamanho parecido com o número de grupos
+        k = min(n, n_grupos or max(1, round(np.sqrt(n))))
+        gerador = np.random.default_rng(semente)
+        grupos = vetores[gerador.choice(n, k, replace=False)].copy()
+        for _ in range(iteracoes):
+            atribuicao = np.argmax(vetores @ grupos.T, axis=1)
+            somas = np.zeros_like(grupos)
+            np.add.at(somas, atribuicao, vetores)
+            normas = np.linalg.norm(somas, axis=1)
+            # Grupos que ficaram vazios mantêm o centro anterior
+            ocupados = normas > 0
+            grupos[ocupados] = somas[ocupados] / normas[ocupados, None]
+        atribuicao = np.argmax(vetores @ grupos.T, axis=1)
+
+        ordem = np.argsort(atribuicao, kind='stable')
+        inicios = np.concatenate([[0], np.cumsum(np.bincount(atribuicao, minlength=k))])
+        return cls(grupos.astype('float32'), ordem.astype('int64'), inicios.astype('int64'),
+                   np.ascontiguousarray(vetores[ordem], dtype='float32'))
+
+    def buscar(self, consulta, limite, sondas):
+        """
+        Linhas (na ordem dos vetores da construção) mais parecidas com a
+        consulta normalizada. Percorre pelo menos `sondas` grupos, e mais se
+        eles não somarem `limite` vetores.
+        """
+        if limite <= 0 or not len(self.ordem):
+            return np.zeros(0, dtype='int64')
+        proximidade = np.argsort(-(self.grupos @ consulta))
+        tamanhos = np.diff(self.inicios)[proximidade]
+        necessarios = int(np.searchsorted(np.cumsum(tamanhos), limite)) + 1
+        fatias = [(self.inicios[g], self.inicios[g + 1]) for g in proximidade[:max(sondas, necessarios)]]
+        posicoes = np.concatenate([np.arange(inicio, fim) for inicio, fim in fatias])
+        if limite < len(posicoes):
+            similaridades = np.concatenate([self.vetores[inicio:fim] @ consulta for inicio, fim in fatias])
+            posicoes = posicoes[np.argpartition(-similaridades, limite - 1)[:limite]]
+        return self.ordem[posicoes]
+
+    def para_dados(self):
+        # Os vetores não são salvos: saem dos centroides do índice na leitura
+        return {'grupos': self.grupos, 'ordem': self.ordem, 'inicios': self.inicios}
+
+    @classmethod
+    def de_dados(cls, dados, vetores):
+        ordem = dados['ordem']
+        return cls(dados['grupos'], ordem, dados['inicios'], np.ascontiguousarray(vetores[ordem], dtype='float32'))
+
+
+class IndiceProfissoes:
+    """
+    Tudo o que o detector precisa da taxonomia já calculado para um modelo:
+    a matriz de palavras-chave, o vetor de cada descrição em PROFESSION_DESCRIPTIONS
+    e um centroide por profissão (média das palavras-chave e da descrição),
+    inclusive das que não têm descrição, com um IndiceIVF sobre eles.
+    """
+
+    def __init__(self, palavras_chave, descricoes, profissoes_com_descricao, centroides, profissoes, termos, ivf):
+        self.palavras_chave = palavras_chave
+        self.descricoes = descricoes
+        self.profissoes_com_descricao = profissoes_com_descricao
+        self.linha_da_descricao = {profissao: i for i, profissao in enumerate(profissoes_com_descricao)}
+        self.centroides = centroides
+        self.profissoes = profissoes
+        self.termos = termos
+        self.ivf = ivf
+        # Modelo e versão da taxonomia (chave_do_indice), definida ao obter o índice
+        self.chave = None
+
+    @classmethod
+    def construir(cls, nlp, profissoes, descricoes):
+        palavras = sorted({palavra for chaves in profissoes.values() for palavra in chaves})
+        vetores_palavras = _vetores_normalizados(nlp, palavras)
+        palavras_chave = MatrizPalavrasChave.construir(nlp, profissoes, vetores_palavras)
+
+        vetores_descricoes = _vetores_normalizados(nlp, list(descricoes.values()))
+        vetor_da_descricao = {
+            profissao: vetores_descricoes[texto]
+            for profissao, texto in descricoes.items() if texto in vetores_descricoes
+        }
+
+        centroides = []
+        for profissao, chaves in profissoes.items():
+            vetores = [vetores_palavras[palavra] for palavra in chaves if palavra in vetores_palavras]
+            if profissao in vetor_da_descricao:
+                vetores.append(vetor_da_descricao[profissao])
+            centroide = np.mean(vetores, axis=0) if vetores else None
+            if centroide is not None and np.linalg.norm(centroide):
+                centroide = centroide / np.linalg.norm(centroide)
+            centroides.append(centroide)
+
+        dimensao = next((len(v) for v in centroides if v is not None), 0)
+        centroides = np.array(
+            [v if v is not None else np.zeros(dimensao) for v in centroides], dtype='float32'
+        ).reshape(len(centroides), dimensao)
+
+        return cls(
+            palavras_chave,
+            _matriz(vetor_da_descricao.values()),
+            list(vetor_da_descricao),
+            centroides,
+            list(profissoes),
+            IndiceInvertido.construir(profissoes),
+            IndiceIVF.construir(centroides),
+        )
+
+    def similaridade_descricoes(self, doc, profissoes=None):
+        """
+        Similaridade de cosseno do texto do usuário com cada descrição (ou só
+        com as de `profissoes`): um produto escalar por profissão. Retorna
+        {profissão: similaridade} para as profissões que têm descrição.
+        """
+        if profissoes is None:
+            profissoes = self.profissoes_com_descricao
+        profissoes = [profissao for profissao in profissoes if profissao in self.linha_da_descricao]
+        if not doc.vector_norm or not profissoes:
+            return dict.fromkeys(profissoes, 0.0)
+        linhas = [self.linha_da_descricao[profissao] for profissao in profissoes]
+        similaridades = self.descricoes[linhas] @ (doc.vector / doc.vector_norm)
+        return dict(zip(profissoes, similaridades.tolist()))
+
+    def mais_proximas(self, doc, limite, sondas=0):
+        """
+        As `limite` profissões cujo centroide é mais parecido com o texto
+        (lista curta semântica, com tamanho fixo qualquer que seja a taxonomia).
+        Com `sondas` > 0 a busca é aproximada, pelo IndiceIVF.
+        """
+        if not doc.vector_norm or not len(self.centroides) or limite <= 0:
+            return []
+        consulta = doc.vector / doc.vector_norm
+        if sondas > 0:
+            return [self.profissoes[i] for i in self.ivf.buscar(consulta, limite, sondas)]
+        similaridades = self.centroides @ consulta
+        if limite < len(similaridades):
+            melhores = np.argpartition(-similaridades, limite - 1)[:limite]
+        else:
+            melhores = range(len(similaridades))
+        return [self.profissoes[i] for i in melhores]
+
+    def para_bytes(self):
+        return srsly.msgpack_dumps({
+            'versao': VERSAO_FORMATO,
+            'palavras_chave': self.palavras_chave.para_dados(),
+            'descricoes': self.descricoes,
+            'profissoes_com_descricao': self.profissoes_com_descricao,
+            'centroides': self.centroides,
+            'profissoes': self.profissoes,
+            'termos': self.termos.profissoes_por_termo,
+            'ivf': self.ivf.para_dados(),
+        })
+
+    @classmethod
+    def de_bytes(cls, conteudo):
+        dados = srsly.msgpack_loads(conteudo)
+        if dados.get('versao') != VERSAO_FORMATO:
+            raise ValueError("Formato do índice de profissões desatualizado.")
+        return cls(
+            MatrizPalavrasChave.de_dados(dados['palavras_chave']),
+            dados['descricoes'],
+            dados['profissoes_com_descricao'],
+            dados['centroides'],
+            dados['profissoes'],
+            IndiceInvertido(dados['termos']),
+            IndiceIVF.de_dados(dados['ivf'], dados['centroides']),
+        )
+
+
+def chave_do_indice(nlp, profissoes, descricoes):
+    """
+    Identifica o índice pelo modelo (nome, versão, componentes ativos) e por
+    um hash da taxonomia: qualquer mudança gera um arquivo novo.
+    """
+    meta = nlp.meta
+    conteudo = json.dumps({
+        'modelo': [meta.get('lang'), meta.get('name'), meta.get('version')],
+        'componentes': list(nlp.pipe_names),
+        'profissoes': {profissao: sorted(chaves) for profissao, chaves in profissoes.items()},
+        'descricoes': descricoes,
+    }, sort_keys=True, ensure_ascii=False)
+    hash_taxonomia = hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+    return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}-{hash_taxonomia}"
+
+
+def _carregar_do_disco(caminho):
+    try:
+        return IndiceProfissoes.de_bytes(caminho.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"AVISO: Índice de profissões inválido em {caminho}: {e}")
+        return None
+
+
+def _salvar_no_disco(caminho, indice):
+    # Grava num temporário e renomeia, para que outro worker nunca leia
+    # um arquivo pela metade
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=caminho.parent, delete=False) as temporario:
+            temporario.write(indice.para_bytes())
+        os.replace(temporario.name, caminho)
+    except OSError as e:
+        print(f"AVISO: Não foi possível salvar o índice de profissões em {caminho}: {e}")
+
+
+# Um índice por modelo carregado; some junto com o modelo se ele for descarregado
+_indices = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def obter_indice_profissoes(nlp, profissoes, descricoes):
+    """
+    Retorna o índice do modelo (ou visão do gerenciador config.nlp). Na
+    primeira chamada do processo ele é lido de settings.DETECTOR_CACHE_DIR
+    ou, se ainda não existir para este modelo e taxonomia, calculado e salvo.
+    """
+    modelo = getattr(nlp, 'nlp', nlp)
+    # O hash da taxonomia só é recalculado quando os dicionários mudam
+    taxonomia = (id(profissoes), id(descricoes))
+    em_memoria = _indices.get(modelo)
+    if em_memoria is not None and em_memoria[0] == taxonomia:
+        return em_memoria[1]
+
+    with _lock:
+        em_memoria = _indices.get(modelo)
+        if em_memoria is not None and em_memoria[0] == taxonomia:
+            return em_memoria[1]
+
+        chave = chave_do_indice(nlp, profissoes, descricoes)
+
+        pasta = getattr(settings, 'DETECTOR_CACHE_DIR', None)
+        caminho = Path(pasta) / f"{chave}.msgpack" if pasta else None
+        indice = _carregar_do_disco(caminho) if caminho else None
+        if indice is None:
+            indice = IndiceProfissoes.construir(nlp, profissoes, descricoes)
+            if caminho:
+                _salvar_no_disco(caminho, indice)
+        indice.chave = chave
+
+        _indices[modelo] = (taxonomia, indice)
+        return indice
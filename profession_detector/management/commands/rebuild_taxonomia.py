@@ -0,0 +1,45 @@
+# Em profession_detector/management/commands/rebuild_taxonomia.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.nlp import obter_nlp
+from profession_detector.services import preparar_indice
+from profession_detector.taxonomia import obter_registro_taxonomia
+
+
+class Command(BaseCommand):
+    help = ("Recompila a taxonomia de profissões (settings.DETECTOR_TAXONOMIA) e, "
+            "com --indice, prepara os vetores do detector para a nova versão.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--indice', action='store_true',
+                            help="Também monta (ou lê do disco) o índice de vetores com o modelo do detector.")
+
+    def handle(self, *args, **options):
+        registro = obter_registro_taxonomia()
+        inicio = time.perf_counter()
+        try:
+            taxonomia = registro.recarregar(forcar=True)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Taxonomia inválida: {e}")
+
+        destino = registro.caminho_compilado(taxonomia.versao) or "(DETECTOR_CACHE_DIR vazio, nada gravado)"
+        self.stdout.write(
+            f"{len(taxonomia.palavras_chave)} profissão(ões), {len(taxonomia.descricoes)} descrição(ões), "
+            f"versão {taxonomia.versao}: {destino} ({time.perf_counter() - inicio:.2f} s)"
+        )
+
+        if options['indice']:
+            try:
+                nlp = obter_nlp('detector')
+            except OSError as e:
+                raise CommandError(f"Modelo do detector indisponível: {e}")
+            inicio = time.perf_counter()
+            indice = preparar_indice(nlp)
+            self.stdout.write(f"Índice {indice.chave} pronto ({time.perf_counter() - inicio:.2f} s).")
+
+        self.stdout.write(self.style.SUCCESS(
+            "Taxonomia atualizada. Os servidores em execução carregam a nova versão na próxima requisição."
+        ))
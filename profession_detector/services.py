@@ -1,85 +1,13 @@
 # services.py
-import spacy
-import re
+from collections import Counter
 
-try:
-    nlp = spacy.load("pt_core_news_md")  # Usa o modelo médio
-except OSError:
-    try:
-        nlp = spacy.load("pt_core_news_sm")  # Fallback para o modelo pequeno
-        print("AVISO: Usando modelo pequeno. Para melhor desempenho, instale:")
-        print("python -m spacy download pt_core_news_md")
-    except OSError:
-        print("ERRO: Nenhum modelo do SpaCy encontrado.")
-        nlp = None
+from django.conf import settings
 
-# Mini-dicionário de palavras ofensivas
-CORE_OFFENSIVE = {
-    "puta", "fdp", "caralho", "porra", "merda", 
-    "cu", "foder", "vsf", "krl", "pqp", "bosta",
-    "arrombado", "desgraça", "inferno"
-}
-
-
-def analisar_toxicidade(texto):
-    """
-    Sistema híbrido inteligente de detecção
-    """
-    if not texto or len(texto.strip()) < 5:
-        return None
-    
-    texto_lower = texto.lower()
-    alertas = []
-    confianca_total = 0
-    
-    # Verificação direta de palavras ofensivas
-    palavras_encontradas = []
-    for palavra in CORE_OFFENSIVE:
-        padrao = r'\b' + re.escape(palavra) + r'\b'
-        if re.search(padrao, texto_lower):
-            palavras_encontradas.append(palavra)
-            confianca_total += 0.9
-    
-    if palavras_encontradas:
-        alertas.append("palavra_ofensiva_core")
-    
-    # Padrões regex agressivos
-    padroes = {
-        r'\bv[aá]i?\s+(?:s[ei]|t[ei])\s+(?:foder|ferrar|lascar)': 0.9,
-        r'\b(?:filho|filha)\s+d[aeo]\s+(?:puta|rapariga)': 0.95,
-        r'(.)\1{5,}': 0.3,
-        r'\barrombad[ao]s?\b': 0.85
-    }
-    
-    for padrao, peso in padroes.items():
-        if re.search(padrao, texto_lower):
-            alertas.append("padrao_agressivo")
-            confianca_total += peso
-    
-    # Verificação de contexto positivo
-    palavras_positivas = {
-        'gosto', 'adoro', 'amo', 'interessante', 'legal', 'bacana',
-        'jogo', 'game', 'culinária', 'cozinhar', 'arte', 'música',
-        'esporte', 'tecnologia', 'programação', 'desenho', 'criar'
-    }
-    
-    palavras_no_texto = set(texto_lower.split())
-    contexto_positivo = len(palavras_no_texto.intersection(palavras_positivas))
-    
-    if contexto_positivo >= 2:
-        confianca_total *= 0.3
-    
-    if confianca_total >= 0.9:
-        return {
-            'detectado': True,
-            'confianca': min(confianca_total, 1.0),
-            'tipos': list(set(alertas)),
-            'quantidade': len(alertas),
-            'palavras': palavras_encontradas if palavras_encontradas else None,
-            'mensagem': 'Detectamos linguagem inadequada ou comportamento suspeito em seu texto.'
-        }
-    
-    return None
+from config.nlp import obter_nlp
+from .cache import normalizar_texto, obter_cache_sugestoes
+from .indices import obter_indice_profissoes
+from .taxonomia import obter_taxonomia
+from .toxicidade import CORE_OFFENSIVE, analisar_toxicidade  # noqa: F401
 
 
 def extrair_conceitos_principais(doc):
@@ -104,17 +32,87 @@ def suggest_professions(text: str) -> tuple:
     """
     Versão INTELIGENTE com análise semântica usando apenas SpaCy
     """
+    # Textos que só diferem em maiúsculas/espaços têm o mesmo resultado
+    text = normalizar_texto(text)
+
     # Verifica toxicidade
     deteccao = analisar_toxicidade(text)
     if deteccao:
         return ([], deteccao)
     
-    if not nlp:
+    try:
+        nlp = obter_nlp('detector')
+    except OSError:
+        print("ERRO: Nenhum modelo do SpaCy encontrado.")
         return ([], None)
 
-    # Processa o texto do usuário
-    doc_usuario = nlp(text.lower())
-    
+    # Resultados recentes ficam em cache por versão do modelo e da taxonomia
+    cache = obter_cache_sugestoes()
+    versao = preparar_indice(nlp).chave
+    resultado = cache.obter(versao, text)
+    if resultado is None:
+        # Processa o texto do usuário
+        resultado = pontuar_profissoes(text, nlp(text), nlp)
+        cache.definir(versao, text, resultado)
+    return _copia(resultado)
+
+
+def suggest_professions_em_lote(textos, tamanho_lote=64):
+    """
+    Mesmo resultado de suggest_professions para cada texto da lista, na mesma
+    ordem. O filtro de toxicidade e o cache rodam primeiro e só os textos
+    restantes passam pelo modelo, em lotes com nlp.pipe.
+    """
+    textos = [normalizar_texto(texto) for texto in textos]
+    resultados = [None] * len(textos)
+    limpos = []
+    for i, texto in enumerate(textos):
+        deteccao = analisar_toxicidade(texto)
+        if deteccao:
+            resultados[i] = ([], deteccao)
+        else:
+            limpos.append(i)
+
+    if limpos:
+        try:
+            nlp = obter_nlp('detector')
+        except OSError:
+            print("ERRO: Nenhum modelo do SpaCy encontrado.")
+            nlp = None
+
+        if nlp is None:
+            for i in limpos:
+                resultados[i] = ([], None)
+        else:
+            cache = obter_cache_sugestoes()
+            versao = preparar_indice(nlp).chave
+            pendentes = []
+            for i in limpos:
+                resultado = cache.obter(versao, textos[i])
+                if resultado is None:
+                    pendentes.append(i)
+                else:
+                    resultados[i] = _copia(resultado)
+
+            docs = nlp.pipe((textos[i] for i in pendentes), batch_size=tamanho_lote)
+            for i, doc_usuario in zip(pendentes, docs):
+                resultado = pontuar_profissoes(textos[i], doc_usuario, nlp)
+                cache.definir(versao, textos[i], resultado)
+                resultados[i] = _copia(resultado)
+
+    return resultados
+
+
+def _copia(resultado):
+    # O cache guarda o resultado; quem chama recebe listas próprias
+    sugestoes, aviso = resultado
+    return (list(sugestoes), aviso)
+
+
+def pontuar_profissoes(text, doc_usuario, nlp):
+    """
+    Pontua as profissões para um texto já processado pelo modelo do detector.
+    """
     # Extrai conceitos principais
     tokens_importantes, chunks = extrair_conceitos_principais(doc_usuario)
     
@@ -122,61 +120,66 @@ def suggest_professions(text: str) -> tuple:
     if len(tokens_importantes) == 0 and len(chunks) == 0:
         return ([], None)
 
-    from .professions import PROFESSION_KEYWORDS, PROFESSION_DESCRIPTIONS
+    # Vetores das palavras-chave e descrições calculados uma vez por modelo
+    indice = preparar_indice(nlp)
+
+    # Matches de lemas e chunks (MÉTODO 1) procurados no índice invertido
+    user_lemmas = {token.lemma_ for token in tokens_importantes}
+    direct_matches = Counter()
+    for lemma in user_lemmas:
+        direct_matches.update(indice.termos.profissoes_do_termo(lemma))
+    chunk_matches = Counter()
+    for chunk in chunks:
+        chunk_matches.update(indice.termos.profissoes_contidas(chunk))
+
+    # Só são pontuadas as profissões com algum termo em comum com o texto e
+    # as semanticamente mais próximas (lista curta de tamanho fixo)
+    candidatas = set(direct_matches) | set(chunk_matches)
+    if doc_usuario.has_vector:
+        limite = getattr(settings, 'DETECTOR_LISTA_SEMANTICA', 100)
+        # Busca aproximada só compensa em taxonomias grandes
+        sondas = 0
+        if len(indice.profissoes) >= getattr(settings, 'DETECTOR_ANN_MINIMO', 5000):
+            sondas = getattr(settings, 'DETECTOR_ANN_SONDAS', 16)
+        candidatas.update(indice.mais_proximas(doc_usuario, limite, sondas))
+    candidatas = [profession for profession in indice.profissoes if profession in candidatas]
+
+    # Similaridade do texto com as descrições (MÉTODO 2) e de cada token com
+    # as palavras-chave (MÉTODO 3) de todas as candidatas de uma vez
+    similaridades_descricoes = (
+        indice.similaridade_descricoes(doc_usuario, candidatas) if doc_usuario.has_vector else {}
+    )
+    tokens_com_vetor = [token for token in tokens_importantes if token.has_vector]
+    similaridades_tokens = indice.palavras_chave.similaridades(tokens_com_vetor, candidatas)
     
     scores = {}
     
-    for profession, keywords in PROFESSION_KEYWORDS.items():
+    for coluna, profession in enumerate(candidatas):
         score = 0
         
         # ========================================
         # MÉTODO 1: Match direto de palavras-chave
         # ========================================
-        user_lemmas = {token.lemma_ for token in tokens_importantes}
-        user_text_lower = text.lower()
-        
-        # Match de lemmas
-        direct_matches = len(user_lemmas.intersection(keywords))
-        score += direct_matches * 3.0  # AUMENTADO: 3 pontos por match direto
+        score += direct_matches[profession] * 3.0  # AUMENTADO: 3 pontos por match direto
         
         # Match de chunks nominais
-        for chunk in chunks:
-            if chunk in keywords or any(keyword in chunk for keyword in keywords):
-                score += 2.5
+        score += chunk_matches[profession] * 2.5
         
         # ========================================
         # MÉTODO 2: Similaridade semântica com descrição
         # ========================================
-        if profession in PROFESSION_DESCRIPTIONS and doc_usuario.has_vector:
-            desc_text = PROFESSION_DESCRIPTIONS[profession]
-            doc_profissao = nlp(desc_text)
-            
-            # Similaridade geral do documento
-            if doc_profissao.has_vector:
-                similaridade_doc = doc_usuario.similarity(doc_profissao)
-                # Só adiciona se a similaridade for significativa
-                if similaridade_doc > 0.3:
-                    score += similaridade_doc * 15  # AUMENTADO: Até 15 pontos
+        similaridade_doc = similaridades_descricoes.get(profession)
+        # Só adiciona se a similaridade for significativa
+        if similaridade_doc is not None and similaridade_doc > 0.3:
+            score += similaridade_doc * 15  # AUMENTADO: Até 15 pontos
         
         # ========================================
         # MÉTODO 3: Similaridade token-a-token (mais preciso)
         # ========================================
-        for token_usuario in tokens_importantes:
-            if token_usuario.has_vector:
-                max_sim_token = 0
-                best_match = None
-                
-                for keyword in keywords:
-                    keyword_doc = nlp(keyword)
-                    if keyword_doc.has_vector:
-                        sim = token_usuario.similarity(keyword_doc)
-                        if sim > max_sim_token:
-                            max_sim_token = sim
-                            best_match = keyword
-                
-                # Threshold ajustado para ser mais seletivo
-                if max_sim_token > 0.65:  # Aumentado de 0.6 para 0.65
-                    score += max_sim_token * 2.5
+        for max_sim_token in similaridades_tokens[:, coluna].tolist():
+            # Threshold ajustado para ser mais seletivo
+            if max_sim_token > 0.65:  # Aumentado de 0.6 para 0.65
+                score += max_sim_token * 2.5
         
         # ========================================
         # MÉTODO 4: Penalização por falta de contexto
@@ -194,4 +197,13 @@ def suggest_professions(text: str) -> tuple:
     # FILTRO FINAL: Remove profissões com score muito baixo
     sorted_professions = [(prof, score) for prof, score in sorted_professions if score >= 3.0]
 
-    return (sorted_professions, None)
\ No newline at end of file
+    return (sorted_professions, None)
+
+
+def preparar_indice(nlp):
+    """
+    Monta (ou lê do disco) o índice de profissões do modelo. Registrada em
+    config.nlp para rodar no precarregamento, antes do fork dos workers.
+    """
+    taxonomia = obter_taxonomia()
+    return obter_indice_profissoes(nlp, taxonomia.palavras_chave, taxonomia.descricoes)
@@ -0,0 +1,201 @@
+# profession_detector/taxonomia.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import srsly
+from django.conf import settings
+
+# Aumente ao mudar o formato compilado salvo em disco
+VERSAO_FORMATO = 1
+
+TAXONOMIA_PADRAO = Path(__file__).resolve().parent / 'dados' / 'profissoes.json'
+
+
+class Taxonomia:
+    """
+    Profissões do detector: palavras-chave (sets em minúsculas), descrições e
+    área de cada profissão, na ordem do arquivo. `versao` é o hash do arquivo
+    de origem e muda a cada edição.
+    """
+
+    def __init__(self, palavras_chave, descricoes, areas, versao):
+        self.palavras_chave = palavras_chave
+        self.descricoes = descricoes
+        self.areas = areas
+        self.versao = versao
+
+    def para_dados(self):
+        return {
+            'versao_formato': VERSAO_FORMATO,
+            'versao': self.versao,
+            'profissoes': list(self.palavras_chave),
+            'palavras_chave': [sorted(chaves) for chaves in self.palavras_chave.values()],
+            'descricoes': self.descricoes,
+            'areas': self.areas,
+        }
+
+    @classmethod
+    def de_dados(cls, dados):
+        if dados.get('versao_formato') != VERSAO_FORMATO:
+            raise ValueError("Formato da taxonomia compilada desatualizado.")
+        palavras_chave = {
+            profissao: set(chaves) for profissao, chaves in zip(dados['profissoes'], dados['palavras_chave'])
+        }
+        return cls(palavras_chave, dados['descricoes'], dados['areas'], dados['versao'])
+
+
+def _ler_origem(conteudo, caminho):
+    if caminho.suffix.lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Instale o PyYAML para usar taxonomias em YAML.")
+        return yaml.safe_load(conteudo)
+    return json.loads(conteudo)
+
+
+def compilar_taxonomia(conteudo, caminho, versao=None):
+    """
+    Valida e normaliza o arquivo de origem ({"profissoes": {nome: {"palavras_chave":
+    [...], "descricao": "...", "area": "..."}}}). Levanta ValueError se ele for inválido.
+    """
+    dados = _ler_origem(conteudo, caminho)
+    profissoes = dados.get('profissoes') if isinstance(dados, dict) else None
+    if not isinstance(profissoes, dict) or not profissoes:
+        raise ValueError(f"{caminho}: esperado um objeto 'profissoes' com ao menos uma profissão.")
+
+    palavras_chave, descricoes, areas = {}, {}, {}
+    for profissao, item in profissoes.items():
+        chaves = item.get('palavras_chave') if isinstance(item, dict) else None
+        if not isinstance(chaves, list) or not all(isinstance(chave, str) for chave in chaves):
+            raise ValueError(f"{caminho}: '{profissao}' precisa de uma lista 'palavras_chave'.")
+        palavras_chave[profissao] = {" ".join(chave.lower().split()) for chave in chaves if chave.strip()}
+        if item.get('descricao'):
+            descricoes[profissao] = item['descricao']
+        if item.get('area'):
+            areas[profissao] = item['area']
+
+    if versao is None:
+        versao = hashlib.sha256(conteudo).hexdigest()[:16]
+    return Taxonomia(palavras_chave, descricoes, areas, versao)
+
+
+class RegistroTaxonomia:
+    """
+    Carrega a taxonomia do arquivo de dados e a recarrega quando ele muda.
+
+    Na primeira leitura de cada versão o arquivo é compilado para
+    `<pasta_cache>/taxonomia-<versao>.msgpack`; as leituras seguintes (outros
+    workers, reinícios) carregam esse arquivo de uma vez, sem validar de novo.
+    Cada recarga gera dicionários novos, o que também invalida o índice de
+    vetores e o cache de resultados do detector.
+    """
+
+    def __init__(self, caminho, pasta_cache=None):
+        self.caminho = Path(caminho)
+        self.pasta_cache = Path(pasta_cache) if pasta_cache else None
+        self._taxonomia = None
+        self._assinatura = None
+        self._lock = threading.Lock()
+
+    def obter(self):
+        """
+        Taxonomia atual, recarregada se o arquivo mudou desde a última leitura.
+        """
+        if self._taxonomia is None or self._assinatura != self._assinatura_arquivo():
+            self.recarregar()
+        return self._taxonomia
+
+    def recarregar(self, forcar=False):
+        """
+        Relê o arquivo de origem. Com `forcar`, recompila mesmo que já exista
+        o arquivo compilado desta versão. Se o arquivo estiver inválido, a
+        taxonomia anterior continua em uso.
+        """
+        with self._lock:
+            assinatura = self._assinatura_arquivo()
+            if not forcar and self._taxonomia is not None and assinatura == self._assinatura:
+                return self._taxonomia
+            try:
+                conteudo = self.caminho.read_bytes()
+                versao = hashlib.sha256(conteudo).hexdigest()[:16]
+                if forcar or self._taxonomia is None or versao != self._taxonomia.versao:
+                    self._taxonomia = self._carregar(conteudo, versao, forcar)
+            except (OSError, ValueError) as e:
+                if self._taxonomia is None:
+                    raise
+                print(f"Erro ao recarregar a taxonomia {self.caminho}: {e}")
+            self._assinatura = assinatura
+            return self._taxonomia
+
+    def caminho_compilado(self, versao):
+        return self.pasta_cache / f"taxonomia-{versao}.msgpack" if self.pasta_cache else None
+
+    def _carregar(self, conteudo, versao, forcar):
+        compilado = self.caminho_compilado(versao)
+        if compilado and not forcar:
+            try:
+                return Taxonomia.de_dados(srsly.msgpack_loads(compilado.read_bytes()))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"AVISO: Taxonomia compilada inválida em {compilado}: {e}")
+
+        taxonomia = compilar_taxonomia(conteudo, self.caminho, versao)
+        if compilado:
+            self._salvar(compilado, taxonomia)
+        return taxonomia
+
+    def _salvar(self, compilado, taxonomia):
+        # Grava num temporário e renomeia, como o índice de vetores
+        try:
+            compilado.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=compilado.parent, delete=False) as temporario:
+                temporario.write(srsly.msgpack_dumps(taxonomia.para_dados()))
+            os.replace(temporario.name, compilado)
+        except OSError as e:
+            print(f"AVISO: Não foi possível salvar a taxonomia compilada em {compilado}: {e}")
+
+    def _assinatura_arquivo(self):
+        try:
+            estado = self.caminho.stat()
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obter_registro_taxonomia():
+    """
+    Registro do processo, criado na primeira chamada com settings.DETECTOR_TAXONOMIA
+    e a pasta settings.DETECTOR_CACHE_DIR.
+    """
+    global _registro
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroTaxonomia(
+                    getattr(settings, 'DETECTOR_TAXONOMIA', '') or TAXONOMIA_PADRAO,
+                    getattr(settings, 'DETECTOR_CACHE_DIR', None),
+                )
+    return _registro
+
+
+def obter_taxonomia():
+    return obter_registro_taxonomia().obter()
+
+
+def redefinir_taxonomia():
+    """
+    Descarta o registro do processo; o próximo acesso lê as configurações de novo.
+    """
+    global _registro
+    with _registro_lock:
+        _registro = None
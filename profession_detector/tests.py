@@ -1,3 +1,395 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import spacy
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from benchmarks.ann import busca_exata, gerar_catalogo, gerar_consultas, revocacao
+from benchmarks.detector import TEXTOS_EXEMPLO, montar_pipeline_sintetico, suggest_professions_legado
+from benchmarks.latencia_detector import CENARIOS, comparar, gerar_corpus
+from benchmarks.toxicidade import analisar_toxicidade_legado, gerar_texto, resumo
+from config import nlp as gerenciador_nlp
+
+from . import indices
+from .cache import CacheSugestoes, normalizar_texto, obter_cache_sugestoes, redefinir_cache_sugestoes
+from .indices import IndiceInvertido, IndiceIVF, IndiceProfissoes, MatrizPalavrasChave, obter_indice_profissoes
+from .professions import PROFESSION_KEYWORDS
+from .services import suggest_professions, suggest_professions_em_lote
+from .taxonomia import TAXONOMIA_PADRAO, RegistroTaxonomia, redefinir_taxonomia
+from .toxicidade import analisar_toxicidade, detectar_linguagem_inapropriada
+
+
+PROFISSOES_EXEMPLO = {
+    "Chef de Cozinha": {"cozinhar", "receitas", "gastronomia"},
+    "Programador(a)": {"código", "programação", "resolver problemas"},
+    "Músico(a)": {"música", "tocar"},
+    "Sem vetores": {"inexistente"},
+}
+
+DESCRICOES_EXEMPLO = {
+    "Chef de Cozinha": "Adoro cozinhar receitas e comida",
+    "Músico(a)": "tocar violão e música",
+}
+
+
+def montar_pipeline_com_vetores(semente=0):
+    nlp = spacy.blank("pt")
+    gerador = np.random.default_rng(semente)
+    palavras = {
+        "cozinhar", "receitas", "gastronomia", "código", "programação", "resolver",
+        "problemas", "música", "tocar", "adoro", "comida", "computador", "violão",
+    }
+    for palavra in palavras:
+        nlp.vocab.set_vector(palavra, gerador.normal(size=16).astype("float32"))
+    return nlp
+
+
+class MatrizPalavrasChaveTests(SimpleTestCase):
+    def test_igual_a_similaridade_do_spacy(self):
+        nlp = montar_pipeline_com_vetores()
+        matriz = MatrizPalavrasChave.construir(nlp, PROFISSOES_EXEMPLO)
+
+        doc = nlp("adoro cozinhar comida e tocar violão no computador")
+        tokens = [token for token in doc if token.has_vector]
+        similaridades = matriz.similaridades(tokens)
+
+        self.assertNotIn("Sem vetores", matriz.coluna_da_profissao)
+        for profissao, chaves in PROFISSOES_EXEMPLO.items():
+            coluna = matriz.coluna_da_profissao.get(profissao)
+            for i, token in enumerate(tokens):
+                # Mesmo cálculo feito antes dentro do laço de cada requisição
+                esperado = 0
+                for chave in chaves:
+                    doc_chave = nlp(chave)
+                    if doc_chave.has_vector:
+                        esperado = max(esperado, token.similarity(doc_chave))
+                obtido = 0 if coluna is None else similaridades[i, coluna]
+                self.assertAlmostEqual(obtido, esperado, places=5)
+
+    def test_sem_tokens(self):
+        matriz = MatrizPalavrasChave.construir(montar_pipeline_com_vetores(), PROFISSOES_EXEMPLO)
+        self.assertEqual(matriz.similaridades([]).shape, (0, 3))
+
+
+class IndiceProfissoesTests(SimpleTestCase):
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        self.pasta = Path(pasta)
+        configuracao = override_settings(DETECTOR_CACHE_DIR=pasta)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.nlp = montar_pipeline_com_vetores()
+
+    def test_similaridade_igual_a_do_spacy(self):
+        indice = IndiceProfissoes.construir(self.nlp, PROFISSOES_EXEMPLO, DESCRICOES_EXEMPLO)
+        doc = self.nlp("gosto de programação e comida")
+
+        similaridades = indice.similaridade_descricoes(doc)
+        for profissao, texto in DESCRICOES_EXEMPLO.items():
+            self.assertAlmostEqual(similaridades[profissao], doc.similarity(self.nlp(texto)), places=5)
+
+        # Centroide para toda profissão, com ou sem descrição
+        self.assertEqual(indice.centroides.shape, (len(PROFISSOES_EXEMPLO), 16))
+        linha = indice.profissoes.index("Programador(a)")
+        self.assertAlmostEqual(float(np.linalg.norm(indice.centroides[linha])), 1.0, places=5)
+
+    def test_indice_salvo_em_disco_e_reaproveitado(self):
+        primeiro = obter_indice_profissoes(self.nlp, PROFISSOES_EXEMPLO, DESCRICOES_EXEMPLO)
+        self.assertIs(obter_indice_profissoes(self.nlp, PROFISSOES_EXEMPLO, DESCRICOES_EXEMPLO), primeiro)
+        self.assertEqual(len(list(self.pasta.glob("*.msgpack"))), 1)
+
+        # Outro processo (sem o índice em memória) lê o arquivo sem rodar o modelo
+        indices._indices.clear()
+        with mock.patch.object(type(self.nlp), "pipe", side_effect=AssertionError("recalculou")):
+            segundo = obter_indice_profissoes(self.nlp, PROFISSOES_EXEMPLO, DESCRICOES_EXEMPLO)
+        np.testing.assert_array_equal(segundo.centroides, primeiro.centroides)
+        np.testing.assert_array_equal(segundo.ivf.vetores, primeiro.ivf.vetores)
+        self.assertEqual(segundo.palavras_chave.coluna_da_profissao, primeiro.palavras_chave.coluna_da_profissao)
+
+        # Mudar a taxonomia gera outro arquivo
+        alterada = {**PROFISSOES_EXEMPLO, "Músico(a)": {"música"}}
+        obter_indice_profissoes(self.nlp, alterada, DESCRICOES_EXEMPLO)
+        self.assertEqual(len(list(self.pasta.glob("*.msgpack"))), 2)
+
+
+class IndiceIVFTests(SimpleTestCase):
+    def setUp(self):
+        self.vetores = gerar_catalogo(3000, 32)
+        self.consultas = gerar_consultas(self.vetores, 30)
+        self.indice = IndiceIVF.construir(self.vetores)
+
+    def test_revocacao_contra_busca_exata(self):
+        poucas = revocacao(self.indice, self.vetores, self.consultas, 50, 4)
+        muitas = revocacao(self.indice, self.vetores, self.consultas, 50, 16)
+        self.assertGreaterEqual(muitas, 0.9)
+        self.assertGreaterEqual(muitas, poucas)
+
+        # Com todas as sondas a busca é exata
+        todas = len(self.indice.grupos)
+        self.assertEqual(revocacao(self.indice, self.vetores, self.consultas, 50, todas), 1.0)
+
+    def test_completa_a_lista_com_mais_grupos(self):
+        consulta = self.consultas[0]
+        self.assertEqual(len(self.indice.buscar(consulta, 200, 1)), 200)
+        self.assertEqual(sorted(self.indice.buscar(consulta, 5000, 1)), list(range(3000)))
+        self.assertEqual(set(self.indice.buscar(consulta, 10, len(self.indice.grupos)).tolist()),
+                         set(busca_exata(self.vetores, consulta, 10).tolist()))
+
+
+class IndiceInvertidoTests(SimpleTestCase):
+    def test_profissoes_contidas_igual_a_busca_por_substring(self):
+        termos = IndiceInvertido.construir(PROFESSION_KEYWORDS)
+        for chunk in ["resolver problemas difíceis", "aplicativo web", "receitas de bolo", "nada a ver"]:
+            esperado = {
+                profissao for profissao, chaves in PROFESSION_KEYWORDS.items()
+                if any(chave in chunk for chave in chaves)
+            }
+            self.assertEqual(termos.profissoes_contidas(chunk), esperado)
+
+
+@override_settings(DETECTOR_CACHE_DIR='')
+class SugestaoProfissoesTests(SimpleTestCase):
+    def setUp(self):
+        gerenciador_nlp.definir_modelo(gerenciador_nlp.MODELO_VETORES, montar_pipeline_sintetico())
+        self.addCleanup(gerenciador_nlp.descarregar_modelos)
+        self.nlp = gerenciador_nlp.obter_nlp('detector')
+        redefinir_cache_sugestoes()
+        self.addCleanup(redefinir_cache_sugestoes)
+
+    def test_mesmo_resultado_da_implementacao_anterior(self):
+        for texto in TEXTOS_EXEMPLO:
+            sugestoes, aviso = suggest_professions(texto)
+            self.assertTrue(sugestoes)
+            self.assertEqual((sugestoes, aviso), suggest_professions_legado(texto, self.nlp))
+
+    @override_settings(DETECTOR_CACHE_SUGESTOES=0)
+    def test_pontua_apenas_candidatas(self):
+        texto = "gosto de programação e de cozinhar"
+        with override_settings(DETECTOR_LISTA_SEMANTICA=0), \
+                mock.patch.object(MatrizPalavrasChave, "similaridades", autospec=True,
+                                  side_effect=MatrizPalavrasChave.similaridades) as similaridades:
+            suggest_professions(texto)
+
+        candidatas = similaridades.call_args.args[2]
+        esperadas = {
+            profissao for profissao, chaves in PROFESSION_KEYWORDS.items()
+            if {"programação", "cozinhar"} & chaves
+        }
+        self.assertEqual(set(candidatas), esperadas)
+
+    def test_busca_aproximada_em_taxonomias_grandes(self):
+        texto = "gosto de programação e de cozinhar"
+        with mock.patch.object(IndiceProfissoes, "mais_proximas", autospec=True,
+                               side_effect=IndiceProfissoes.mais_proximas) as mais_proximas:
+            with override_settings(DETECTOR_ANN_MINIMO=10, DETECTOR_ANN_SONDAS=3, DETECTOR_CACHE_SUGESTOES=0):
+                aproximada = suggest_professions(texto)
+            self.assertEqual(mais_proximas.call_args.args[3], 3)
+            with override_settings(DETECTOR_ANN_MINIMO=10 ** 6, DETECTOR_CACHE_SUGESTOES=0):
+                exata = suggest_professions(texto)
+            self.assertEqual(mais_proximas.call_args.args[3], 0)
+        # As profissões com termos em comum entram de qualquer jeito
+        self.assertEqual(aproximada[0][:2], exata[0][:2])
+
+    def test_lote_igual_a_um_por_vez(self):
+        textos = TEXTOS_EXEMPLO + ["vai se foder", "oi"]
+        with mock.patch.object(type(self.nlp), "__call__", side_effect=AssertionError("nlp por texto")):
+            resultados = suggest_professions_em_lote(textos, tamanho_lote=3)
+        self.assertEqual(resultados, [suggest_professions(texto) for texto in textos])
+
+    def test_cache_de_resultados(self):
+        cache = obter_cache_sugestoes()
+        primeiro = suggest_professions(TEXTOS_EXEMPLO[1])
+        with mock.patch.object(type(self.nlp), "__call__", side_effect=AssertionError("sem cache")):
+            # Mesmo texto com outra caixa e espaços extras
+            segundo = suggest_professions("  " + TEXTOS_EXEMPLO[1].upper().replace(" ", "   "))
+        self.assertEqual(segundo, primeiro)
+        self.assertEqual((cache.acertos, cache.falhas), (1, 1))
+
+        resposta = self.client.get(reverse('profession_detector:estatisticas_cache')).json()
+        self.assertEqual(resposta['acertos'], 1)
+
+    def test_cache_invalidado_quando_a_taxonomia_muda(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        caminho = Path(pasta) / "profissoes.json"
+        caminho.write_bytes(TAXONOMIA_PADRAO.read_bytes())
+        configuracao = override_settings(DETECTOR_TAXONOMIA=str(caminho))
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        redefinir_taxonomia()
+        self.addCleanup(redefinir_taxonomia)
+
+        texto = "gosto de cozinhar e de música"
+        suggest_professions(texto)
+        dados = json.loads(caminho.read_text(encoding='utf-8'))
+        dados['profissoes']["Nova profissão"] = {"palavras_chave": ["cozinhar", "música"]}
+        caminho.write_text(json.dumps(dados, ensure_ascii=False), encoding='utf-8')
+
+        sugestoes, _ = suggest_professions(texto)
+        self.assertIn("Nova profissão", [profissao for profissao, _ in sugestoes])
+        self.assertEqual(obter_cache_sugestoes().falhas, 2)
+
+    def test_api_em_lote(self):
+        url = reverse('profession_detector:sugestoes_em_lote')
+        textos = [TEXTOS_EXEMPLO[0], "Seu filho da puta"]
+        resposta = self.client.post(url, {'textos': textos}, content_type='application/json')
+
+        self.assertEqual(resposta.status_code, 200)
+        primeiro, segundo = resposta.json()['resultados']
+        esperado, _ = suggest_professions(textos[0])
+        self.assertEqual([(s['profissao'], s['pontuacao']) for s in primeiro['sugestoes']], esperado)
+        self.assertIsNone(primeiro['aviso'])
+        self.assertEqual(segundo['sugestoes'], [])
+        self.assertTrue(segundo['aviso']['detectado'])
+
+    def test_api_em_lote_limites(self):
+        url = reverse('profession_detector:sugestoes_em_lote')
+        with override_settings(DETECTOR_LOTE_MAX_TEXTOS=2, DETECTOR_LOTE_MAX_CARACTERES=10):
+            self.assertEqual(self.client.post(url, {'textos': ['a', 'b', 'c']}, content_type='application/json').status_code, 413)
+            self.assertEqual(self.client.post(url, {'textos': ['a' * 11]}, content_type='application/json').status_code, 413)
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=10):
+            self.assertEqual(self.client.post(url, {'textos': ['a' * 20]}, content_type='application/json').status_code, 413)
+        self.assertEqual(self.client.post(url, {'textos': 'abc'}, content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(url, 'não é json', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+
+class ToxicidadeTests(SimpleTestCase):
+    def test_casa_apenas_palavras_inteiras(self):
+        self.assertIsNone(detectar_linguagem_inapropriada("Fiz um curso de culinária"))
+        deteccao = detectar_linguagem_inapropriada("que cu, vai tomar no cu")
+        self.assertEqual(sorted(deteccao['palavras']), ["cu", "vai tomar no cu"])
+
+    def test_frases_sobrepostas(self):
+        deteccao = analisar_toxicidade("Seu filho da puta!")
+        self.assertEqual(deteccao['palavras'], ["puta"])
+        self.assertEqual(sorted(deteccao['tipos']), ["padrao_agressivo", "palavra_ofensiva_core"])
+        self.assertEqual(deteccao['quantidade'], 2)
+
+    def test_padroes_agressivos_por_prefixo(self):
+        for texto in ("vai se ferrarem todos vocês", "seu filho da putaria", "Gosto, adoro merda"):
+            self.assertIsNotNone(analisar_toxicidade(texto), texto)
+
+    def test_mesmo_resultado_da_implementacao_anterior(self):
+        textos = [
+            "Gosto de programação e de música",
+            "Gosto de música e programação, mas que merda",
+            "vá se ferrar kkkkkkkk",
+            "os arrombados do time",
+            "Adoro cozinhar para a família",
+            # Padrões agressivos também casam como prefixo
+            "vai se ferrarem todos vocês",
+            "seu filho da putaria",
+            # Contexto positivo conta palavras separadas por espaço
+            "Gosto, adoro merda",
+        ]
+        textos += [gerar_texto(200, semente) for semente in range(5)]
+        for texto in textos:
+            self.assertEqual(resumo(analisar_toxicidade(texto)), resumo(analisar_toxicidade_legado(texto)))
+
+
+class CacheSugestoesTests(SimpleTestCase):
+    def test_normalizar_texto(self):
+        self.assertEqual(normalizar_texto("  Gosto de\n JOGOS "), "gosto de jogos")
+        self.assertEqual(normalizar_texto("programac\u0327a\u0303o"), "programação")
+
+    def test_lru_descarta_o_menos_usado(self):
+        cache = CacheSugestoes(tamanho_maximo=2)
+        cache.definir("v1", "a", ([], None))
+        cache.definir("v1", "b", ([], None))
+        cache.obter("v1", "a")
+        cache.definir("v1", "c", ([], None))
+        self.assertIsNone(cache.obter("v1", "b"))
+        self.assertIsNotNone(cache.obter("v1", "a"))
+        self.assertEqual(cache.estatisticas()['tamanho'], 2)
+
+        # Versão nova do índice descarta as entradas da anterior
+        self.assertIsNone(cache.obter("v2", "a"))
+        self.assertEqual(cache.estatisticas()['tamanho'], 0)
+
+    @override_settings(CACHES={'detector': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_compartilhado_pelo_cache_do_django(self):
+        resultado = ([("Chef de Cozinha", 9.5)], None)
+        CacheSugestoes(alias='detector').definir("v1", "cozinhar", resultado)
+
+        # Outro processo, com o cache em memória vazio
+        outro = CacheSugestoes(alias='detector')
+        self.assertEqual(outro.obter("v1", "cozinhar"), resultado)
+        self.assertEqual(outro.acertos, 1)
+
+
+class BenchmarkLatenciaTests(SimpleTestCase):
+    def test_corpus_deterministico(self):
+        for cenario in CENARIOS:
+            self.assertEqual(gerar_corpus(cenario, 5), gerar_corpus(cenario, 5))
+        toxicos = [texto for texto in gerar_corpus('misto_toxico', 50) if analisar_toxicidade(texto)]
+        self.assertTrue(0 < len(toxicos) < 50)
+
+    def test_comparar_com_linha_de_base(self):
+        baseline = {'cenarios': {'quente/curto': {'p50_ms': 10.0, 'p95_ms': 20.0},
+                                 'frio/curto': {'primeira_chamada_ms': 50.0}}}
+        dentro = {'cenarios': {'quente/curto': {'p50_ms': 12.0, 'p95_ms': 24.0},
+                               'frio/curto': {'primeira_chamada_ms': 60.0, 'primeira_chamada_max_ms': 999}}}
+        fora = {'cenarios': {'quente/curto': {'p50_ms': 10.0, 'p95_ms': 26.0},
+                             'frio/curto': {'primeira_chamada_ms': 70.0}}}
+        self.assertEqual(comparar(dentro, baseline, 0.25), [])
+        self.assertEqual(len(comparar(fora, baseline, 0.25)), 2)
+
+
+class TaxonomiaTests(SimpleTestCase):
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        self.pasta = Path(pasta)
+        self.caminho = self.pasta / "profissoes.json"
+        self.escrever({"Chef": {"palavras_chave": ["Cozinhar", "receitas  de bolo"], "descricao": "Cozinha"}})
+
+    def escrever(self, profissoes):
+        self.caminho.write_text(json.dumps({"profissoes": profissoes}), encoding='utf-8')
+
+    def test_compila_e_reaproveita_o_arquivo_compilado(self):
+        taxonomia = RegistroTaxonomia(self.caminho, self.pasta / "cache").obter()
+        self.assertEqual(taxonomia.palavras_chave, {"Chef": {"cozinhar", "receitas de bolo"}})
+        self.assertEqual(taxonomia.descricoes, {"Chef": "Cozinha"})
+        self.assertEqual(len(list((self.pasta / "cache").glob("taxonomia-*.msgpack"))), 1)
+
+        # Outro processo lê o arquivo compilado, sem validar a origem de novo
+        with mock.patch("profession_detector.taxonomia.compilar_taxonomia", side_effect=AssertionError("recompilou")):
+            segunda = RegistroTaxonomia(self.caminho, self.pasta / "cache").obter()
+        self.assertEqual(segunda.palavras_chave, taxonomia.palavras_chave)
+        self.assertEqual(segunda.versao, taxonomia.versao)
+
+    def test_recarrega_quando_o_arquivo_muda(self):
+        registro = RegistroTaxonomia(self.caminho)
+        primeira = registro.obter()
+        self.assertIs(registro.obter(), primeira)
+
+        self.escrever({"Chef": {"palavras_chave": ["cozinhar"]}, "Músico": {"palavras_chave": ["tocar"]}})
+        segunda = registro.obter()
+        self.assertNotEqual(segunda.versao, primeira.versao)
+        self.assertEqual(list(segunda.palavras_chave), ["Chef", "Músico"])
+
+        # Um arquivo inválido não derruba a versão em uso
+        self.caminho.write_text("{ quebrado", encoding='utf-8')
+        self.assertIs(registro.obter(), segunda)
+
+    def test_taxonomia_padrao(self):
+        registro = RegistroTaxonomia(TAXONOMIA_PADRAO)
+        self.assertEqual(registro.obter().palavras_chave["Cientista de Dados"], PROFESSION_KEYWORDS["Cientista de Dados"])
+
+    def test_comando_rebuild_taxonomia(self):
+        saida = io.StringIO()
+        with override_settings(DETECTOR_TAXONOMIA=str(self.caminho), DETECTOR_CACHE_DIR=str(self.pasta)):
+            redefinir_taxonomia()
+            self.addCleanup(redefinir_taxonomia)
+            call_command('rebuild_taxonomia', stdout=saida)
+        self.assertIn("1 profissão(ões)", saida.getvalue())
+        self.assertEqual(len(list(self.pasta.glob("taxonomia-*.msgpack"))), 1)
@@ -0,0 +1,164 @@
+# profession_detector/toxicidade.py
+import re
+
+# Mini-dicionário de palavras ofensivas
+CORE_OFFENSIVE = {
+    "puta", "fdp", "caralho", "porra", "merda",
+    "cu", "foder", "vsf", "krl", "pqp", "bosta",
+    "arrombado", "desgraça", "inferno"
+}
+
+# Dicionário de palavrões (usado pelo formulário de professions.detector_profissoes)
+PALAVRAS_INADEQUADAS = {
+    # Palavrões comuns
+    "merda", "porra", "caralho", "cacete", "droga", "inferno",
+    "desgraça", "maldito", "idiota", "burro", "estúpido",
+
+    # Xingamentos
+    "fdp", "filha da puta", "filho da puta", "vai se foder", "va se foder",
+    "vai tomar no cu", "cu", "puta", "viado", "bicha",
+
+    # Palavras ofensivas
+    "bosta", "cuzão", "babaca", "otário", "imbecil", "cretino",
+    "piranha", "vagabundo", "safado", "desgraçado",
+
+    # Gírias ofensivas
+    "arrombado", "escroto", "vsf", "vtmnc", "krl",
+    "pqp", "lixo", "retardado", "gay" # (se usado pejorativamente)
+}
+
+# Padrões agressivos (regex pré-compiladas, peso). Sem \b no fim: casam
+# também como prefixo ("vai se ferrarem", "filho da putaria")
+PADROES_AGRESSIVOS = {
+    'ameaca': (re.compile(r'\bv[aá]i?\s+(?:s[ei]|t[ei])\s+(?:foder|ferrar|lascar)'), 0.9),
+    'ofensa_familia': (re.compile(r'\b(?:filho|filha)\s+d[aeo]\s+(?:puta|rapariga)'), 0.95),
+    'arrombado': (re.compile(r'\barrombad[ao]s?\b'), 0.85),
+}
+
+# Sequência de 6 ou mais caracteres iguais ("kkkkkk", "!!!!!!")
+REPETICAO = re.compile(r'(.)\1{5,}')
+
+PALAVRAS_POSITIVAS = {
+    'gosto', 'adoro', 'amo', 'interessante', 'legal', 'bacana',
+    'jogo', 'game', 'culinária', 'cozinhar', 'arte', 'música',
+    'esporte', 'tecnologia', 'programação', 'desenho', 'criar'
+}
+
+_PALAVRA = re.compile(r'\w+')
+_FIM = None
+
+
+class FiltroToxicidade:
+    """
+    Reúne vários vocabulários (palavras e frases) numa única árvore de
+    palavras. O texto é dividido em palavras uma vez e cada posição só segue
+    pela árvore enquanto a sequência continuar sendo prefixo de algum termo,
+    então a varredura não depende do tamanho dos vocabulários. Os termos
+    casam com palavras inteiras (como \\b...\\b) e sobreposições são todas
+    encontradas: "filho da puta" também conta "puta".
+    """
+
+    def __init__(self, vocabularios):
+        self.vocabularios = list(vocabularios)
+        self._arvore = {}
+        for nome, termos in vocabularios.items():
+            for termo in termos:
+                no = self._arvore
+                for palavra in _PALAVRA.findall(termo.lower()):
+                    no = no.setdefault(palavra, {})
+                no.setdefault(_FIM, {})[nome] = termo
+
+    def analisar(self, texto):
+        """
+        Retorna {vocabulário: termos encontrados}, com os termos distintos na
+        ordem em que aparecem no texto.
+        """
+        palavras = _PALAVRA.findall(texto.lower())
+        arvore = self._arvore
+        encontrados = {nome: {} for nome in self.vocabularios}
+        for inicio, palavra in enumerate(palavras):
+            no = arvore.get(palavra)
+            posicao = inicio + 1
+            while no is not None:
+                if _FIM in no:
+                    for nome, termo in no[_FIM].items():
+                        encontrados[nome].setdefault(termo)
+                if posicao == len(palavras):
+                    break
+                no = no.get(palavras[posicao])
+                posicao += 1
+        return {nome: list(termos) for nome, termos in encontrados.items()}
+
+
+FILTRO = FiltroToxicidade({
+    'core': CORE_OFFENSIVE,
+    'inadequadas': PALAVRAS_INADEQUADAS,
+})
+
+
+def analisar_toxicidade(texto):
+    """
+    Sistema híbrido inteligente de detecção
+    """
+    if not texto or len(texto.strip()) < 5:
+        return None
+
+    texto_lower = texto.lower()
+    encontrados = FILTRO.analisar(texto_lower)
+    alertas = []
+    confianca_total = 0
+
+    # Verificação direta de palavras ofensivas
+    palavras_encontradas = encontrados['core']
+    confianca_total += 0.9 * len(palavras_encontradas)
+    if palavras_encontradas:
+        alertas.append("palavra_ofensiva_core")
+
+    # Padrões agressivos
+    for padrao, peso in PADROES_AGRESSIVOS.values():
+        if padrao.search(texto_lower):
+            alertas.append("padrao_agressivo")
+            confianca_total += peso
+    if REPETICAO.search(texto_lower):
+        alertas.append("padrao_agressivo")
+        confianca_total += 0.3
+
+    # Verificação de contexto positivo (palavras separadas por espaço, como
+    # sempre foi: "gosto," com a vírgula não conta)
+    contexto_positivo = len(PALAVRAS_POSITIVAS.intersection(texto_lower.split()))
+
+    if contexto_positivo >= 2:
+        confianca_total *= 0.3
+
+    if confianca_total >= 0.9:
+        return {
+            'detectado': True,
+            'confianca': min(confianca_total, 1.0),
+            'tipos': list(set(alertas)),
+            'quantidade': len(alertas),
+            'palavras': palavras_encontradas if palavras_encontradas else None,
+            'mensagem': 'Detectamos linguagem inadequada ou comportamento suspeito em seu texto.'
+        }
+
+    return None
+
+
+def detectar_linguagem_inapropriada(texto):
+    """
+    Detecta palavrões e retorna informações sobre eles
+    """
+    if not texto:
+        return None
+
+    encontrados = FILTRO.analisar(texto)
+    palavras_detectadas = encontrados['inadequadas']
+
+    if palavras_detectadas:
+        return {
+            'detectado': True,
+            'quantidade': len(palavras_detectadas),
+            'palavras': palavras_detectadas[:3],  # Mostra até 3 palavras
+            'tem_mais': len(palavras_detectadas) > 3
+        }
+
+    return None
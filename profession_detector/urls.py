@@ -5,4 +5,6 @@ app_name = 'profession_detector' # <-- ADICIONE ESTA LINHA
 
 urlpatterns = [
     path('', views.profession_detector_view, name='profession_detector'),
+    path('api/lote/', views.sugestoes_em_lote, name='sugestoes_em_lote'),
+    path('api/cache/', views.estatisticas_cache, name='estatisticas_cache'),
 ]
\ No newline at end of file
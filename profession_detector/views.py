@@ -1,6 +1,15 @@
 # profession_detector/views.py
+import json
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import JsonResponse
 from django.shortcuts import render
-from .services import suggest_professions
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .cache import obter_cache_sugestoes
+from .services import suggest_professions, suggest_professions_em_lote
 
 def profession_detector_view(request):
     context = {
@@ -20,4 +29,47 @@ def profession_detector_view(request):
             context['suggestions'] = suggestions
             context['aviso_palavrao'] = aviso_palavrao
 
-    return render(request, 'profession_detector/detector.html', context)
\ No newline at end of file
+    return render(request, 'profession_detector/detector.html', context)
+
+
+@csrf_exempt
+@require_POST
+def sugestoes_em_lote(request):
+    """
+    API JSON para classificar muitos textos de uma vez.
+
+    Recebe {"textos": ["...", ...]} e devolve {"resultados": [...]} na mesma
+    ordem, cada item com as sugestões ordenadas e o aviso de toxicidade.
+    """
+    max_textos = settings.DETECTOR_LOTE_MAX_TEXTOS
+    max_caracteres = settings.DETECTOR_LOTE_MAX_CARACTERES
+
+    try:
+        dados = json.loads(request.body)
+    except RequestDataTooBig:
+        return JsonResponse({'erro': 'Requisição grande demais.'}, status=413)
+    except ValueError:
+        return JsonResponse({'erro': 'O corpo da requisição deve ser JSON.'}, status=400)
+
+    textos = dados.get('textos') if isinstance(dados, dict) else None
+    if not isinstance(textos, list) or not all(isinstance(texto, str) for texto in textos):
+        return JsonResponse({'erro': 'Envie {"textos": [...]} com uma lista de strings.'}, status=400)
+    if len(textos) > max_textos:
+        return JsonResponse({'erro': f'No máximo {max_textos} textos por requisição.'}, status=413)
+    if any(len(texto) > max_caracteres for texto in textos):
+        return JsonResponse({'erro': f'Cada texto pode ter no máximo {max_caracteres} caracteres.'}, status=413)
+
+    resultados = []
+    for sugestoes, aviso in suggest_professions_em_lote(textos, settings.DETECTOR_LOTE_TAMANHO):
+        resultados.append({
+            'sugestoes': [{'profissao': profissao, 'pontuacao': float(pontuacao)} for profissao, pontuacao in sugestoes],
+            'aviso': aviso,
+        })
+    return JsonResponse({'resultados': resultados})
+
+
+def estatisticas_cache(request):
+    """
+    Acertos, falhas e ocupação do cache de resultados deste processo.
+    """
+    return JsonResponse(obter_cache_sugestoes().estatisticas())
@@ -175,4 +175,23 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
+    // Consulta o status da extração em segundo plano e recarrega ao terminar
+    const statusTarefa = document.querySelector('[data-status-tarefa]');
+    if (statusTarefa) {
+        const statusUrl = statusTarefa.getAttribute('data-status-tarefa');
+        const consultarStatus = function () {
+            fetch(statusUrl, { headers: { 'Accept': 'application/json' } })
+                .then(response => response.json())
+                .then(tarefa => {
+                    if (tarefa.finalizada) {
+                        window.location.reload();
+                    } else {
+                        setTimeout(consultarStatus, 2000);
+                    }
+                })
+                .catch(() => setTimeout(consultarStatus, 5000));
+        };
+        setTimeout(consultarStatus, 2000);
+    }
+
 });
\ No newline at end of file